@@ -201,6 +201,9 @@ const JobDetail = memo(({ job, isLoading = false, onRefresh, onSwitchToTab }: Jo
   // State for controlling dialog visibility
   const [isDialogOpen, setIsDialogOpen] = useState(false);
 
+  // Resumes scored so far while results stream in
+  const scoredCount = responseData?.jobMatches?.[0]?.results.length ?? 0;
+
   // Update loading dots animation
   useEffect(() => {
     if (!isProcessing) return;
@@ -696,11 +699,13 @@ const JobDetail = memo(({ job, isLoading = false, onRefresh, onSwitchToTab }: Jo
                   <div className="flex justify-between items-center">
                     <p className="text-sm text-gray-700 dark:text-gray-300">
                       <span className="font-medium">Processing...</span> Analyzing {files.length} resume{files.length !== 1 ? 's' : ''} for {job.jobTitle}
+                      {scoredCount > 0 && ` (${scoredCount} scored)`}
                     </p>
                     <div className="flex items-center">
                       <div className="w-16 bg-gray-200 dark:bg-gray-700 h-1.5 rounded-full overflow-hidden">
                         <div className="h-full bg-purple-500 rounded-full animate-pulse" style={{
-                          width: loadingDots === '' ? '25%' : 
+                          width: scoredCount > 0 ? `${Math.min(100, (scoredCount / Math.max(files.length, 1)) * 100)}%` :
+                                 loadingDots === '' ? '25%' : 
                                  loadingDots === '.' ? '50%' : 
                                  loadingDots === '..' ? '75%' : '95%'
                         }}></div>
@@ -717,24 +722,44 @@ const JobDetail = memo(({ job, isLoading = false, onRefresh, onSwitchToTab }: Jo
         {responseData && !isProcessing && (
           <div ref={resultsRef}>
             <h2 className="text-xl font-semibold text-gray-900 dark:text-gray-100 mb-4 flex items-center">
-              <CheckCircle size={20} className="mr-2 text-green-600 dark:text-green-400" />
-              Resume Processing Complete
+              {responseData.incomplete ? (
+                <>
+                  <AlertCircle size={20} className="mr-2 text-amber-600 dark:text-amber-400" />
+                  Resume Processing Incomplete
+                </>
+              ) : (
+                <>
+                  <CheckCircle size={20} className="mr-2 text-green-600 dark:text-green-400" />
+                  Resume Processing Complete
+                </>
+              )}
             </h2>
             
             {/* Success Card with View Results Button */}
             <Card className="bg-white/90 dark:bg-gray-800/90 backdrop-blur-sm border-gray-200/50 dark:border-gray-700/50 shadow-[0_4px_12px_-2px_rgba(0,0,0,0.08),0_0_0_1px_rgba(0,0,0,0.02)] mb-6">
               <CardContent className="p-8 flex flex-col items-center justify-center text-center">
-                <div className="w-20 h-20 rounded-full bg-green-100 dark:bg-green-900/30 flex items-center justify-center mb-6">
-                  <CheckCircle size={40} className="text-green-600 dark:text-green-400" />
-                </div>
+                {responseData.incomplete ? (
+                  <div className="w-20 h-20 rounded-full bg-amber-100 dark:bg-amber-900/30 flex items-center justify-center mb-6">
+                    <AlertCircle size={40} className="text-amber-600 dark:text-amber-400" />
+                  </div>
+                ) : (
+                  <div className="w-20 h-20 rounded-full bg-green-100 dark:bg-green-900/30 flex items-center justify-center mb-6">
+                    <CheckCircle size={40} className="text-green-600 dark:text-green-400" />
+                  </div>
+                )}
                 
-                <h3 className="text-xl font-bold text-gray-900 dark:text-gray-100 mb-2">Analysis Complete!</h3>
+                <h3 className="text-xl font-bold text-gray-900 dark:text-gray-100 mb-2">
+                  {responseData.incomplete ? "Analysis Incomplete" : "Analysis Complete!"}
+                </h3>
                 
                 <p className="text-gray-600 dark:text-gray-400 mb-6 max-w-md">
                   {responseData.jobMatches ? 
                     `We've analyzed ${responseData.jobMatches.reduce((total, match) => total + match.results.length, 0)} resumes` : 
                     `We've analyzed ${responseData.results?.length || 0} resumes`} 
-                  {" "}for the {job.jobTitle} position. Click below to view detailed results.
+                  {" "}for the {job.jobTitle} position.
+                  {responseData.incomplete
+                    ? " The connection closed before the rest could be analyzed; please submit them again."
+                    : " Click below to view detailed results."}
                 </p>
                 
                 <Dialog open={isDialogOpen} onOpenChange={setIsDialogOpen}>
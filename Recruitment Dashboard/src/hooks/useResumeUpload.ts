@@ -44,6 +44,48 @@ export interface ApiResponse {
   success: boolean;
   results?: ResumeResponseRow[];
   jobMatches?: JobMatch[];
+  // Set while results stream in, and kept if the stream stops before its "done" event
+  incomplete?: boolean;
+}
+
+// Events of the streaming match endpoint (/match/stream), one JSON object per line
+type MatchStreamEvent =
+  | { event: 'jobDetails'; jobDetails: JobMatch['jobDetails'] }
+  | { event: 'result'; jobId: string; result: ResumeResponseRow }
+  | { event: 'feedback'; jobId: string; resumeId: string; feedback: string }
+  | { event: 'done'; success: boolean; resumes: number }
+  | { event: 'error'; success: false; detail: string };
+
+// Apply one stream event to the response built so far
+function applyMatchEvent(data: ApiResponse, event: MatchStreamEvent): ApiResponse {
+  const jobMatches = data.jobMatches || [];
+  switch (event.event) {
+    case 'jobDetails':
+      return { ...data, jobMatches: [...jobMatches, { success: true, jobDetails: event.jobDetails, results: [] }] };
+    case 'result':
+      return {
+        ...data,
+        jobMatches: jobMatches.map(match => match.jobDetails.id === event.jobId
+          ? { ...match, results: [...match.results, { feedback: '', ...event.result }] }
+          : match),
+      };
+    case 'feedback':
+      return {
+        ...data,
+        jobMatches: jobMatches.map(match => match.jobDetails.id === event.jobId
+          ? {
+              ...match,
+              results: match.results.map(row => row.id === event.resumeId ? { ...row, feedback: event.feedback } : row),
+            }
+          : match),
+      };
+    case 'done':
+      return { ...data, success: event.success, incomplete: false };
+    case 'error':
+      throw new Error(event.detail || 'API returned an error');
+    default:
+      return data;
+  }
 }
 
 interface Job {
@@ -295,28 +337,41 @@ export default function useResumeUpload({ itemsPerPage = 10 }: UseResumeUploadPr
       setIsSubmitting(false);
       setIsProcessing(true);
       
-      // Make API request to backend
-      const response = await fetch(`${API_BASE_URL}/match`, {
+      // Make API request to backend; results stream in as each batch of resumes is scored
+      const response = await fetch(`${API_BASE_URL}/match/stream`, {
         method: 'POST',
         body: formData,
       });
      
       
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         const errorData = await response.json();
-        throw new Error(errorData.message || 'Failed to upload resumes');
+        throw new Error(errorData.detail || errorData.message || 'Failed to upload resumes');
       }
       
-      // Parse response
-      const data = await response.json();
-      console.log('DS Response:---', data);
-      
-      if (!data.success) {
-        throw new Error(data.message || 'API returned an error');
+      // Parse the NDJSON stream, showing each result (and later its feedback) as it arrives.
+      // Until the "done" event the results are incomplete, which they stay if the stream fails
+      let data: ApiResponse = { success: true, jobMatches: [], incomplete: true };
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffered = '';
+      for (;;) {
+        const { done, value } = await reader.read();
+        buffered += decoder.decode(value, { stream: !done });
+        const lines = buffered.split('\n');
+        buffered = done ? '' : lines.pop() || '';
+        for (const line of lines) {
+          if (line.trim()) {
+            data = applyMatchEvent(data, JSON.parse(line) as MatchStreamEvent);
+          }
+        }
+        setResponseData(data);
+        if (done) break;
       }
-      
-      // Set response data - support both old and new formats
-      setResponseData(data);
+      if (data.incomplete) {
+        throw new Error("The connection closed before every resume was analyzed. The results shown are incomplete.");
+      }
+      console.log('DS Response:---', data);
       
       // Success notification
       toast("Analysis complete", {
@@ -1,7 +1,8 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 import os
 from dotenv import load_dotenv
+import json
 import sys
 import time
 
@@ -47,7 +48,9 @@ def generate_questions():
             industry=industry,
             experience_level=experience_level,
             candidate_background=candidate_background,
-            question_count=question_count
+            question_count=question_count,
+            use_cache=data.get('use_cache', True),
+            mix_fresh=data.get('mix_fresh')
         )
         
         # If we got an empty list or None, return a meaningful error
@@ -71,6 +74,49 @@ def generate_questions():
             "follow_ups": ["Please try again with different parameters."]
         }])
 
+# Same request as /generate, answered as server-sent events: one "question" event per question as
+# soon as the model has written it, then "done" (or "error")
+@app.route('/generate-stream', methods=['POST'])
+def generate_questions_stream():
+    data = request.json or {}
+    job_role = data.get('job_role', '')
+    industry = data.get('industry', '')
+    experience_level = data.get('experience_level', '')
+    candidate_background = data.get('candidate_background', '')
+    question_count = int(data.get('question_count', 10))
+
+    if not all([job_role, industry, experience_level]):
+        return jsonify([{"question": "Missing required fields. Please fill in all required information."}]), 400
+
+    def events():
+        count = 0
+        try:
+            for question in question_generator.stream_questions(
+                job_role=job_role,
+                industry=industry,
+                experience_level=experience_level,
+                candidate_background=candidate_background,
+                question_count=question_count,
+                use_cache=data.get('use_cache', True),
+                mix_fresh=data.get('mix_fresh')
+            ):
+                yield sse_event('question', {"index": count, "question": question})
+                count += 1
+            yield sse_event('done', {"count": count})
+        except Exception as e:
+            print(f"Error in generate_questions_stream: {e}")
+            yield sse_event('error', {"message": f"An error occurred: {str(e)}"})
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify(question_generator.cache_stats())
+
 @app.route('/follow-up', methods=['POST'])
 def generate_followup():
     try:
@@ -0,0 +1,102 @@
+"""JSON extraction from adversarial model responses: the old regex against utils.response_decoder.
+
+Builds ~100 KB responses of the kinds that hurt the old `\\{(?:\\s|.)*\\}` search (stray
+opening braces with no close, a huge unterminated string, brace soup, deep nesting) plus
+large well-formed, trailing-comma and truncated responses, and times both extractors on
+each. The old extractor runs in a subprocess and is reported as timed out past --timeout.
+
+Run from the interview-question-generator directory:
+    python -m benchmarks.bench_response_decoder --kb 100 --timeout 10
+"""
+import argparse
+import json
+import multiprocessing
+import re
+import time
+
+from utils.response_decoder import decode_json
+
+SCHEMA = {"next_questions": [str], "uncovered_areas": [str], "probe_deeper": [str]}
+
+
+def suggestions(size):
+    items = []
+    while len(json.dumps(items)) < size:
+        items.append(f"Ask how they handled incident #{len(items)} and what {{they}} changed afterwards")
+    return {"next_questions": items, "uncovered_areas": ["Leadership"], "probe_deeper": ["Metrics"]}
+
+
+def responses(size):
+    valid = json.dumps(suggestions(size), indent=2)
+    return {
+        "well-formed": "Here are my suggestions:\n```json\n" + valid + "\n```",
+        "trailing commas": valid.replace('"\n', '",\n').replace("]\n", "],\n"),
+        "truncated": valid[:-12],
+        "open braces": "Consider {" * (size // 10),
+        "unterminated string": '{"next_questions": ["' + "x" * size,
+        "brace soup": "{a} " * (size // 4) + valid[:200],
+        "deep nesting": "[" * (size // 2) + "{" * (size // 2),
+    }
+
+
+def old_extract(response):
+    # The extraction the QuestionGenerator methods used before utils.response_decoder
+    json_match = re.search(r'\{(?:\s|.)*\}', response, re.DOTALL)
+    if json_match:
+        try:
+            return json.loads(json_match.group(0))
+        except ValueError:
+            pass
+    json_start = response.find("{")
+    json_end = response.rfind("}") + 1
+    if json_start >= 0 and json_end > json_start:
+        try:
+            return json.loads(response[json_start:json_end])
+        except (ValueError, RecursionError):
+            pass
+    return None
+
+
+def _run_old(response, results):
+    start = time.perf_counter()
+    value = old_extract(response)
+    results.put((time.perf_counter() - start, value is not None))
+
+
+def time_old(response, timeout):
+    results = multiprocessing.Queue()
+    worker = multiprocessing.Process(target=_run_old, args=(response, results))
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        worker.terminate()
+        worker.join()
+        return None, False
+    return results.get()
+
+
+def time_new(response, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value, _ = decode_json(response, SCHEMA)
+    return (time.perf_counter() - start) / repeat, value is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kb", type=int, default=100, help="approximate response size")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds before the old regex is abandoned")
+    parser.add_argument("--repeat", type=int, default=20, help="decoder runs averaged per response")
+    args = parser.parse_args()
+
+    print(f"{'response':>20} {'size':>8} {'old regex':>12} {'ok':>4} {'decoder':>10} {'ok':>4}")
+    for name, response in responses(args.kb * 1024).items():
+        old_seconds, old_ok = time_old(response, args.timeout)
+        new_seconds, new_ok = time_new(response, args.repeat)
+        old = f"{old_seconds * 1000:>10.1f}ms" if old_seconds is not None else f">{args.timeout:>9.0f}s "
+        print(f"{name:>20} {len(response) // 1024:>6}KB {old:>12} {'yes' if old_ok else 'no':>4} "
+              f"{new_seconds * 1000:>8.2f}ms {'yes' if new_ok else 'no':>4}")
+
+
+if __name__ == "__main__":
+    main()
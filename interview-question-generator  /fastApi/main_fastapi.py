@@ -1,9 +1,10 @@
 from fastapi import FastAPI, Request, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import socketio
+import json
 import os
 import time
 from dotenv import load_dotenv
@@ -61,7 +62,8 @@ async def generate_questions(request: Request):
             return JSONResponse(content=[{"question": "Missing required fields."}], status_code=400)
 
         questions = question_generator.generate_questions(
-            job_role, industry, experience_level, candidate_background, question_count
+            job_role, industry, experience_level, candidate_background, question_count,
+            use_cache=data.get('use_cache', True), mix_fresh=data.get('mix_fresh')
         )
 
         return questions or [{
@@ -77,6 +79,45 @@ async def generate_questions(request: Request):
             "type": "Error"
         }], status_code=500)
 
+# Same request as /generate, answered as server-sent events: one "question" event per question as
+# soon as the model has written it, then "done" (or "error")
+@app.post("/generate-stream")
+async def generate_questions_stream(request: Request):
+    data = await request.json()
+    job_role = data.get('job_role', '')
+    industry = data.get('industry', '')
+    experience_level = data.get('experience_level', '')
+    candidate_background = data.get('candidate_background', '')
+    question_count = int(data.get('question_count', 10))
+
+    if not all([job_role, industry, experience_level]):
+        return JSONResponse(content=[{"question": "Missing required fields."}], status_code=400)
+
+    # A plain generator: StreamingResponse iterates it in a worker thread, so the blocking
+    # model stream doesn't hold up the event loop
+    def events():
+        count = 0
+        try:
+            for question in question_generator.stream_questions(
+                job_role, industry, experience_level, candidate_background, question_count,
+                use_cache=data.get('use_cache', True), mix_fresh=data.get('mix_fresh')
+            ):
+                yield sse_event('question', {"index": count, "question": question})
+                count += 1
+            yield sse_event('done', {"count": count})
+        except Exception as e:
+            yield sse_event('error', {"message": f"An error occurred: {str(e)}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.get("/cache-stats")
+async def cache_stats():
+    return question_generator.cache_stats()
+
 @app.post("/parse_resume")
 async def parse_resume(file: UploadFile = File(...)):
     try:
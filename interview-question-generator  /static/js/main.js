@@ -41,21 +41,24 @@ document.addEventListener('DOMContentLoaded', function() {
             question_count: document.getElementById('question_count').value
         };
         
-        // Call API to generate questions
-        fetch('/generate', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(formData)
+        // Call API to generate questions; each question is shown as soon as the model has written it
+        questionAccordion.innerHTML = '';
+        streamQuestions(formData, (question, index) => {
+            if (index === 0) {
+                // First question arrived: swap the loading indicator for the results
+                loadingIndicator.classList.add('d-none');
+                questionResults.classList.remove('d-none');
+            }
+            appendQuestion(question, index);
         })
-        .then(response => response.json())
-        .then(data => {
-            // Hide loading indicator
+        .then(count => {
             loadingIndicator.classList.add('d-none');
-            
-            // Display questions
-            displayQuestions(data);
+            if (count === 0) {
+                displayQuestions([{
+                    question: 'No questions could be generated. Please try different parameters.',
+                    type: 'General'
+                }]);
+            }
             questionResults.classList.remove('d-none');
         })
         .catch(error => {
@@ -65,155 +68,221 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
+    // POST the form to /generate-stream and call onQuestion(question, index) for every
+    // "question" server-sent event. Resolves with the number of questions received
+    function streamQuestions(formData, onQuestion) {
+        return fetch('/generate-stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(formData)
+        })
+        .then(response => {
+            if (!response.ok || !response.body) {
+                throw new Error(`Question stream failed with status ${response.status}`);
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let count = 0;
+            
+            // Events are separated by a blank line; a chunk can end in the middle of one
+            function handleEvents() {
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+                    const event = parseServerSentEvent(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                    if (event.name === 'question') {
+                        onQuestion(event.data.question, event.data.index);
+                        count++;
+                    } else if (event.name === 'error') {
+                        throw new Error(event.data.message);
+                    }
+                }
+            }
+            
+            function pump() {
+                return reader.read().then(({ value, done }) => {
+                    if (done) {
+                        buffer += decoder.decode();
+                        handleEvents();
+                        return count;
+                    }
+                    buffer += decoder.decode(value, { stream: true });
+                    handleEvents();
+                    return pump();
+                });
+            }
+            return pump();
+        });
+    }
+    
+    // Parse one "event: name\ndata: {...}" block
+    function parseServerSentEvent(block) {
+        let name = 'message';
+        const data = [];
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                name = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                data.push(line.slice(5).trim());
+            }
+        });
+        return { name: name, data: data.length ? JSON.parse(data.join('\n')) : null };
+    }
+    
     // Display generated questions
     function displayQuestions(questions) {
         questionAccordion.innerHTML = '';
+        questions.forEach((question, index) => appendQuestion(question, index));
+    }
+    
+    // Add one question card to the accordion
+    function appendQuestion(question, index) {
+        const questionId = `question-${index}`;
+        const questionType = question.type || 'General';
         
-        questions.forEach((question, index) => {
-            const questionId = `question-${index}`;
-            const questionType = question.type || 'General';
-            
-            // Create the question card
-            const questionCard = document.createElement('div');
-            questionCard.className = 'accordion-item question-card mb-3 shadow-sm';
+        // Create the question card
+        const questionCard = document.createElement('div');
+        questionCard.className = 'accordion-item question-card mb-3 shadow-sm';
+        
+        // Create question header
+        const questionHeader = document.createElement('h2');
+        questionHeader.className = 'accordion-header';
+        questionHeader.id = `heading-${questionId}`;
+        
+        const accordionButton = document.createElement('button');
+        accordionButton.className = 'accordion-button collapsed';
+        accordionButton.type = 'button';
+        accordionButton.setAttribute('data-bs-toggle', 'collapse');
+        accordionButton.setAttribute('data-bs-target', `#collapse-${questionId}`);
+        accordionButton.setAttribute('aria-expanded', 'false');
+        accordionButton.setAttribute('aria-controls', `collapse-${questionId}`);
+        
+        // Add type badge
+        const typeBadge = document.createElement('span');
+        typeBadge.className = `question-type-badge ${questionType.toLowerCase().replace(' ', '-')}`;
+        typeBadge.textContent = questionType;
+        
+        const questionText = document.createElement('span');
+        questionText.className = 'ms-2';
+        questionText.textContent = question.question;
+        
+        accordionButton.appendChild(typeBadge);
+        accordionButton.appendChild(questionText);
+        questionHeader.appendChild(accordionButton);
+        
+        // Create question content
+        const questionContent = document.createElement('div');
+        questionContent.id = `collapse-${questionId}`;
+        questionContent.className = 'accordion-collapse collapse';
+        questionContent.setAttribute('aria-labelledby', `heading-${questionId}`);
+        questionContent.setAttribute('data-bs-parent', '#questionAccordion');
+        
+        // Create accordion body
+        const accordionBody = document.createElement('div');
+        accordionBody.className = 'accordion-body';
+        
+        // What this evaluates
+        if (question.evaluates) {
+            const evaluatesSection = document.createElement('div');
+            evaluatesSection.className = 'mb-3';
             
-            // Create question header
-            const questionHeader = document.createElement('h2');
-            questionHeader.className = 'accordion-header';
-            questionHeader.id = `heading-${questionId}`;
+            const evaluatesLabel = document.createElement('div');
+            evaluatesLabel.className = 'fw-bold mb-1';
+            evaluatesLabel.textContent = 'This question evaluates:';
             
-            const accordionButton = document.createElement('button');
-            accordionButton.className = 'accordion-button collapsed';
-            accordionButton.type = 'button';
-            accordionButton.setAttribute('data-bs-toggle', 'collapse');
-            accordionButton.setAttribute('data-bs-target', `#collapse-${questionId}`);
-            accordionButton.setAttribute('aria-expanded', 'false');
-            accordionButton.setAttribute('aria-controls', `collapse-${questionId}`);
+            const evaluatesValue = document.createElement('div');
             
-            // Add type badge
-            const typeBadge = document.createElement('span');
-            typeBadge.className = `question-type-badge ${questionType.toLowerCase().replace(' ', '-')}`;
-            typeBadge.textContent = questionType;
+            // Format evaluates as tags if it's a string
+            if (typeof question.evaluates === 'string') {
+                const skills = question.evaluates.split(',').map(skill => skill.trim());
+                skills.forEach(skill => {
+                    const tag = document.createElement('span');
+                    tag.className = 'evaluates-tag';
+                    tag.textContent = skill;
+                    evaluatesValue.appendChild(tag);
+                });
+            } else {
+                evaluatesValue.textContent = question.evaluates;
+            }
             
-            const questionText = document.createElement('span');
-            questionText.className = 'ms-2';
-            questionText.textContent = question.question;
+            evaluatesSection.appendChild(evaluatesLabel);
+            evaluatesSection.appendChild(evaluatesValue);
+            accordionBody.appendChild(evaluatesSection);
+        }
+        
+        // Strong answer example
+        if (question.strong_answer_example) {
+            const answerSection = document.createElement('div');
+            answerSection.className = 'mb-3';
             
-            accordionButton.appendChild(typeBadge);
-            accordionButton.appendChild(questionText);
-            questionHeader.appendChild(accordionButton);
+            const answerLabel = document.createElement('div');
+            answerLabel.className = 'fw-bold mb-1';
+            answerLabel.textContent = 'What makes a strong answer:';
             
-            // Create question content
-            const questionContent = document.createElement('div');
-            questionContent.id = `collapse-${questionId}`;
-            questionContent.className = 'accordion-collapse collapse';
-            questionContent.setAttribute('aria-labelledby', `heading-${questionId}`);
-            questionContent.setAttribute('data-bs-parent', '#questionAccordion');
+            const answerValue = document.createElement('div');
+            answerValue.className = 'p-2 bg-light rounded';
+            answerValue.textContent = question.strong_answer_example;
             
-            // Create accordion body
-            const accordionBody = document.createElement('div');
-            accordionBody.className = 'accordion-body';
+            answerSection.appendChild(answerLabel);
+            answerSection.appendChild(answerValue);
+            accordionBody.appendChild(answerSection);
+        }
+        
+        // Follow-up questions
+        if (question.follow_ups && question.follow_ups.length > 0) {
+            const followUpsSection = document.createElement('div');
+            followUpsSection.className = 'mb-3';
             
-            // What this evaluates
-            if (question.evaluates) {
-                const evaluatesSection = document.createElement('div');
-                evaluatesSection.className = 'mb-3';
-                
-                const evaluatesLabel = document.createElement('div');
-                evaluatesLabel.className = 'fw-bold mb-1';
-                evaluatesLabel.textContent = 'This question evaluates:';
-                
-                const evaluatesValue = document.createElement('div');
-                
-                // Format evaluates as tags if it's a string
-                if (typeof question.evaluates === 'string') {
-                    const skills = question.evaluates.split(',').map(skill => skill.trim());
-                    skills.forEach(skill => {
-                        const tag = document.createElement('span');
-                        tag.className = 'evaluates-tag';
-                        tag.textContent = skill;
-                        evaluatesValue.appendChild(tag);
-                    });
-                } else {
-                    evaluatesValue.textContent = question.evaluates;
-                }
-                
-                evaluatesSection.appendChild(evaluatesLabel);
-                evaluatesSection.appendChild(evaluatesValue);
-                accordionBody.appendChild(evaluatesSection);
-            }
+            const followUpsLabel = document.createElement('div');
+            followUpsLabel.className = 'fw-bold mb-1';
+            followUpsLabel.textContent = 'Suggested follow-up questions:';
             
-            // Strong answer example
-            if (question.strong_answer_example) {
-                const answerSection = document.createElement('div');
-                answerSection.className = 'mb-3';
-                
-                const answerLabel = document.createElement('div');
-                answerLabel.className = 'fw-bold mb-1';
-                answerLabel.textContent = 'What makes a strong answer:';
-                
-                const answerValue = document.createElement('div');
-                answerValue.className = 'p-2 bg-light rounded';
-                answerValue.textContent = question.strong_answer_example;
-                
-                answerSection.appendChild(answerLabel);
-                answerSection.appendChild(answerValue);
-                accordionBody.appendChild(answerSection);
-            }
+            const followUpsList = document.createElement('ul');
+            followUpsList.className = 'list-group list-group-flush';
             
-            // Follow-up questions
-            if (question.follow_ups && question.follow_ups.length > 0) {
-                const followUpsSection = document.createElement('div');
-                followUpsSection.className = 'mb-3';
-                
-                const followUpsLabel = document.createElement('div');
-                followUpsLabel.className = 'fw-bold mb-1';
-                followUpsLabel.textContent = 'Suggested follow-up questions:';
-                
-                const followUpsList = document.createElement('ul');
-                followUpsList.className = 'list-group list-group-flush';
-                
-                if (Array.isArray(question.follow_ups)) {
-                    question.follow_ups.forEach(followUp => {
-                        const followUpItem = document.createElement('li');
-                        followUpItem.className = 'list-group-item px-0';
-                        followUpItem.textContent = typeof followUp === 'string' ? followUp : followUp.follow_up_question || followUp;
-                        followUpsList.appendChild(followUpItem);
-                    });
-                } else {
-                    // Handle case where follow_ups might not be an array
+            if (Array.isArray(question.follow_ups)) {
+                question.follow_ups.forEach(followUp => {
                     const followUpItem = document.createElement('li');
                     followUpItem.className = 'list-group-item px-0';
-                    followUpItem.textContent = question.follow_ups.toString();
+                    followUpItem.textContent = typeof followUp === 'string' ? followUp : followUp.follow_up_question || followUp;
                     followUpsList.appendChild(followUpItem);
-                }
-                
-                followUpsSection.appendChild(followUpsLabel);
-                followUpsSection.appendChild(followUpsList);
-                accordionBody.appendChild(followUpsSection);
+                });
+            } else {
+                // Handle case where follow_ups might not be an array
+                const followUpItem = document.createElement('li');
+                followUpItem.className = 'list-group-item px-0';
+                followUpItem.textContent = question.follow_ups.toString();
+                followUpsList.appendChild(followUpItem);
             }
             
-            // Add button to generate more follow-up questions
-            const generateMoreFollowUps = document.createElement('div');
-            generateMoreFollowUps.className = 'text-end no-print';
-            
-            const followUpButton = document.createElement('button');
-            followUpButton.className = 'btn btn-sm btn-outline-primary';
-            followUpButton.textContent = 'Generate Follow-up Questions';
-            followUpButton.addEventListener('click', function() {
-                openFollowUpModal(question.question, questionId);
-            });
-            
-            generateMoreFollowUps.appendChild(followUpButton);
-            accordionBody.appendChild(generateMoreFollowUps);
-            
-            questionContent.appendChild(accordionBody);
-            
-            // Add question to accordion
-            questionCard.appendChild(questionHeader);
-            questionCard.appendChild(questionContent);
-            questionAccordion.appendChild(questionCard);
+            followUpsSection.appendChild(followUpsLabel);
+            followUpsSection.appendChild(followUpsList);
+            accordionBody.appendChild(followUpsSection);
+        }
+        
+        // Add button to generate more follow-up questions
+        const generateMoreFollowUps = document.createElement('div');
+        generateMoreFollowUps.className = 'text-end no-print';
+        
+        const followUpButton = document.createElement('button');
+        followUpButton.className = 'btn btn-sm btn-outline-primary';
+        followUpButton.textContent = 'Generate Follow-up Questions';
+        followUpButton.addEventListener('click', function() {
+            openFollowUpModal(question.question, questionId);
         });
+        
+        generateMoreFollowUps.appendChild(followUpButton);
+        accordionBody.appendChild(generateMoreFollowUps);
+        
+        questionContent.appendChild(accordionBody);
+        
+        // Add question to accordion
+        questionCard.appendChild(questionHeader);
+        questionCard.appendChild(questionContent);
+        questionAccordion.appendChild(questionCard);
     }
     
     // Open follow-up question modal
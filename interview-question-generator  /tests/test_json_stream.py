@@ -0,0 +1,80 @@
+import json
+
+from utils.json_stream import JsonArrayStreamParser
+
+QUESTIONS = [
+    {"question": "Tell me about {a time} you disagreed", "follow_ups": ["Why?", "[Then] what?"]},
+    {"question": 'Explain \\"escaping\\" and "quotes"', "type": "technical"},
+    {"question": "Design a rate limiter", "follow_ups": []},
+]
+
+
+def parse(text, chunk_size=None):
+    parser = JsonArrayStreamParser()
+    chunk_size = chunk_size or len(text) or 1
+    objects = []
+    for i in range(0, len(text), chunk_size):
+        objects += parser.feed(text[i:i + chunk_size])
+    return parser, objects
+
+
+def test_objects_come_out_as_they_close():
+    parser = JsonArrayStreamParser()
+    assert parser.feed('[{"question": "One"}, {"question": "Tw') == [{"question": "One"}]
+    assert parser.feed('o"}]') == [{"question": "Two"}]
+    assert parser.finished
+
+
+def test_any_chunking_gives_the_same_objects():
+    text = json.dumps(QUESTIONS, indent=2)
+    for chunk_size in (1, 2, 3, 7, len(text)):
+        parser, objects = parse(text, chunk_size)
+        assert objects == QUESTIONS
+        assert parser.finished and not parser.skipped
+
+
+def test_preamble_is_skipped():
+    parser, objects = parse("Here are your questions:\n\n" + json.dumps(QUESTIONS))
+    assert objects == QUESTIONS
+    assert parser.finished
+
+
+def test_bracket_in_preamble_does_not_start_the_array():
+    text = "[Note] Questions below, see [1] for the rubric:\n" + json.dumps(QUESTIONS, indent=2)
+    for chunk_size in (1, 5, len(text)):
+        parser, objects = parse(text, chunk_size)
+        assert objects == QUESTIONS
+        assert parser.finished and not parser.skipped
+
+
+def test_whitespace_between_bracket_and_object_split_across_chunks():
+    parser = JsonArrayStreamParser()
+    assert parser.feed("Sure: [") == []
+    assert not parser.started
+    assert parser.feed("\n  ") == []
+    assert parser.feed('{"question": "One"}]') == [{"question": "One"}]
+    assert parser.finished
+
+
+def test_empty_array():
+    parser, objects = parse("Nothing to ask: [ ]")
+    assert objects == []
+    assert parser.started and parser.finished
+
+
+def test_invalid_object_is_skipped():
+    parser, objects = parse('[{"question": "One"}, {"question": One}, {"question": "Three"}]')
+    assert objects == [{"question": "One"}, {"question": "Three"}]
+    assert parser.skipped == 1
+    assert parser.finished
+
+
+def test_text_after_the_array_is_ignored():
+    parser, objects = parse('[{"question": "One"}] and [{"question": "Two"}]')
+    assert objects == [{"question": "One"}]
+
+
+def test_truncated_stream_is_not_finished():
+    parser, objects = parse('[{"question": "One"}, {"question": "Tw')
+    assert objects == [{"question": "One"}]
+    assert parser.started and not parser.finished
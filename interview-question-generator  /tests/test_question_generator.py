@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+pytest.importorskip("anthropic")
+
+from utils.question_generator import QuestionGenerator  # noqa: E402
+
+
+class ScriptedClient:
+    """Stands in for AnthropicClient, answering every prompt with a fixed response"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def generate_content(self, prompt, max_tokens=2000):
+        return self.response
+
+
+def generator(response):
+    question_generator = QuestionGenerator("test-key")
+    question_generator.anthropic_client = ScriptedClient(json.dumps(response))
+    return question_generator
+
+
+def test_partial_evaluation_is_returned_with_defaults():
+    evaluation = generator({
+        "scores": [{"criterion": "Technical Competence", "score": 4, "evidence": "Explained caching well"}],
+        "overall_assessment": {"strengths": ["Depth"]},
+    }).evaluate_candidate("Backend Engineer", [{"question": "Q", "answer": "A"}])
+
+    assert "error" not in evaluation
+    assert evaluation["scores"][0]["improvement"] == ""
+    assert evaluation["overall_assessment"] == {"strengths": ["Depth"], "areas_for_improvement": [], "overall_fit": ""}
+
+
+def test_evaluation_without_scores_falls_back():
+    evaluation = generator({"overall_assessment": {"overall_fit": "Good Fit"}}).evaluate_candidate("Engineer", [])
+    assert evaluation["error"] == "Failed to parse evaluation"
+
+
+def test_partial_tone_analysis_is_returned_with_defaults():
+    analysis = generator({
+        "tone": {"confidence_level": 4},
+        "overall_impression": "Confident and concrete.",
+    }).analyze_response_tone("I led the migration and cut latency by half.")
+
+    assert "error" not in analysis
+    assert analysis["overall_impression"] == "Confident and concrete."
+    assert analysis["tone"] == {"confidence_level": 4, "primary_tones": []}
+    assert analysis["language_patterns"] == {} and analysis["authenticity"] == {}
+
+
+def test_partial_comparison_report_is_returned_with_defaults():
+    report = generator({
+        "recommendations": [{"rank": 1, "candidate": "Ada"}],
+        "metrics_comparison": [{"metric": "Communication"}],
+    }).generate_comparison_report([{"name": "Ada"}, {"name": "Grace"}])
+
+    assert "error" not in report
+    assert report["recommendations"] == [{"rank": 1, "candidate": "Ada", "rationale": ""}]
+    assert report["metrics_comparison"] == [{"metric": "Communication", "rankings": []}]
+    assert report["key_differentiators"] == [] and report["summary"] == ""
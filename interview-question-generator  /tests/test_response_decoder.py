@@ -0,0 +1,121 @@
+import json
+import time
+
+import pytest
+
+from utils.response_decoder import Number, Optional, decode_json, find_json_spans, repair_json, validate
+
+SUGGESTIONS_SCHEMA = {"next_questions": [str], "uncovered_areas": [str], "probe_deeper": [str]}
+SUGGESTIONS = {"next_questions": ["Why {this}?"], "uncovered_areas": ["Leadership"], "probe_deeper": ["Metrics"]}
+
+
+def test_find_json_spans_skips_brackets_in_strings():
+    text = 'Note {a} then {"q": "a } and { inside", "n": [1, {"x": 2}]} tail {open'
+    spans = list(find_json_spans(text))
+    assert [text[start:end] for start, end, _ in spans] == [
+        "{a}", '{"q": "a } and { inside", "n": [1, {"x": 2}]}', "{open"
+    ]
+    assert [closed for _, _, closed in spans] == [True, True, False]
+
+
+def test_find_json_spans_handles_escaped_quotes():
+    text = r'{"q": "say \"}\" and \\", "n": 1}'
+    assert list(find_json_spans(text)) == [(0, len(text), True)]
+
+
+@pytest.mark.parametrize("broken, expected", [
+    ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}),
+    ('{\n  "a": 1, // the first\n  "b": "http://x" // url\n}', {"a": 1, "b": "http://x"}),
+    ('{"a": [1, 2', {"a": [1, 2]}),
+    ('{"a": "unfinished str', {"a": "unfinished str"}),
+    ('{"a": 1, "b":', {"a": 1, "b": None}),
+    ('{"a": 1, "b": tr', {"a": 1}),
+    ('{"a": 1, "b": "x\\', {"a": 1, "b": "x"}),
+    ('[{"q": "one"}, {"q": "tw', [{"q": "one"}, {"q": "tw"}]),
+])
+def test_repair_json(broken, expected):
+    assert json.loads(repair_json(broken)) == expected
+
+
+def test_repair_json_leaves_valid_json_alone():
+    text = json.dumps({"a": [1, {"b": "c, // d"}], "e": "]"})
+    assert repair_json(text) == text
+
+
+def test_validate_reports_paths():
+    value = {"scores": [{"criterion": "Depth", "score": "8.5"}, {"criterion": 3, "score": "high"}]}
+    schema = {"scores": [{"criterion": str, "score": Number}], "summary": str}
+    assert validate(value, schema) == [
+        "$.scores[1].criterion should be str",
+        "$.scores[1].score should be a number",
+        "$.summary is missing",
+    ]
+    assert validate(True, Number) == ["$ should be a number"]
+
+
+def test_decode_json_from_fenced_response():
+    response = "Here you go:\n```json\n" + json.dumps(SUGGESTIONS, indent=2) + "\n```\nGood luck!"
+    assert decode_json(response, SUGGESTIONS_SCHEMA) == (SUGGESTIONS, [])
+
+
+def test_decode_json_skips_values_that_do_not_match_the_schema():
+    response = 'Example: {"note": "ignore me"} and then ' + json.dumps(SUGGESTIONS)
+    value, problems = decode_json(response, SUGGESTIONS_SCHEMA)
+    assert value == SUGGESTIONS
+    assert len(problems) == 1 and "does not match the schema" in problems[0]
+
+
+def test_decode_json_repairs_truncated_response():
+    response = json.dumps([{"question": f"Q{i}"} for i in range(5)])[:-10]
+    value, _ = decode_json(response, [{"question": str}])
+    assert value == [{"question": f"Q{i}"} for i in range(4)]
+
+
+def test_decode_json_looks_for_arrays_only_with_a_list_schema():
+    response = '{"question": "not this"} [{"question": "this"}]'
+    assert decode_json(response, [{"question": str}])[0] == [{"question": "this"}]
+    assert decode_json(response)[0] == {"question": "not this"}
+
+
+def test_decode_json_without_json():
+    assert decode_json("I can't help with that.", SUGGESTIONS_SCHEMA) == (None, ["no JSON found in the response"])
+    assert decode_json(None) == (None, ["no JSON found in the response"])
+
+
+@pytest.mark.parametrize("response", [
+    "Consider {" * 20000,
+    '{"next_questions": ["' + "x" * 200000,
+    "{a} " * 50000,
+    "[" * 100000 + "{" * 100000,
+])
+def test_decode_json_is_fast_on_adversarial_responses(response):
+    start = time.perf_counter()
+    value, problems = decode_json(response, SUGGESTIONS_SCHEMA)
+    assert time.perf_counter() - start < 2
+    assert value is None and problems
+
+
+def test_optional_keys_may_be_missing_and_get_defaults():
+    schema = {
+        "scores": [{"criterion": str, "evidence": Optional(str, "")}],
+        "overall": Optional({"fit": Optional(str, ""), "strengths": Optional([str], [])}, {}),
+    }
+    value, problems = decode_json('{"scores": [{"criterion": "Depth"}]}', schema)
+    assert value == {"scores": [{"criterion": "Depth", "evidence": ""}], "overall": {"fit": "", "strengths": []}}
+    assert problems == []
+
+    value, _ = decode_json('{"scores": [], "overall": {"fit": "Good Fit"}}', schema)
+    assert value["overall"] == {"fit": "Good Fit", "strengths": []}
+
+
+def test_optional_keys_are_still_type_checked():
+    schema = {"name": str, "tags": Optional([str], [])}
+    assert validate({"name": "a", "tags": "python"}, schema) == ["$.tags should be an array"]
+    assert decode_json('{"name": "a", "tags": "python"}', schema)[0] is None
+
+
+def test_optional_defaults_are_not_shared():
+    schema = {"tags": Optional([str], [])}
+    first, _ = decode_json("{}", schema)
+    first["tags"].append("changed")
+    assert decode_json("{}", schema)[0] == {"tags": []}
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+
+from utils.semantic_cache import HashedNgramEmbedder, SemanticCache, normalize_text
+
+REQUEST = {
+    "job_role": "Senior Backend Engineer",
+    "industry": "Fintech",
+    "experience_level": "Senior",
+    "candidate_background": "5 years of Python and Django, built payment APIs",
+}
+QUESTIONS = [f"Question {i}" for i in range(10)]
+
+# Labelled background pairs the default background threshold is set from
+PARAPHRASES = [
+    ("5 years of Python and Django, built payment APIs", "5 years of Python/Django; built payment APIs"),
+    ("5 years of Python/Django; built payment APIs", "5 yrs Python & Django, built payments APIs"),
+    ("5 years of Python and Django, built payment APIs", "6 years of Python and Django, built payments APIs"),
+    ("Senior Java developer with Spring Boot and microservices", "Java/Spring Boot microservices, senior dev"),
+    ("Senior QA engineer, Selenium and Cypress", "Sr. quality assurance engineer (Cypress, Selenium)"),
+    ("Data scientist, ML with PyTorch and pandas", "Data scientist using pandas and PyTorch for machine learning"),
+    ("Registered nurse, 4 years ICU experience", "ICU registered nurse with 4 yrs exp"),
+    ("AWS, Terraform and Kubernetes for 6 years", "6 years of Kubernetes, Terraform, AWS"),
+    ("Sales lead, enterprise accounts, 8 years", "Enterprise account sales lead with 8 years"),
+    ("Mechanical engineer, 10 years in automotive", "10 yrs automotive mechanical engineering"),
+    ("Python developer", "Python dev"),
+]
+DISTINCT = [
+    ("Python developer", "Go developer"),
+    ("5 years of Python/Django; built payment APIs", "5 years of Java/Spring; built trading systems"),
+    ("5 years of Python and Django", "5 years of Ruby and Rails"),
+    ("Senior Java developer with Spring Boot and microservices", "Senior C# developer with .NET and microservices"),
+    ("3 years React and TypeScript frontend", "3 years Angular and JavaScript frontend"),
+    ("Frontend engineer, Vue.js, 2 years", "Backend engineer, Node.js, 2 years"),
+    ("Data scientist, ML with PyTorch and pandas", "Data engineer, Spark and Airflow pipelines"),
+    ("Registered nurse, 4 years ICU experience", "Registered nurse, 4 years pediatric experience"),
+    ("AWS, Terraform and Kubernetes for 6 years", "Azure, Bicep and Docker for 6 years"),
+    ("Mechanical engineer, 10 years in automotive", "Electrical engineer, 10 years in aerospace"),
+    ("iOS developer, Swift", "Android developer, Kotlin"),
+]
+
+
+def request(**fields):
+    return {**REQUEST, **fields}
+
+
+def test_normalize_text_expands_abbreviations():
+    assert normalize_text("Sr. SWE, 5 yrs exp & ML") == "senior software engineer 5 years experience and machine learning"
+
+
+def test_field_similarities_match_per_field_cosine():
+    embedder = HashedNgramEmbedder()
+    a = embedder.embed(REQUEST)
+    b = embedder.embed(request(candidate_background="Go developer"))
+    assert np.isclose(np.linalg.norm(a), 1.0, atol=1e-5)
+    total = sum(
+        float(embedder.field_similarities(a[None], b, field)[0]) * weight
+        for field, weight in zip(embedder.fields, embedder.scales ** 2)
+    )
+    assert np.isclose(total, float(a @ b), atol=1e-5)
+
+
+def test_equivalent_request_hits():
+    cache = SemanticCache()
+    cache.store(cache.embed(REQUEST), QUESTIONS)
+    equivalent = request(candidate_background="5 yrs of python & django, built payment APIs.")
+    questions, similarity = cache.lookup(cache.embed(equivalent), 5)
+    assert questions == QUESTIONS[:5]
+    assert similarity > 0.99
+
+
+def test_paraphrased_background_hits():
+    cache = SemanticCache()
+    cache.store(cache.embed(REQUEST), QUESTIONS)
+    questions, _ = cache.lookup(cache.embed(request(candidate_background="5 years of Python/Django; built payment APIs")), 5)
+    assert questions == QUESTIONS[:5]
+
+
+@pytest.mark.parametrize("stored, asked, hit", [(*pair, True) for pair in PARAPHRASES] + [(*pair, False) for pair in DISTINCT])
+def test_background_threshold_separates_labelled_pairs(stored, asked, hit):
+    cache = SemanticCache()
+    cache.store(cache.embed(request(candidate_background=stored)), QUESTIONS)
+    assert (cache.lookup(cache.embed(request(candidate_background=asked)), 5)[0] is not None) == hit
+
+
+def test_different_background_misses_despite_overall_threshold():
+    cache = SemanticCache()
+    cache.store(cache.embed(request(candidate_background="Python developer")), QUESTIONS)
+    vector = cache.embed(request(candidate_background="Go developer"))
+    # Role, industry and level alone carry the weighted similarity past the overall threshold...
+    assert float(cache._vectors[0] @ vector) >= cache.threshold
+    # ...but the background threshold keeps the other candidate's questions out
+    assert cache.lookup(vector, 5)[0] is None
+
+    without_field_thresholds = SemanticCache(field_thresholds={})
+    without_field_thresholds.store(cache._vectors[0].copy(), QUESTIONS)
+    assert without_field_thresholds.lookup(vector, 5)[0] == QUESTIONS[:5]
+
+
+def test_different_role_misses():
+    cache = SemanticCache()
+    cache.store(cache.embed(REQUEST), QUESTIONS)
+    assert cache.lookup(cache.embed(request(job_role="Product Designer")), 5)[0] is None
+
+
+def test_entry_with_too_few_questions_misses():
+    cache = SemanticCache()
+    cache.store(cache.embed(REQUEST), QUESTIONS[:3])
+    assert cache.lookup(cache.embed(REQUEST), 5)[0] is None
+
+
+def test_expired_entry_misses():
+    cache = SemanticCache(ttl_seconds=-1)
+    cache.store(cache.embed(REQUEST), QUESTIONS)
+    assert cache.lookup(cache.embed(REQUEST), 5)[0] is None
+
+
+def test_full_cache_replaces_least_recently_used():
+    cache = SemanticCache(max_entries=2)
+    first, second, third = (cache.embed(request(job_role=role)) for role in ("Data Scientist", "Nurse", "Chef"))
+    cache.store(first, ["first"])
+    cache.store(second, ["second"])
+    cache._used[1] = 0  # second is the least recently used
+    cache.store(third, ["third"])
+    assert cache.evictions == 1
+    assert cache.lookup(first, 1)[0] == ["first"]
+    assert cache.lookup(second, 1)[0] is None
+    assert cache.lookup(third, 1)[0] == ["third"]
+
+
+def test_clear_resets_entries():
+    cache = SemanticCache(max_entries=2)
+    for role in ("Data Scientist", "Nurse"):
+        cache.store(cache.embed(request(job_role=role)), QUESTIONS)
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert not cache._counts.any()
+    assert np.isneginf(cache._used).all()
+
+    # Refilling after clear() fills free slots instead of evicting by stale timestamps
+    cache.store(cache.embed(REQUEST), QUESTIONS)
+    assert cache.evictions == 0
+    assert cache.lookup(cache.embed(REQUEST), 5)[0] == QUESTIONS[:5]
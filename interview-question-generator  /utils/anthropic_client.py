@@ -1,5 +1,12 @@
 import anthropic
 
+
+class AnthropicStreamError(RuntimeError):
+    """
+    The Anthropic API failed while a completion was being streamed
+    """
+
+
 class AnthropicClient:
     def __init__(self, api_key):
         self.api_key = api_key
@@ -27,4 +34,24 @@ class AnthropicClient:
             return response.completion.strip()
         except Exception as e:
             print(f"Error when calling Anthropic API: {e}")
-            return "Sorry, I couldn't generate questions at this time."
\ No newline at end of file
+            return "Sorry, I couldn't generate questions at this time."
+
+    def stream_content(self, prompt, max_tokens=2000):
+        """
+        Generate content like generate_content, yielding the text in chunks as the model produces it.
+        Raises AnthropicStreamError if the API call fails, including after some chunks were yielded
+        """
+        try:
+            stream = self.client.completions.create(
+                model=self.model,
+                prompt=anthropic.HUMAN_PROMPT + prompt + anthropic.AI_PROMPT,
+                max_tokens_to_sample=max_tokens,
+                temperature=0.7,
+                stream=True
+            )
+            for event in stream:
+                if event.completion:
+                    yield event.completion
+        except Exception as e:
+            print(f"Error when streaming from Anthropic API: {e}")
+            raise AnthropicStreamError(f"Streaming from the Anthropic API failed: {e}") from e
\ No newline at end of file
@@ -0,0 +1,75 @@
+import json
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally parses a streamed JSON array of objects, returning each object as soon as
+    its closing brace arrives.
+
+    Text before the opening bracket (a preamble the model wasn't supposed to write) is
+    skipped. Only a "[" followed by optional whitespace and then "{" or "]" opens the
+    array, so a bracket in the preamble such as "[Note] ..." is skipped too. Braces
+    inside strings are ignored, and an object that isn't valid JSON on its own is
+    dropped rather than stopping the stream. Each character is scanned once, and only
+    the text of the object in progress is kept.
+    """
+
+    def __init__(self):
+        self.started = False   # seen the array's opening bracket
+        self._opening = False  # seen a "[" in the preamble, waiting to see what follows it
+        self.finished = False  # seen its closing bracket
+        self.skipped = 0       # objects dropped as invalid JSON
+        self._buffer = []      # characters of the object in progress
+        self._depth = 0        # bracket/brace nesting inside that object
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk):
+        """
+        Consume the next piece of text; returns the objects it completed, in order
+        """
+        objects = []
+        for char in chunk:
+            if self.finished:
+                break
+            if self._depth == 0:
+                # Between objects: only the array's brackets and an object's opening brace matter
+                if not self.started:
+                    if not self._opening:
+                        self._opening = char == "["
+                        continue
+                    if char.isspace() or char == "[":
+                        continue
+                    self._opening = False
+                    self.started = char in "{]"
+                    if not self.started:
+                        continue
+                if char == "{":
+                    self._buffer = [char]
+                    self._depth = 1
+                elif char == "]":
+                    self.finished = True
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        objects.append(json.loads("".join(self._buffer)))
+                    except json.JSONDecodeError:
+                        self.skipped += 1
+                    self._buffer = []
+        return objects
+
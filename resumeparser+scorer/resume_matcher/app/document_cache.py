@@ -0,0 +1,150 @@
+import gzip
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "documents")
+
+DOCUMENT_CACHE_DIR = os.getenv("DOCUMENT_CACHE_DIR", DEFAULT_CACHE_DIR)
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DOCUMENT_CACHE_MAX_AGE_DAYS = float(os.getenv("DOCUMENT_CACHE_MAX_AGE_DAYS", "30"))
+DOCUMENT_MEMORY_ENTRIES = int(os.getenv("DOCUMENT_MEMORY_ENTRIES", "1024"))
+
+# Disk usage is trimmed to this fraction of the limit, so eviction doesn't run on every put
+EVICT_TO_FRACTION = 0.9
+
+
+class DocumentCache:
+    """Parsed-document cache keyed by the SHA-256 of the uploaded file's bytes.
+
+    Entries are plain dicts (text, name, email, skills, ...). Two tiers: an
+    in-process LRU and one gzip-compressed JSON file per document on disk. Disk
+    entries are evicted oldest-first once the tier outgrows `max_bytes`, and
+    entries not used for `max_age_days` are treated as missing and removed.
+    A hit refreshes the file's mtime, so age and eviction order follow last use.
+    """
+
+    def __init__(self, directory=DOCUMENT_CACHE_DIR, max_bytes=DOCUMENT_CACHE_MAX_BYTES,
+                 max_age_days=DOCUMENT_CACHE_MAX_AGE_DAYS, memory_entries=DOCUMENT_MEMORY_ENTRIES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.memory_entries = memory_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._disk_bytes = sum(size for _, _, size in self._files())
+
+    def _path(self, sha256):
+        return os.path.join(self.directory, sha256[:2], f"{sha256}.json.gz")
+
+    def _files(self):
+        """Yield (path, mtime, size) for every entry on disk."""
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json.gz"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_mtime, stat.st_size
+
+    def _remember(self, sha256, entry):
+        self._memory[sha256] = entry
+        self._memory.move_to_end(sha256)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _remove(self, path, size):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._disk_bytes -= size
+        self.evictions += 1
+
+    def get(self, sha256):
+        """Return the cached entry for a file hash, or None."""
+        with self._lock:
+            entry = self._memory.get(sha256)
+            if entry is not None:
+                self._memory.move_to_end(sha256)
+                self.hits += 1
+                return entry
+
+            path = self._path(sha256)
+            try:
+                stat = os.stat(path)
+                if time.time() - stat.st_mtime > self.max_age:
+                    self._remove(path, stat.st_size)
+                    raise FileNotFoundError(path)
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    entry = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+
+            self._remember(sha256, entry)
+            self.disk_hits += 1
+            return entry
+
+    def get_many(self, hashes):
+        return [self.get(sha256) for sha256 in hashes]
+
+    def put(self, sha256, entry):
+        """Store or replace the entry for a file hash in both tiers."""
+        data = gzip.compress(json.dumps(entry, separators=(",", ":")).encode("utf-8"))
+        path = self._path(sha256)
+        with self._lock:
+            self._remember(sha256, entry)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                previous_size = os.path.getsize(path)
+            except OSError:
+                previous_size = 0
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._disk_bytes += len(data) - previous_size
+            if self._disk_bytes > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used ones until under the size limit."""
+        with self._lock:
+            now = time.time()
+            files = sorted(self._files(), key=lambda item: item[1])
+            self._disk_bytes = sum(size for _, _, size in files)
+            target = self.max_bytes * EVICT_TO_FRACTION
+            for path, mtime, size in files:
+                if now - mtime <= self.max_age and self._disk_bytes <= target:
+                    break
+                self._remove(path, size)
+                self._memory.pop(os.path.basename(path)[:-len(".json.gz")], None)
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "memoryEntries": len(self._memory),
+            "diskBytes": self._disk_bytes,
+            "maxBytes": self.max_bytes,
+            "maxAgeDays": self.max_age / 86400,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process use only
+    fcntl = None
+
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "embeddings")
+
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", DEFAULT_STORE_DIR)
+EMBEDDING_STORE_MAX_ENTRIES = int(os.getenv("EMBEDDING_STORE_MAX_ENTRIES", "50000"))
+EMBEDDING_MEMORY_ENTRIES = int(os.getenv("EMBEDDING_MEMORY_ENTRIES", "2048"))
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially different extractions share a key."""
+    return " ".join(text.split())
+
+
+def content_key(text, model_name):
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Embedding cache keyed by content hash + model name.
+
+    Two tiers: an in-process LRU of recent vectors and a fixed-size memory-mapped
+    float32 matrix on disk. `index.log` is an append-only log of (key, row, last
+    used) records, so worker processes opening the same directory share the
+    vectors through the page cache and only read the records they haven't seen.
+    Reads hold a shared file lock and writes an exclusive one, so a row can't be
+    overwritten between looking up its key and reading it. When the disk tier is
+    full the least recently used row is overwritten.
+    """
+
+    def __init__(self, model_name, dim, directory=EMBEDDING_STORE_DIR,
+                 max_entries=EMBEDDING_STORE_MAX_ENTRIES, memory_entries=EMBEDDING_MEMORY_ENTRIES):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+
+        safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", model_name)
+        self.directory = os.path.join(directory, f"{safe_name}-{dim}")
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.index_path = os.path.join(self.directory, "index.log")
+        self.lock_path = os.path.join(self.directory, "index.lock")
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._index = OrderedDict()  # key -> [row, last_used], least recently used first
+        self._owners = {}            # row -> key
+        self._free = []              # unowned rows below _next_row
+        self._next_row = 0           # rows from here to max_entries have never been used
+        self._touched = set()        # keys read since the last write, logged with it
+        self._generation = None      # first line of the log, new each time it is rewritten
+        self._log_stat = None        # (size, mtime) of the log when last read
+        self._log_offset = 0
+        self._log_records = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        with self._file_lock():
+            if not os.path.exists(self.vectors_path) or os.path.getsize(self.vectors_path) < max_entries * dim * 4:
+                with open(self.vectors_path, "ab") as f:
+                    f.truncate(max_entries * dim * 4)
+            if not os.path.exists(self.index_path):
+                self._write_log([])
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r+", shape=(max_entries, dim))
+        with self._lock, self._file_lock(shared=True):
+            self._reload_index()
+
+    @contextmanager
+    def _file_lock(self, shared=False):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _apply(self, key, row, used):
+        if row >= self.max_entries:
+            return
+        previous = self._index.pop(key, None)
+        if previous is not None and previous[0] != row:
+            self._owners.pop(previous[0], None)
+            self._free.append(previous[0])
+        evicted = self._owners.get(row)
+        if evicted is not None and evicted != key:
+            self._index.pop(evicted, None)
+        self._owners[row] = key
+        self._index[key] = [row, used]
+        if row >= self._next_row:
+            self._free.extend(range(self._next_row, row))
+            self._next_row = row + 1
+        self._log_records += 1
+
+    def _reload_index(self):
+        """Apply the log records other processes appended since the last call. Needs the file lock."""
+        stat = os.stat(self.index_path)
+        if (stat.st_size, stat.st_mtime_ns) == self._log_stat:
+            return
+        with open(self.index_path, "rb") as f:
+            generation = f.readline()
+            if generation != self._generation:
+                # Rewritten by another process's compaction: start over from the new log
+                self._index.clear()
+                self._owners.clear()
+                self._free = []
+                self._next_row = 0
+                self._log_records = 0
+                self._generation = generation
+                self._log_offset = f.tell()
+            f.seek(self._log_offset)
+            data = f.read()
+        self._log_offset += len(data)
+        self._log_stat = (stat.st_size, stat.st_mtime_ns)
+        for line in data.splitlines():
+            self._apply(*json.loads(line))
+        # Rows freed by a shrunk max_entries or key moves may have been claimed since
+        self._free = [row for row in self._free if row not in self._owners]
+
+    def _synced(self):
+        # The log now holds exactly what this process has applied
+        stat = os.stat(self.index_path)
+        self._log_offset = stat.st_size
+        self._log_stat = (stat.st_size, stat.st_mtime_ns)
+
+    def _append_log(self, records):
+        with open(self.index_path, "ab") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records).encode("utf-8"))
+        self._synced()
+
+    def _write_log(self, records):
+        generation = json.dumps({"generation": uuid.uuid4().hex}) + "\n"
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write((generation + "".join(json.dumps(record) + "\n" for record in records)).encode("utf-8"))
+        os.replace(tmp_path, self.index_path)
+        return generation.encode("utf-8")
+
+    def _compact_log(self):
+        # Touch records pile up; rewrite the log as one record per entry once it is mostly stale
+        if self._log_records <= max(4 * len(self._index), 1024):
+            return
+        self._generation = self._write_log([(key, row, used) for key, (row, used) in self._index.items()])
+        self._log_records = len(self._index)
+        self._synced()
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _allocate_rows(self, count):
+        """Return `count` writable rows, evicting the least recently used entries if needed."""
+        rows = []
+        while self._free and len(rows) < count:
+            rows.append(self._free.pop())
+        fresh = min(count - len(rows), self.max_entries - self._next_row)
+        rows.extend(range(self._next_row, self._next_row + fresh))
+        self._next_row += fresh
+        victims = 0
+        while len(rows) < count and self._index:
+            victim, (row, _) = self._index.popitem(last=False)
+            self._owners.pop(row, None)
+            self._memory.pop(victim, None)
+            rows.append(row)
+            victims += 1
+        self.evictions += victims
+        return rows
+
+    def get_many(self, texts, encode):
+        """Return an (n, dim) float32 array for texts.
+
+        `encode` is called once with the list of texts not found in either tier.
+        """
+        keys = [content_key(text, self.model_name) for text in texts]
+        result = np.empty((len(texts), self.dim), dtype=np.float32)
+        missing = OrderedDict()  # key -> text, deduplicated within the batch
+
+        with self._lock, self._file_lock(shared=True):
+            self._reload_index()
+            now = time.time()
+            for i, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    result[i] = self._memory[key]
+                    self.hits += 1
+                elif key in self._index:
+                    vector = np.array(self._vectors[self._index[key][0]])
+                    self._remember(key, vector)
+                    result[i] = vector
+                    self.disk_hits += 1
+                else:
+                    missing.setdefault(key, texts[i])
+                    continue
+                if key in self._index:
+                    self._index[key][1] = now
+                    self._index.move_to_end(key)
+                    self._touched.add(key)
+
+        if not missing:
+            return result
+
+        self.misses += len(missing)
+        encoded = np.asarray(encode(list(missing.values())), dtype=np.float32)
+        fresh = dict(zip(missing.keys(), encoded))
+
+        with self._lock, self._file_lock():
+            self._reload_index()
+            now = time.time()
+            new_keys = [key for key in fresh if key not in self._index][:self.max_entries]
+            records = [(key, *self._index[key]) for key in self._touched if key in self._index]
+            self._touched.clear()
+            for key, row in zip(new_keys, self._allocate_rows(len(new_keys))):
+                self._vectors[row] = fresh[key]
+                records.append((key, row, now))
+            for key, vector in fresh.items():
+                self._remember(key, vector)
+            self._vectors.flush()
+            for record in records:
+                self._apply(*record)
+            self._append_log(records)
+            self._compact_log()
+
+        for i, key in enumerate(keys):
+            if key in fresh:
+                result[i] = fresh[key]
+        return result
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "memoryEntries": len(self._memory),
+            "diskEntries": len(self._index),
+            "maxEntries": self.max_entries,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hitRate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,34 @@
+import os
+
+# Sentence encoder backend; "torch" (SentenceTransformer) is the only one so far
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_BATCH_SIZE = int(os.getenv("ENCODER_BATCH_SIZE", "64"))
+
+
+class TorchEncoder:
+    """SentenceTransformer on PyTorch; the reference backend."""
+
+    backend = "torch"
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.name = model_name
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts):
+        """Return normalized float32 embeddings, one row per text."""
+        return self.model.encode(list(texts), batch_size=ENCODER_BATCH_SIZE, normalize_embeddings=True)
+
+
+ENCODERS = {
+    TorchEncoder.backend: TorchEncoder,
+}
+
+
+def load_encoder(model_name, backend=None):
+    backend = backend or ENCODER_BACKEND
+    if backend not in ENCODERS:
+        raise ValueError(f"Unknown encoder backend: {backend} (expected one of {', '.join(ENCODERS)})")
+    return ENCODERS[backend](model_name)
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads for CPU-bound request work (spaCy, the sentence encoder, scoring, small parses).
+# One more than the core count keeps a thread free for short requests while a batch runs
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str((os.cpu_count() or 1) + 1)))
+
+# Threads for blocking I/O: LLM calls, SQLite and store writes
+IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", "16"))
+
+
+class MeteredExecutor:
+    """Thread pool that counts queued and running tasks, and how long tasks wait for a thread.
+
+    Async endpoints hand blocking work to one of these via `run` so the event
+    loop keeps serving other requests, health checks included.
+    """
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def submit(self, fn, *args, **kwargs):
+        submitted = time.perf_counter()
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+        def call():
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.wait_seconds += started - submitted
+            failed = False
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.failed += failed
+                    self.run_seconds += time.perf_counter() - started
+
+        return self._executor.submit(call)
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "running": self.running,
+                "maxQueued": self.max_queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avgWaitMs": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+                "avgRunMs": round(self.run_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+cpu = MeteredExecutor("cpu", CPU_POOL_WORKERS)
+io = MeteredExecutor("io", IO_POOL_WORKERS)
+
+
+async def run_cpu(fn, *args, **kwargs):
+    return await cpu.run(fn, *args, **kwargs)
+
+
+async def run_io(fn, *args, **kwargs):
+    return await io.run(fn, *args, **kwargs)
+
+
+def stats():
+    return {"cpu": cpu.stats(), "io": io.stats()}
+
+
+def shutdown():
+    cpu.shutdown()
+    io.shutdown()
@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from app import executors
+from app.parser import PARSE_TIMEOUT_SECONDS, extract_document_text
+
+# Worker processes for PDF/DOCX text extraction (CPU-bound pure Python, so threads don't help)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+
+# Smaller batches are parsed inline: shipping bytes to a worker costs more than it saves
+PARSE_POOL_MIN_FILES = int(os.getenv("PARSE_POOL_MIN_FILES", "4"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Files submitted to the worker processes and not finished yet, for queue-depth metrics
+_in_flight = 0
+_submitted = 0
+
+
+def _document_text(file_bytes):
+    return extract_document_text(file_bytes).strip()
+
+
+def get_pool():
+    """Return the shared extraction pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the server process holds threads and loaded models that
+            # workers neither need nor should inherit
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _reset_pool(old, kill=False):
+    global _pool
+    with _pool_lock:
+        if _pool is old:
+            _pool = None
+    if kill:
+        # shutdown() leaves running jobs alone, and a worker stuck in one file would keep
+        # its slot forever. Jobs other callers have in this pool fail as a broken pool
+        for process in list((old._processes or {}).values()):
+            process.terminate()
+    old.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _finished(_future):
+    global _in_flight
+    with _pool_lock:
+        _in_flight -= 1
+
+
+def _submit(pool, file_bytes):
+    global _in_flight, _submitted
+    with _pool_lock:
+        _in_flight += 1
+        _submitted += 1
+    future = pool.submit(_document_text, file_bytes)
+    future.add_done_callback(_finished)
+    return future
+
+
+def stats():
+    with _pool_lock:
+        return {"workers": PARSE_WORKERS, "inFlight": _in_flight, "submitted": _submitted, "started": _pool is not None}
+
+
+def _deadlines(count):
+    # Files run PARSE_WORKERS at a time, so the i-th file may wait for i // PARSE_WORKERS
+    # files ahead of it, each allowed PARSE_TIMEOUT_SECONDS
+    start = time.monotonic()
+    return [start + PARSE_TIMEOUT_SECONDS * (i // PARSE_WORKERS + 1) for i in range(count)]
+
+
+def _use_pool(count):
+    return PARSE_WORKERS > 1 and count >= PARSE_POOL_MIN_FILES
+
+
+def _inline(blobs):
+    texts = []
+    for file_bytes in blobs:
+        try:
+            texts.append(_document_text(file_bytes))
+        except Exception:
+            texts.append(None)
+    return texts
+
+
+def extract_texts(blobs):
+    """Extract the text of many PDF or DOCX files in parallel.
+
+    Returns one entry per input, in input order; files that fail to parse, break
+    a parser limit, time out, or whose worker dies are None. A timeout recycles
+    the pool, killing the stuck worker.
+    """
+    blobs = list(blobs)
+    if not _use_pool(len(blobs)):
+        return _inline(blobs)
+
+    pool = get_pool()
+    futures = [_submit(pool, file_bytes) for file_bytes in blobs]
+    texts = []
+    broken = timed_out = False
+    for future, deadline in zip(futures, _deadlines(len(futures))):
+        try:
+            texts.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except TimeoutError:
+            timed_out = True
+            future.cancel()
+            texts.append(None)
+        except BrokenProcessPool:
+            broken = True
+            texts.append(None)
+        except Exception:
+            texts.append(None)
+    if broken or timed_out:
+        _reset_pool(pool, kill=timed_out)
+    return texts
+
+
+async def _wait(future, deadline):
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), max(0.0, deadline - time.monotonic()))
+    except asyncio.TimeoutError:
+        return TimeoutError()
+
+
+async def extract_texts_async(blobs):
+    """extract_texts without blocking the event loop; small batches are parsed on the CPU thread pool."""
+    blobs = list(blobs)
+    if not _use_pool(len(blobs)):
+        return await executors.run_cpu(_inline, blobs)
+
+    pool = get_pool()
+    futures = [_submit(pool, file_bytes) for file_bytes in blobs]
+    results = await asyncio.gather(
+        *(_wait(future, deadline) for future, deadline in zip(futures, _deadlines(len(futures)))),
+        return_exceptions=True
+    )
+    timed_out = any(isinstance(result, TimeoutError) for result in results)
+    if timed_out or any(isinstance(result, BrokenProcessPool) for result in results):
+        _reset_pool(pool, kill=timed_out)
+    return [None if isinstance(result, BaseException) else result for result in results]
@@ -0,0 +1,246 @@
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from app.matcher import semantic_similarity_matrix, skill_bits, skill_match_matrix
+from app.model_registry import get_skill_index
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURE_STORE_DIR = os.getenv("FEATURE_STORE_DIR", os.path.join(PACKAGE_DIR, "cache", "feature_store"))
+
+# Document summaries (features without the text) kept in memory; texts are read from disk when needed
+FEATURE_STORE_MEMORY_ENTRIES = int(os.getenv("FEATURE_STORE_MEMORY_ENTRIES", "4096"))
+
+
+class FeatureStore:
+    """Per-document features plus a materialized score column per job.
+
+    Every analyzed resume and job description is kept as one JSON file under
+    documents/ (text, skills, matchSkills and metadata). Chunk embeddings are
+    already persisted by the content-addressed embedding store, so recomputing
+    a similarity from the stored text never re-runs the encoder. Each job has a
+    scores/<job id>.npz column with the skill-match fraction and the semantic
+    similarity of every resume matched against it; blending those under new
+    weights or thresholds needs no document work at all.
+
+    Only a bounded LRU of document summaries (everything but the text) is
+    kept in memory, which is all ranking needs; texts are read from disk
+    when a similarity has to be recomputed.
+
+    Documents and columns record the taxonomy version their skills came from.
+    After a taxonomy change only stale documents are re-extracted, and only the
+    skill half of a column is recomputed; semantic similarities are kept.
+    """
+
+    def __init__(self, directory=FEATURE_STORE_DIR, memory_entries=FEATURE_STORE_MEMORY_ENTRIES):
+        self.directory = directory
+        self.documents_dir = os.path.join(directory, "documents")
+        self.scores_dir = os.path.join(directory, "scores")
+        self._lock = threading.RLock()
+        self.memory_entries = memory_entries
+        self._summaries = OrderedDict()  # id -> features without "text", least recently used first
+        self._columns = {}    # job id -> {"ids", "skill", "semantic", "taxonomyVersion"}, read on first use
+        os.makedirs(self.documents_dir, exist_ok=True)
+        os.makedirs(self.scores_dir, exist_ok=True)
+
+    @staticmethod
+    def _file_name(doc_id):
+        return re.sub(r"[^A-Za-z0-9._-]", "_", doc_id)
+
+    def _document_path(self, doc_id):
+        return os.path.join(self.documents_dir, f"{self._file_name(doc_id)}.json")
+
+    def _column_path(self, job_id):
+        return os.path.join(self.scores_dir, f"{self._file_name(job_id)}.npz")
+
+    def _remember(self, doc_id, features):
+        summary = {key: value for key, value in features.items() if key != "text"}
+        self._summaries[doc_id] = summary
+        self._summaries.move_to_end(doc_id)
+        while len(self._summaries) > self.memory_entries:
+            self._summaries.popitem(last=False)
+        return summary
+
+    def get(self, doc_id):
+        """Return a document's stored features, text included, read from disk; or None."""
+        with self._lock:
+            path = self._document_path(doc_id)
+            if not os.path.exists(path):
+                self._summaries.pop(doc_id, None)
+                return None
+            with open(path) as f:
+                features = json.load(f)
+            self._remember(doc_id, features)
+            return features
+
+    def summary(self, doc_id):
+        """Return a document's stored features without the text, or None."""
+        with self._lock:
+            if doc_id in self._summaries:
+                self._summaries.move_to_end(doc_id)
+                return self._summaries[doc_id]
+            features = self.get(doc_id)
+            return None if features is None else self._summaries[doc_id]
+
+    def __contains__(self, doc_id):
+        return self.summary(doc_id) is not None
+
+    def put(self, doc_id, features):
+        """Store a document's features, keeping the jobs a resume has been scored against."""
+        with self._lock:
+            previous = self.summary(doc_id)
+            features = dict(features)
+            if previous and "jobs" in previous:
+                features.setdefault("jobs", previous["jobs"])
+            path = self._document_path(doc_id)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(features, f)
+            os.replace(tmp_path, path)
+            self._remember(doc_id, features)
+
+    def column(self, job_id):
+        """Return the job's materialized {"ids", "skill", "semantic", "taxonomyVersion"} column, or None."""
+        with self._lock:
+            if job_id not in self._columns:
+                path = self._column_path(job_id)
+                if not os.path.exists(path):
+                    return None
+                data = np.load(path)
+                self._columns[job_id] = {
+                    "ids": [str(resume_id) for resume_id in data["ids"]],
+                    "skill": data["skill"],
+                    "semantic": data["semantic"],
+                    "taxonomyVersion": str(data["taxonomy_version"]) if "taxonomy_version" in data else "",
+                }
+            return self._columns[job_id]
+
+    def _save_column(self, job_id, ids, skill, semantic, taxonomy_version):
+        path = self._column_path(job_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path, ids=np.array(ids, dtype=str), skill=skill, semantic=semantic, taxonomy_version=taxonomy_version
+        )
+        os.replace(tmp_path, path)
+        self._columns[job_id] = {"ids": list(ids), "skill": skill, "semantic": semantic, "taxonomyVersion": taxonomy_version}
+
+    def set_scores(self, job_id, resume_ids, skill_scores, semantic_similarities, taxonomy_version):
+        """Write the score components of some resumes into a job's column, replacing their old rows.
+
+        Rows scored under a different taxonomy than the rest of the column leave
+        it marked stale ("") until refresh_taxonomy recomputes it.
+        """
+        with self._lock:
+            column = self.column(job_id) or {
+                "ids": [], "skill": np.empty(0, dtype=np.float32), "semantic": np.empty(0, dtype=np.float32),
+                "taxonomyVersion": taxonomy_version,
+            }
+            ids = list(column["ids"])
+            skill = np.asarray(column["skill"], dtype=np.float32)
+            semantic = np.asarray(column["semantic"], dtype=np.float32)
+
+            rows = {resume_id: row for row, resume_id in enumerate(ids)}
+            new_ids = [resume_id for resume_id in resume_ids if resume_id not in rows]
+            rows.update({resume_id: len(ids) + i for i, resume_id in enumerate(new_ids)})
+            ids.extend(new_ids)
+            skill = np.concatenate([skill, np.zeros(len(new_ids), dtype=np.float32)])
+            semantic = np.concatenate([semantic, np.zeros(len(new_ids), dtype=np.float32)])
+
+            targets = [rows[resume_id] for resume_id in resume_ids]
+            skill[targets] = skill_scores
+            semantic[targets] = semantic_similarities
+            replaced_all = len(set(targets)) == len(ids)
+            if not replaced_all and column["taxonomyVersion"] != taxonomy_version:
+                taxonomy_version = ""
+            self._save_column(job_id, ids, skill, semantic, taxonomy_version)
+
+            for resume_id in new_ids:
+                summary = self.summary(resume_id)
+                if summary is not None and job_id not in summary.get("jobs", []):
+                    features = self.get(resume_id)
+                    self.put(resume_id, {**features, "jobs": features.get("jobs", []) + [job_id]})
+
+    def _skill_scores(self, resume_ids, job_ids, skill_index):
+        resumes = [self.summary(resume_id) for resume_id in resume_ids]
+        jobs = [self.summary(job_id) for job_id in job_ids]
+        return skill_match_matrix(
+            skill_bits((resume["matchSkills"] for resume in resumes), skill_index),
+            skill_bits((job["matchSkills"] for job in jobs), skill_index),
+        )
+
+    def _score(self, resume_ids, job_ids, skill_index):
+        """Compute the skill and semantic components for resumes x jobs from stored features."""
+        semantic_similarities = semantic_similarity_matrix(
+            [self.get(resume_id)["text"] for resume_id in resume_ids], [self.get(job_id)["text"] for job_id in job_ids]
+        )
+        return self._skill_scores(resume_ids, job_ids, skill_index), semantic_similarities
+
+    def update_job(self, job_id, features, skill_index=None):
+        """Replace a job description's features and recompute only its column."""
+        skill_index = skill_index or get_skill_index()
+        with self._lock:
+            self.put(job_id, {**features, "taxonomyVersion": skill_index.version})
+            column = self.column(job_id)
+            if column and column["ids"]:
+                skill_scores, semantic_similarities = self._score(column["ids"], [job_id], skill_index)
+                self.set_scores(
+                    job_id, column["ids"], skill_scores[:, 0], semantic_similarities[:, 0], skill_index.version
+                )
+
+    def update_resume(self, resume_id, features, job_ids=(), skill_index=None):
+        """Replace a resume's features and recompute only its row, in every job it belongs to.
+
+        `job_ids` adds the resume to further jobs.
+        """
+        skill_index = skill_index or get_skill_index()
+        with self._lock:
+            self.put(resume_id, {**features, "taxonomyVersion": skill_index.version})
+            job_ids = list(dict.fromkeys(self.summary(resume_id).get("jobs", []) + list(job_ids)))
+            job_ids = [job_id for job_id in job_ids if job_id in self]
+            if job_ids:
+                skill_scores, semantic_similarities = self._score([resume_id], job_ids, skill_index)
+                for col, job_id in enumerate(job_ids):
+                    self.set_scores(
+                        job_id, [resume_id], skill_scores[0, col:col + 1], semantic_similarities[0, col:col + 1],
+                        skill_index.version
+                    )
+
+    def refresh_taxonomy(self, job_id, reextract, skill_index=None):
+        """Bring a job's column up to the current taxonomy version.
+
+        `reextract` maps a list of stale document features to updated features
+        (new skills and matchSkills). Returns the number of re-extracted documents.
+        """
+        skill_index = skill_index or get_skill_index()
+        with self._lock:
+            column = self.column(job_id)
+            doc_ids = [job_id] + (column["ids"] if column else [])
+            summaries = {doc_id: self.summary(doc_id) for doc_id in doc_ids}
+            # A document whose file is gone has nothing to refresh
+            stale = [
+                doc_id for doc_id, summary in summaries.items()
+                if summary is not None and summary.get("taxonomyVersion") != skill_index.version
+            ]
+            if stale:
+                for doc_id, features in zip(stale, reextract([self.get(doc_id) for doc_id in stale])):
+                    self.put(doc_id, {**features, "taxonomyVersion": skill_index.version})
+
+            # Resumes re-extracted through another job also leave this column's skills stale
+            if column and column["ids"] and column["taxonomyVersion"] != skill_index.version:
+                skill_scores = self._skill_scores(column["ids"], [job_id], skill_index)[:, 0]
+                self.set_scores(job_id, column["ids"], skill_scores, column["semantic"], skill_index.version)
+            return len(stale)
+
+    def ranking(self, job_id, config):
+        """Return (resume id, features without text, score) for every resume in the job's column, best first."""
+        with self._lock:
+            column = self.column(job_id)
+            if column is None or not column["ids"]:
+                return []
+            scores = config.combine(column["skill"], column["semantic"])
+            order = np.argsort(-scores, kind="stable")
+            return [(column["ids"][row], self.summary(column["ids"][row]), float(scores[row])) for row in order]
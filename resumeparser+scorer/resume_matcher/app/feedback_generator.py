@@ -1,32 +1,125 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 import openai
 
+from app import executors
+from app.llm_cache import cache_key, get_cache
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Access the API key from environment variables
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 client = OpenAI()  # Automatically uses OPENAI_API_KEY from environment
 
+# Feedback calls in flight at once per batch, and how long one call (retries included) may take
+FEEDBACK_CONCURRENCY = int(os.getenv("FEEDBACK_CONCURRENCY", "16"))
+FEEDBACK_TIMEOUT_SECONDS = float(os.getenv("FEEDBACK_TIMEOUT_SECONDS", "20"))
+
+# Returned in place of a feedback call that fails or times out
+FALLBACK_FEEDBACK = "The candidate has a strong foundation..."
+
+# Part of the LLM cache key; bump when the prompt changes so old responses aren't reused
+FEEDBACK_PROMPT_VERSION = "1"
+
+# Equal inputs in any order give the same prompt, and so the same cache key
+def _normalize(score, job_skills, resume_skills):
+    return round(float(score), 1), sorted(set(job_skills)), sorted(set(resume_skills or []))
+
+def _request(score, job_skills, resume_skills):
+    score, job_skills, resume_skills = _normalize(score, job_skills, resume_skills)
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "You are a helpful career advisor."},
+            {"role": "user", "content": f"""
+            Generate constructive feedback for a candidate who scored {score}% match(in 3rd person)
+            Job requires: {', '.join(job_skills)}
+            Candidate has: {', '.join(resume_skills) if resume_skills else 'No listed skills'}
+            """}
+        ],
+        temperature=0.7,
+        max_tokens=200
+    )
+
+def _cache_key(request):
+    return cache_key("feedback", FEEDBACK_PROMPT_VERSION, request)
+
 def generate_feedback(score, job_skills, resume_skills):
+    request = _request(score, job_skills, resume_skills)
+    key = _cache_key(request)
+    cache = get_cache()
+    feedback = cache.get(key)
+    if feedback is not None:
+        return feedback
     try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful career advisor."},
-                {"role": "user", "content": f"""
-                Generate constructive feedback for a candidate who scored {score}% match(in 3rd person)
-                Job requires: {', '.join(job_skills)}
-                Candidate has: {', '.join(resume_skills) if resume_skills else 'No listed skills'}
-                """}
-            ],
-            temperature=0.7,
-            max_tokens=200
-        )
-        return response.choices[0].message.content
+        response = client.chat.completions.create(**request)
+        feedback = response.choices[0].message.content
     except Exception as e:
-        return f"AI Feedback Error: {str(e)}"
\ No newline at end of file
+        return f"AI Feedback Error: {str(e)}"
+    cache.put(key, feedback)
+    return feedback
+
+# Response text of one call, or None if it fails or times out
+async def _generate_feedback_async(async_client, limit, request):
+    async with limit:
+        try:
+            response = await asyncio.wait_for(
+                async_client.chat.completions.create(**request), FEEDBACK_TIMEOUT_SECONDS
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Feedback generation failed, using fallback: {e!r}")
+            return None
+
+# AsyncOpenAI client, or None when one can't be created (e.g. no API key)
+def new_async_client():
+    try:
+        return AsyncOpenAI()
+    except Exception as e:
+        print(f"Feedback generation unavailable, using fallback: {e!r}")
+        return None
+
+async def _complete_all(requests, async_client, limit):
+    if not requests:
+        return []
+    if async_client is None:
+        async_client = new_async_client()
+        if async_client is None:
+            return [None] * len(requests)
+        async with async_client:
+            return await _complete_all(requests, async_client, limit)
+
+    limit = limit or asyncio.Semaphore(FEEDBACK_CONCURRENCY)
+    return await asyncio.gather(*(_generate_feedback_async(async_client, limit, request) for request in requests))
+
+# Feedback for many (score, job skills, resume skills) requests, at most FEEDBACK_CONCURRENCY
+# calls at a time, in request order. Cached responses are reused and each distinct uncached
+# prompt is sent once. Pass an AsyncOpenAI client and a semaphore to share the connection
+# pool and the concurrency limit across several batches of one request
+async def generate_feedback_batch_async(requests, async_client=None, limit=None):
+    requests = [_request(*request) for request in requests]
+    if not requests:
+        return []
+    keys = [_cache_key(request) for request in requests]
+    cache = get_cache()
+    cached = await executors.run_io(cache.get_many, keys)
+
+    pending = {key: request for key, request, feedback in zip(keys, requests, cached) if feedback is None}
+    fresh = dict(zip(pending, await _complete_all(list(pending.values()), async_client, limit)))
+    generated = [(key, feedback) for key, feedback in fresh.items() if feedback is not None]
+    if generated:
+        await executors.run_io(cache.put_many, generated)
+
+    return [
+        feedback if feedback is not None else fresh[key] or FALLBACK_FEEDBACK
+        for key, feedback in zip(keys, cached)
+    ]
+
+# Blocking variant for worker threads and scripts; must not be called from a running event loop
+def generate_feedback_batch(requests):
+    return asyncio.run(generate_feedback_batch_async(requests))
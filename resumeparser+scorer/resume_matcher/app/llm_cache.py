@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", os.path.join(PACKAGE_DIR, "cache", "llm_cache.sqlite3"))
+LLM_CACHE_TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "100000"))
+LLM_MEMORY_ENTRIES = int(os.getenv("LLM_MEMORY_ENTRIES", "2048"))
+
+# LLM_CACHE_BYPASS=1 always calls the model and leaves the cache untouched
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "0") == "1"
+
+# Keys looked up per SQLite query, well under its bound-parameter limit
+LOOKUP_CHUNK = 500
+
+# The database is trimmed to this fraction of the limit, so eviction doesn't run on every put
+EVICT_TO_FRACTION = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_used_at ON responses (used_at);
+"""
+
+
+def cache_key(kind, version, request):
+    """Hash of a call's kind, prompt template version and full request (model, messages, parameters).
+
+    Callers normalize their inputs before building the request, so equal inputs
+    give byte-identical prompts and the same key.
+    """
+    payload = json.dumps({"kind": kind, "version": version, "request": request}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Cache of LLM responses keyed by `cache_key`, so repeated prompts cost no model call.
+
+    Two tiers: an in-process LRU and a SQLite table shared by every process
+    using the same database. Responses expire `ttl_days` after they were
+    generated; once the table outgrows `max_entries` the least recently used
+    ones are dropped. With `bypass` set every lookup misses and nothing is
+    stored. Values are anything JSON-serializable.
+    """
+
+    def __init__(self, path=LLM_CACHE_DB, ttl_days=LLM_CACHE_TTL_DAYS, max_entries=LLM_CACHE_MAX_ENTRIES,
+                 memory_entries=LLM_MEMORY_ENTRIES, bypass=LLM_CACHE_BYPASS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.bypass = bypass
+
+        self._memory = OrderedDict()  # key -> (value, created_at)
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+            self._entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=30)
+        try:
+            with db:  # commits, or rolls back on error
+                yield db
+        finally:
+            db.close()
+
+    def _remember(self, key, value, created_at):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        """Cached values for the keys, None for misses, in key order."""
+        keys = list(keys)
+        if self.bypass:
+            with self._lock:
+                self.bypassed += len(keys)
+            return [None] * len(keys)
+
+        now = time.time()
+        values = {}
+        with self._lock:
+            for key in keys:
+                cached = self._memory.get(key)
+                if cached is not None and now - cached[1] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    values[key] = cached[0]
+        memory_hits = set(values)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in values))
+        if missing:
+            rows = []
+            with self._connect() as db:
+                for start in range(0, len(missing), LOOKUP_CHUNK):
+                    chunk = missing[start:start + LOOKUP_CHUNK]
+                    rows += db.execute(
+                        f"SELECT key, value, created_at FROM responses WHERE key IN ({','.join('?' * len(chunk))}) "
+                        f"AND created_at >= ?",
+                        (*chunk, now - self.ttl),
+                    ).fetchall()
+                db.executemany("UPDATE responses SET used_at = ? WHERE key = ?", [(now, key) for key, _, _ in rows])
+            with self._lock:
+                for key, value, created_at in rows:
+                    values[key] = json.loads(value)
+                    self._remember(key, values[key], created_at)
+
+        with self._lock:
+            for key in keys:
+                if key in memory_hits:
+                    self.hits += 1
+                elif key in values:
+                    self.disk_hits += 1
+                else:
+                    self.misses += 1
+        return [values.get(key) for key in keys]
+
+    def get(self, key):
+        return self.get_many([key])[0]
+
+    def put_many(self, items):
+        """Store (key, value) pairs in both tiers."""
+        items = list(items)
+        if self.bypass or not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value, now)
+        with self._connect() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, used_at) VALUES (?, ?, ?, ?)",
+                [(key, json.dumps(value), now, now) for key, value in items],
+            )
+            # Cheap next to the model calls that produced the values, and exact with other writers
+            entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._lock:
+            self._entries = entries
+            if self._entries > self.max_entries:
+                self.evict()
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def evict(self):
+        """Drop expired responses, then the least recently used ones until under the size limit."""
+        now = time.time()
+        with self._lock, self._connect() as db:
+            removed = db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)).rowcount
+            entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            excess = entries - int(self.max_entries * EVICT_TO_FRACTION)
+            if excess > 0:
+                stale = [row[0] for row in db.execute(
+                    "SELECT key FROM responses ORDER BY used_at LIMIT ?", (excess,)
+                ).fetchall()]
+                db.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in stale])
+                removed += len(stale)
+                for key in stale:
+                    self._memory.pop(key, None)
+            self._entries = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            self.evictions += removed
+            for key in [key for key, (_, created_at) in self._memory.items() if now - created_at > self.ttl]:
+                del self._memory[key]
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "bypass": self.bypass,
+            "memoryEntries": len(self._memory),
+            "entries": self._entries,
+            "maxEntries": self.max_entries,
+            "ttlDays": self.ttl / 86400,
+            "hits": self.hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "hitRate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Return the shared LLM response cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
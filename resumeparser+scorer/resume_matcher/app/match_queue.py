@@ -0,0 +1,272 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MATCH_QUEUE_DB = os.getenv("MATCH_QUEUE_DB", os.path.join(PACKAGE_DIR, "cache", "match_queue.sqlite3"))
+
+# Resumes a worker claims and scores at a time
+MATCH_QUEUE_BATCH = int(os.getenv("MATCH_QUEUE_BATCH", "8"))
+
+# A claimed batch that isn't finished within the lease (worker died) is handed out again;
+# a batch that fails this many times is given up and its resumes reported as errors
+MATCH_QUEUE_LEASE_SECONDS = float(os.getenv("MATCH_QUEUE_LEASE_SECONDS", "600"))
+MATCH_QUEUE_MAX_ATTEMPTS = int(os.getenv("MATCH_QUEUE_MAX_ATTEMPTS", "3"))
+
+# How long an idle worker sleeps before looking for work again
+MATCH_QUEUE_POLL_SECONDS = float(os.getenv("MATCH_QUEUE_POLL_SECONDS", "1"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    job_descriptions TEXT NOT NULL,
+    jobs TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS match_items (
+    job_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    resume_id TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    blob BLOB,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    results TEXT,
+    error TEXT,
+    PRIMARY KEY (job_id, seq)
+);
+CREATE INDEX IF NOT EXISTS match_items_status ON match_items (status, job_id, seq);
+"""
+
+
+class MatchQueue:
+    """Durable queue of match jobs in a local SQLite database.
+
+    A match job is its job description texts plus one item per resume, holding
+    the resume's bytes until it is scored. Workers claim batches of pending
+    items under a lease, score them and store each item's per-job results, so
+    progress survives client disconnects and process restarts: items of a
+    worker that dies are claimed again once their lease expires. A batch that
+    raises or outlives its lease is retried up to MATCH_QUEUE_MAX_ATTEMPTS
+    times in all, then its items are failed.
+
+    Any number of worker threads or processes can share one database.
+    """
+
+    def __init__(self, path=MATCH_QUEUE_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+        self._stop = threading.Event()
+        self._workers = []
+
+    @contextmanager
+    def _connect(self):
+        # Autocommit connection; writes use explicit BEGIN IMMEDIATE ... COMMIT transactions
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def submit(self, job_descriptions, resumes):
+        """Enqueue a match job; `resumes` holds (resume id, file name, sha256, bytes). Returns the job id."""
+        job_id = f"match-{uuid.uuid4().hex[:12]}"
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute(
+                "INSERT INTO match_jobs (id, status, job_descriptions, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, "queued", json.dumps(job_descriptions), now, now),
+            )
+            db.executemany(
+                "INSERT INTO match_items (job_id, seq, resume_id, file_name, sha256, blob, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, 'pending')",
+                [(job_id, seq, *resume) for seq, resume in enumerate(resumes)],
+            )
+            db.execute("COMMIT")
+        return job_id
+
+    def job(self, job_id):
+        """Return a job's status and progress counts, or None."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM match_jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            counts = dict(db.execute(
+                "SELECT status, COUNT(*) FROM match_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return {
+            "id": job_id,
+            "status": row["status"],
+            "total": sum(counts.values()),
+            "completed": counts.get("done", 0),
+            "failed": counts.get("failed", 0),
+            "pending": counts.get("pending", 0) + counts.get("running", 0),
+            "jobs": json.loads(row["jobs"]) if row["jobs"] else None,
+            "jobDescriptions": json.loads(row["job_descriptions"]),
+            "createdAt": row["created_at"],
+            "updatedAt": row["updated_at"],
+        }
+
+    def set_jobs(self, job_id, jobs):
+        """Store a job's analyzed job descriptions unless another worker already did; returns the stored ones."""
+        with self._connect() as db:
+            db.execute("UPDATE match_jobs SET jobs = ? WHERE id = ? AND jobs IS NULL", (json.dumps(jobs), job_id))
+            return json.loads(db.execute("SELECT jobs FROM match_jobs WHERE id = ?", (job_id,)).fetchone()[0])
+
+    def claim(self, limit=MATCH_QUEUE_BATCH):
+        """Lease up to `limit` pending items of the oldest job with work left.
+
+        Returns (job, items) or None; items are dicts with seq, resumeId,
+        fileName, sha256 and blob.
+        """
+        now = time.time()
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            self._give_up_expired(db, now)
+            claimable = "(status = 'pending' OR (status = 'running' AND lease_until < ?)) AND attempts < ?"
+            row = db.execute(
+                f"SELECT job_id FROM match_items WHERE {claimable} ORDER BY rowid LIMIT 1",
+                (now, MATCH_QUEUE_MAX_ATTEMPTS),
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            job_id = row[0]
+            rows = db.execute(
+                f"SELECT seq, resume_id, file_name, sha256, blob FROM match_items "
+                f"WHERE job_id = ? AND {claimable} ORDER BY seq LIMIT ?",
+                (job_id, now, MATCH_QUEUE_MAX_ATTEMPTS, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE match_items SET status = 'running', attempts = attempts + 1, lease_until = ? "
+                "WHERE job_id = ? AND seq = ?",
+                [(now + MATCH_QUEUE_LEASE_SECONDS, job_id, item["seq"]) for item in rows],
+            )
+            db.execute("UPDATE match_jobs SET status = 'running', updated_at = ? WHERE id = ?", (now, job_id))
+            db.execute("COMMIT")
+
+        items = [
+            {"seq": item["seq"], "resumeId": item["resume_id"], "fileName": item["file_name"],
+             "sha256": item["sha256"], "blob": item["blob"]}
+            for item in rows
+        ]
+        return self.job(job_id), items
+
+    def _give_up_expired(self, db, now):
+        # A resume that kills its worker (crash, OOM) never reaches release(), so its lease
+        # just expires; once that has used up its attempts it is failed instead of retried
+        exhausted = "(status = 'pending' OR (status = 'running' AND lease_until < ?)) AND attempts >= ?"
+        job_ids = [row[0] for row in db.execute(
+            f"SELECT DISTINCT job_id FROM match_items WHERE {exhausted}", (now, MATCH_QUEUE_MAX_ATTEMPTS)
+        ).fetchall()]
+        if not job_ids:
+            return
+        db.execute(
+            f"UPDATE match_items SET status = 'failed', blob = NULL, lease_until = NULL, "
+            f"error = COALESCE(error, ?) WHERE {exhausted}",
+            (f"Worker lease expired {MATCH_QUEUE_MAX_ATTEMPTS} times", now, MATCH_QUEUE_MAX_ATTEMPTS),
+        )
+        for job_id in job_ids:
+            self._finish_if_done(db, job_id)
+
+    def complete(self, job_id, items, results):
+        """Store each item's per-job results and drop its bytes."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(
+                "UPDATE match_items SET status = 'done', results = ?, blob = NULL, lease_until = NULL "
+                "WHERE job_id = ? AND seq = ?",
+                [(json.dumps(item_results), job_id, item["seq"]) for item, item_results in zip(items, results)],
+            )
+            self._finish_if_done(db, job_id)
+            db.execute("COMMIT")
+
+    def release(self, job_id, items, error):
+        """Return a failed batch to the queue, or give its items up after MATCH_QUEUE_MAX_ATTEMPTS tries."""
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            for item in items:
+                db.execute(
+                    "UPDATE match_items SET error = ?, lease_until = NULL, "
+                    "status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                    "blob = CASE WHEN attempts >= ? THEN NULL ELSE blob END "
+                    "WHERE job_id = ? AND seq = ?",
+                    (error, MATCH_QUEUE_MAX_ATTEMPTS, MATCH_QUEUE_MAX_ATTEMPTS, job_id, item["seq"]),
+                )
+            self._finish_if_done(db, job_id)
+            db.execute("COMMIT")
+
+    @staticmethod
+    def _finish_if_done(db, job_id):
+        left = db.execute(
+            "SELECT COUNT(*) FROM match_items WHERE job_id = ? AND status IN ('pending', 'running')", (job_id,)
+        ).fetchone()[0]
+        db.execute(
+            "UPDATE match_jobs SET status = CASE WHEN ? = 0 THEN 'done' ELSE status END, updated_at = ? WHERE id = ?",
+            (left, time.time(), job_id),
+        )
+
+    def finished_items(self, job_id, after_seq=-1):
+        """Scored or given-up items with seq > after_seq, as dicts with seq, resumeId, fileName, status and results."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT seq, resume_id, file_name, status, results, error FROM match_items "
+                "WHERE job_id = ? AND seq > ? AND status IN ('done', 'failed') ORDER BY seq",
+                (job_id, after_seq),
+            ).fetchall()
+        return [
+            {"seq": row["seq"], "resumeId": row["resume_id"], "fileName": row["file_name"], "status": row["status"],
+             "results": json.loads(row["results"]) if row["results"] else None, "error": row["error"]}
+            for row in rows
+        ]
+
+    def _work(self, process_batch):
+        while not self._stop.is_set():
+            claimed = self.claim()
+            if claimed is None:
+                self._stop.wait(MATCH_QUEUE_POLL_SECONDS)
+                continue
+            job, items = claimed
+            try:
+                results = process_batch(job, items)
+            except Exception as e:
+                print(f"Match job {job['id']} batch failed: {e}")
+                self.release(job["id"], items, str(e))
+            else:
+                self.complete(job["id"], items, results)
+
+    def start_workers(self, process_batch, count):
+        """Start `count` daemon threads that score claimed batches with process_batch(job, items).
+
+        process_batch returns one list of per-job results per item, in item order.
+        """
+        self._stop.clear()
+        for _ in range(count):
+            worker = threading.Thread(target=self._work, args=(process_batch,), daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop_workers(self, wait=True):
+        """Stop the worker threads after their current batch; unfinished items are claimed again later."""
+        self._stop.set()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+        self._workers = []
@@ -1,75 +1,211 @@
-import json
-import spacy
+import os
 import re
-from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
-# Load NLP model once
-nlp = spacy.load("en_core_web_sm")
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from app import scoring
+from app.model_registry import get_embedding_store, get_encoder, get_skill_index
+from app.nlp_pipeline import analyze_documents
+from app.skill_index import popcount, skill_overlap
+from app.sections import SECTION_WEIGHTS, chunk_document
 
-# Load predefined skill list (from file or hardcoded)
-with open("/Users/lvallabhaneni/Documents/GitHub/Jarvis-Techies/resumeparser+scorer/resume_matcher/models/skills.json") as f:
-    SKILLS = json.load(f)["skills"]
+# How chunk-level similarities are pooled into a document score: "weighted_mean" or "max_sim"
+CHUNK_AGGREGATION = os.getenv("CHUNK_AGGREGATION", "weighted_mean")
 
-def extract_skills(text):
+def extract_skills(text, skill_index=None):
     """Extract skills from resume or job description using NLP techniques."""
-    doc = nlp(text)
+    return skills_from_features(analyze_documents([text])[0], skill_index)
 
+def skills_from_features(features, skill_index=None):
+    """Match the phrases produced by nlp_pipeline.analyze_documents against the skill index."""
     # 1. Get all noun chunks (potential skill phrases)
-    noun_chunks = [chunk.text.strip() for chunk in doc.noun_chunks]
+    noun_chunks = features["noun_chunks"]
 
     # 2. Get named entities labeled as ORG, PRODUCT, WORK_OF_ART (often tool/tech names)
-    named_ents = [ent.text.strip() for ent in doc.ents if ent.label_ in {"ORG", "PRODUCT", "WORK_OF_ART"}]
+    named_ents = [text for text, label in features["entities"] if label in {"ORG", "PRODUCT", "WORK_OF_ART"}]
 
     # 3. Get proper nouns or alphanum tokens (e.g., Python, Java, AWS)
-    proper_nouns = [token.text.strip() for token in doc if token.pos_ == "PROPN" and len(token.text) > 1]
+    proper_nouns = features["proper_nouns"]
 
     # Combine and clean
     raw_skills = noun_chunks + named_ents + proper_nouns
     skills = set()
 
-    # Match skills against the predefined list
+    # Match skills against the compiled index (case-insensitive, aliases resolved)
+    skill_index = skill_index or get_skill_index()
     for skill in raw_skills:
         if 2 <= len(skill) <= 50 and not skill.lower().startswith("resume"):
-            # Match against predefined skills (case-insensitive)
-            if any(skill.lower() == predefined_skill.lower() for predefined_skill in SKILLS):
-                skills.add(skill)
+            canonical = skill_index.match(skill)
+            if canonical:
+                skills.add(canonical)
 
     return sorted(skills)
 
-def extract_additional_skills(text):
+def extract_additional_skills(text, skill_index=None):
     """Extract additional tech skills based on common patterns."""
     tech_patterns = r'\b(?:[A-Z][a-z]+|\b[A-Za-z]{2,}\+\+?|Node\.js|React\.js|TypeScript|JavaScript|HTML|CSS|Git)\b'
     matches = re.findall(tech_patterns, text)
     
     # Filter matches by predefined skills
-    valid_matches = [match for match in matches if match.lower() in [skill.lower() for skill in SKILLS]]
-    
-    
-    return sorted(set(valid_matches))
+    skill_index = skill_index or get_skill_index()
+    valid_matches = {skill_index.match(match) for match in matches}
+
+    # Multi-word skills ("Ruby on Rails", "Google Cloud") from a single pass over the text
+    valid_matches.update(canonical for canonical, _, token_count in skill_index.scan(text) if token_count > 1)
+    valid_matches.discard(None)
 
-def combined_skill_extractor(text):
+    return sorted(valid_matches)
+
+def combined_skill_extractor(text, skill_index=None):
     """Combine basic skill extraction and additional keyword-based skill extraction."""
-    base_skills = extract_skills(text)
-    extra_skills = extract_additional_skills(text)
+    skill_index = skill_index or get_skill_index()
+    base_skills = extract_skills(text, skill_index)
+    extra_skills = extract_additional_skills(text, skill_index)
     return sorted(set(base_skills + extra_skills))
 
-def calculate_match_score(resume_text, job_desc_text):
-    """Calculate ATS-like match score based on semantic similarity and skill match."""
+def combined_skill_extractor_batch(texts, batch_size=None, n_process=None, skill_index=None):
+    """combined_skill_extractor for many documents, sharing one nlp.pipe pass."""
+    texts = list(texts)
+    skill_index = skill_index or get_skill_index()
+    features = analyze_documents(texts, batch_size=batch_size, n_process=n_process)
+    return [
+        sorted(set(skills_from_features(doc_features, skill_index) + extract_additional_skills(text, skill_index)))
+        for text, doc_features in zip(texts, features)
+    ]
+
+def encode_texts(texts):
+    """Return normalized embeddings for texts, encoding only those not already in the store."""
+    return get_embedding_store().get_many(texts, get_encoder().encode)
+
+def encode_chunked(texts):
+    """Split every document into section chunks and embed all chunks in one batch.
+
+    Returns (vectors, offsets, weights); document i owns rows offsets[i]:offsets[i + 1].
+    Chunks are cached by content, so editing one section only re-encodes its chunks.
+    """
+    chunked = [chunk_document(text) for text in texts]
+    offsets = np.cumsum([0] + [len(chunks) for chunks in chunked])
+    vectors = encode_texts([chunk for chunks in chunked for _, chunk in chunks])
+    weights = np.array(
+        [SECTION_WEIGHTS.get(section, 1.0) for chunks in chunked for section, _ in chunks], dtype=np.float32
+    )
+    return vectors, offsets, weights
+
+def pool_chunks(vectors, offsets, weights):
+    """Weighted-mean pool chunk vectors into one normalized vector per document."""
+    pooled = np.add.reduceat(vectors * weights[:, None], offsets[:-1], axis=0)
+    return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+def document_vectors(texts):
+    """Return one normalized, section-weighted vector per document covering its full text."""
+    return pool_chunks(*encode_chunked(list(texts)))
+
+def semantic_similarity_matrix(resume_texts, job_desc_texts, aggregation=None):
+    """Return the (n_resumes, n_jobs) semantic similarity of chunked documents.
+
+    "weighted_mean" compares pooled document vectors; "max_sim" averages, over each
+    job chunk, its best-matching resume chunk.
+    """
+    aggregation = aggregation or CHUNK_AGGREGATION
+    n_resumes = len(resume_texts)
+    vectors, offsets, weights = encode_chunked(list(resume_texts) + list(job_desc_texts))
+
+    if aggregation == "weighted_mean":
+        pooled = pool_chunks(vectors, offsets, weights)
+        return pooled[:n_resumes] @ pooled[n_resumes:].T
+
+    if aggregation == "max_sim":
+        split = offsets[n_resumes]
+        chunk_similarities = vectors[:split] @ vectors[split:].T
+        best = np.maximum.reduceat(chunk_similarities, offsets[:n_resumes], axis=0)
+        job_offsets = offsets[n_resumes:] - split
+        return np.add.reduceat(best, job_offsets[:-1], axis=1) / np.diff(job_offsets)
+
+    raise ValueError(f"Unknown chunk aggregation: {aggregation}")
+
+def calculate_match_score(resume_text, job_desc_text, resume_skills=None, job_desc_skills=None):
+    """Calculate ATS-like match score based on semantic similarity and skill match.
+
+    Pass skills already produced by combined_skill_extractor_batch to skip re-running spaCy.
+    """
+    return calculate_match_scores(
+        job_desc_text, [resume_text],
+        resume_skills=None if resume_skills is None else [resume_skills],
+        job_desc_skills=job_desc_skills,
+    )[0]
+
+def calculate_match_scores(job_desc_text, resume_texts, resume_skills=None, job_desc_skills=None):
+    """Score many resumes against one job description.
+
+    Job skills are extracted once, all chunks are embedded in one batch, and the
+    semantic similarities come from a single matrix product. Scores blend skills
+    and semantics with the weights of the active scoring config (40/60 by default).
+    """
+    scores = calculate_match_matrix(
+        [job_desc_text], resume_texts,
+        resume_skills=resume_skills,
+        job_desc_skills=None if job_desc_skills is None else [job_desc_skills],
+    )
+    return [float(score) for score in scores[:, 0]]
+
+def skill_bits(skill_lists, skill_index=None):
+    """Encode skill lists as bitsets over the compiled skill vocabulary.
+
+    Bitsets are only comparable under one taxonomy version; pass the same
+    `skill_index` snapshot when encoding and decoding within a request.
+    """
+    return (skill_index or get_skill_index()).encode_bits(list(skill_lists))
+
+def skill_match_matrix(resume_bits, job_bits):
+    """Return the fraction of each job's skills every resume shares, as (n_resumes, n_jobs)."""
+    return skill_overlap(resume_bits, job_bits) / np.maximum(popcount(job_bits), 1)
+
+def matched_skills(resume_bits, job_bits, skill_index=None):
+    """Return the sorted skill names set in both bitsets."""
+    return sorted((skill_index or get_skill_index()).decode_bits(resume_bits & job_bits))
+
+def calculate_match_matrix(job_desc_texts, resume_texts, resume_skills=None, job_desc_skills=None, config=None,
+                           skill_index=None):
+    """Score every resume against every job description.
+
+    Each document is analyzed and embedded exactly once; returns an
+    (n_resumes, n_jobs) array of match percentages.
+    """
+    skill_match_scores, semantic_similarities = score_components(
+        job_desc_texts, resume_texts, resume_skills=resume_skills, job_desc_skills=job_desc_skills,
+        skill_index=skill_index
+    )
+    return (config or scoring.current()).combine(skill_match_scores, semantic_similarities)
+
+def score_components(job_desc_texts, resume_texts, resume_skills=None, job_desc_skills=None, skill_index=None):
+    """Return the (n_resumes, n_jobs) skill-match fractions and semantic similarities.
+
+    These are the inputs of the weighted blend; keeping them lets results be
+    re-ranked under different weights without re-analyzing any document.
+    """
+    job_desc_texts = list(job_desc_texts)
+    resume_texts = list(resume_texts)
+    n_resumes = len(resume_texts)
+    if not n_resumes or not job_desc_texts:
+        empty = np.zeros((n_resumes, len(job_desc_texts)), dtype=np.float32)
+        return empty, empty.copy()
+
+    # One taxonomy version for the whole batch, even if a new one is swapped in meanwhile
+    skill_index = skill_index or get_skill_index()
+
     # Extract skills
-    resume_skills = combined_skill_extractor(resume_text)
-    job_desc_skills = combined_skill_extractor(job_desc_text)
+    if resume_skills is None or job_desc_skills is None:
+        batch_skills = combined_skill_extractor_batch(resume_texts + job_desc_texts, skill_index=skill_index)
+        resume_skills = batch_skills[:n_resumes] if resume_skills is None else resume_skills
+        job_desc_skills = batch_skills[n_resumes:] if job_desc_skills is None else job_desc_skills
 
-    # Skill match score (percentage of shared skills)
-    skill_match_score = len(set(resume_skills) & set(job_desc_skills)) / max(len(set(job_desc_skills)), 1)
-    
-    # Use Sentence-Transformers to compute semantic similarity between full texts
-    embeddings = model.encode([resume_text, job_desc_text])
-    semantic_similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-    
-    # Combine scores: weight skills match (40%) and semantic similarity (60%)
-    total_score = (skill_match_score * 0.4) + (semantic_similarity * 0.6)
-    
-    # Return match score as percentage
-    return round(total_score * 100, 2)
\ No newline at end of file
+    # Skill match score (percentage of each job's skills the resume shares), as a popcount
+    # of AND-ed vocabulary bitsets
+    skill_match_scores = skill_match_matrix(
+        skill_bits(resume_skills, skill_index), skill_bits(job_desc_skills, skill_index)
+    )
+
+    # Use Sentence-Transformers to compute semantic similarity over the full texts,
+    # section by section, so long resumes aren't truncated by the encoder
+    semantic_similarities = semantic_similarity_matrix(resume_texts, job_desc_texts)
+
+    return skill_match_scores, semantic_similarities
@@ -0,0 +1,196 @@
+import gc
+import os
+import threading
+import time
+
+from app.skill_index import DEFAULT_SKILLS_PATH
+
+# Single owner of every heavy model so each process holds exactly one copy.
+#
+# MODEL_LOAD_MODE controls when models load:
+#   lazy    - on first use
+#   startup - in the FastAPI startup hook (default)
+#   import  - when main.py is imported; combine with a pre-forking server
+#             (`gunicorn --preload -k uvicorn.workers.UvicornWorker main:app`)
+#             so workers fork after loading and share the weights copy-on-write
+MODEL_LOAD_MODE = os.getenv("MODEL_LOAD_MODE", "startup")
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SENTENCE_MODEL = os.getenv("SENTENCE_MODEL", "all-MiniLM-L6-v2")
+SKILLS_PATH = os.getenv("SKILLS_PATH", DEFAULT_SKILLS_PATH)
+
+# How often the taxonomy watcher checks SKILLS_PATH for a new version; 0 disables it
+TAXONOMY_POLL_SECONDS = float(os.getenv("TAXONOMY_POLL_SECONDS", "5"))
+
+_PROCESS_START = time.time()
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(SPACY_MODEL)
+
+
+def _load_encoder():
+    from app.encoders import load_encoder
+    return load_encoder(SENTENCE_MODEL)
+
+
+def _load_embedding_store():
+    from app.embedding_store import EmbeddingStore
+    # Keyed by encoder name, so vectors from different backends never mix
+    encoder = get_encoder()
+    return EmbeddingStore(encoder.name, encoder.dim)
+
+
+def _load_skill_index():
+    global _skills_mtime
+    from app.skill_index import SkillIndex
+    # Stat before reading, so a write that lands mid-load is picked up by the next check
+    mtime = os.stat(SKILLS_PATH).st_mtime_ns
+    index = SkillIndex.from_file(SKILLS_PATH)
+    _skills_mtime = mtime
+    return index
+
+
+# Load order matters for preload: the embedding store needs the encoder
+LOADERS = {
+    "skills": _load_skill_index,
+    "spacy": _load_spacy,
+    "encoder": _load_encoder,
+    "embedding_store": _load_embedding_store,
+}
+
+_models = {}
+_status = {name: {"state": "not_loaded", "loadSeconds": None, "error": None} for name in LOADERS}
+_locks = {name: threading.Lock() for name in LOADERS}
+_ready_at = None
+_skills_mtime = None
+_reload_lock = threading.Lock()
+_watcher = None
+
+
+def get(name):
+    """Return a model, loading it on first use. Safe to call from many threads."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _locks[name]:
+        if name not in _models:
+            _status[name]["state"] = "loading"
+            start = time.perf_counter()
+            try:
+                _models[name] = LOADERS[name]()
+            except Exception as e:
+                _status[name].update(state="failed", error=str(e))
+                raise
+            _status[name].update(state="loaded", loadSeconds=round(time.perf_counter() - start, 3), error=None)
+            _mark_ready()
+        return _models[name]
+
+
+def _mark_ready():
+    global _ready_at
+    if _ready_at is None and is_ready():
+        _ready_at = time.time()
+
+
+def get_nlp():
+    return get("spacy")
+
+
+def get_encoder():
+    return get("encoder")
+
+
+def get_embedding_store():
+    return get("embedding_store")
+
+
+def get_skill_index():
+    return get("skills")
+
+
+def reload_skill_index(force=False):
+    """Recompile the skill taxonomy if SKILLS_PATH changed and swap it in atomically.
+
+    The new index is compiled aside and published with a single assignment;
+    requests that already hold the previous index finish with it.
+    """
+    with _reload_lock:
+        current = _models.get("skills")
+        if current is None:
+            return get_skill_index()
+        if not force and os.stat(SKILLS_PATH).st_mtime_ns == _skills_mtime:
+            return current
+        index = _load_skill_index()
+        if index.version != current.version:
+            _models["skills"] = index
+            _status["skills"]["reloadedAt"] = time.time()
+            print(f"Skill taxonomy reloaded: {current.version} -> {index.version}")
+        return _models["skills"]
+
+
+def _watch_skill_index():
+    failed_mtime = None
+    while True:
+        time.sleep(TAXONOMY_POLL_SECONDS)
+        mtime = None
+        try:
+            mtime = os.stat(SKILLS_PATH).st_mtime_ns
+            if mtime != failed_mtime:
+                reload_skill_index()
+        except Exception as e:
+            # Keep serving the current taxonomy, e.g. while the file is half written;
+            # retried once the file changes again
+            failed_mtime = mtime
+            print(f"Skill taxonomy reload failed: {e}")
+
+
+def start_taxonomy_watcher():
+    """Poll SKILLS_PATH in a daemon thread and hot-swap new taxonomy versions."""
+    global _watcher
+    with _reload_lock:
+        if _watcher is None and TAXONOMY_POLL_SECONDS > 0:
+            _watcher = threading.Thread(target=_watch_skill_index, name="taxonomy-watcher", daemon=True)
+            _watcher.start()
+
+
+def preload():
+    """Load every model now, e.g. in a startup hook or before a server forks workers."""
+    for name in LOADERS:
+        get(name)
+    # Move the loaded objects out of the cyclic GC's reach so collections in forked
+    # workers don't write to (and un-share) the pages holding them
+    gc.collect()
+    gc.freeze()
+
+
+def is_ready():
+    return all(name in _models for name in LOADERS)
+
+
+def _memory_mb():
+    """Resident and proportional (shared pages split across processes) memory, Linux only."""
+    usage = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                if key in ("Rss", "Pss", "Shared_Clean", "Shared_Dirty"):
+                    usage[key] = round(int(value.split()[0]) / 1024, 1)
+    except (OSError, ValueError):
+        pass
+    return usage
+
+
+def status():
+    ready = is_ready()
+    return {
+        "ready": ready,
+        "loadMode": MODEL_LOAD_MODE,
+        "pid": os.getpid(),
+        "secondsToReady": round(_ready_at - _PROCESS_START, 3) if ready and _ready_at else None,
+        "models": {name: dict(state) for name, state in _status.items()},
+        "taxonomyVersion": _models["skills"].version if "skills" in _models else None,
+        "memoryMB": _memory_mb(),
+    }
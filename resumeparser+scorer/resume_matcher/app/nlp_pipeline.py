@@ -0,0 +1,51 @@
+import os
+
+from app.model_registry import get_nlp
+
+# nlp.pipe tuning for multi-document requests
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", "32"))
+NLP_N_PROCESS = int(os.getenv("NLP_N_PROCESS", "1"))
+
+# Pipeline components each analysis task depends on; everything else is disabled
+TASK_COMPONENTS = {
+    "noun_chunks": {"tok2vec", "tagger", "attribute_ruler", "parser"},
+    "entities": {"tok2vec", "ner"},
+    "proper_nouns": {"tok2vec", "tagger", "attribute_ruler"},
+}
+
+SKILL_TASKS = ("noun_chunks", "entities", "proper_nouns")
+
+
+def disabled_components(tasks):
+    """Return the pipeline components not needed by any of the given tasks."""
+    needed = set().union(*(TASK_COMPONENTS[task] for task in tasks))
+    return [name for name in get_nlp().pipe_names if name not in needed]
+
+
+def _doc_features(doc, tasks):
+    features = {}
+    if "noun_chunks" in tasks:
+        features["noun_chunks"] = [chunk.text.strip() for chunk in doc.noun_chunks]
+    if "entities" in tasks:
+        features["entities"] = [(ent.text.strip(), ent.label_) for ent in doc.ents]
+    if "proper_nouns" in tasks:
+        features["proper_nouns"] = [token.text.strip() for token in doc if token.pos_ == "PROPN" and len(token.text) > 1]
+    return features
+
+
+def analyze_documents(texts, tasks=SKILL_TASKS, batch_size=None, n_process=None):
+    """Run all texts through one nlp.pipe pass and return plain per-document features.
+
+    Only the components required by `tasks` run; results keep the input order.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+
+    docs = get_nlp().pipe(
+        texts,
+        batch_size=batch_size or NLP_BATCH_SIZE,
+        n_process=n_process or NLP_N_PROCESS,
+        disable=disabled_components(tasks),
+    )
+    return [_doc_features(doc, tasks) for doc in docs]
@@ -1,31 +1,140 @@
+import itertools
+import os
+import time
+import zipfile
 from io import BytesIO
+
 from PyPDF2 import PdfReader
 from docx import Document
+from pdfminer.high_level import extract_pages
+from pdfminer.layout import LTTextContainer
+
+# File types every endpoint accepts
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+# "auto" reads PDFs with PyPDF2 (the faster backend, see benchmarks/bench_parser.py) and
+# falls back to pdfminer when its text yield is poor; "pypdf2" or "pdfminer" pin one backend
+PDF_BACKEND = os.getenv("PDF_BACKEND", "auto")
+
+# Per-file limits, so a single pathological document can't stall a parsing worker.
+# Pages past the limit are ignored; oversized or slow files raise ParseError. The time
+# limit is checked between pages; app.extraction also enforces it from outside the
+# worker, for a single page that never finishes
+PARSE_MAX_BYTES = int(os.getenv("PARSE_MAX_BYTES", str(20 * 1024 * 1024)))
+PARSE_MAX_PAGES = int(os.getenv("PARSE_MAX_PAGES", "50"))
+PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+
+# Fewer extracted characters per page than this counts as poor yield (odd font encodings)
+PDF_MIN_CHARS_PER_PAGE = int(os.getenv("PDF_MIN_CHARS_PER_PAGE", "200"))
+
+
+class ParseError(ValueError):
+    """A document that is unsupported or breaks a parsing limit."""
+
+
+def is_supported(file_name):
+    return file_name.lower().endswith(SUPPORTED_EXTENSIONS)
+
+# Accept raw bytes or an open binary file (e.g. a spooled upload), read in place
+def _stream(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = BytesIO(source)
+        size = len(source)
+    else:
+        stream = source
+        size = stream.seek(0, os.SEEK_END)
+    if size > PARSE_MAX_BYTES:
+        raise ParseError(f"File is {size} bytes, over the {PARSE_MAX_BYTES} byte limit")
+    stream.seek(0)
+    return stream
+
+def _deadline():
+    return time.monotonic() + PARSE_TIMEOUT_SECONDS
 
-def extract_text_from_pdf(file_bytes):
-    reader = PdfReader(BytesIO(file_bytes))
-    return " ".join(page.extract_text() for page in reader.pages if page.extract_text())
+def _check_deadline(deadline):
+    if time.monotonic() > deadline:
+        raise ParseError(f"Parsing took longer than {PARSE_TIMEOUT_SECONDS:g}s")
 
-def extract_text_from_docx(file_bytes):
-    doc = Document(BytesIO(file_bytes))
+def _pypdf2_pages(stream, deadline):
+    # PdfReader only reads the cross-reference table up front; pages load as they are iterated
+    for page in itertools.islice(PdfReader(stream).pages, PARSE_MAX_PAGES):
+        text = page.extract_text() or ""
+        _check_deadline(deadline)
+        yield text
+
+def _pdfminer_pages(stream, deadline):
+    for page in extract_pages(stream, maxpages=PARSE_MAX_PAGES):
+        text = "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+        _check_deadline(deadline)
+        yield text
+
+PDF_BACKENDS = {"pypdf2": _pypdf2_pages, "pdfminer": _pdfminer_pages}
+
+# Text of each PDF page, extracted lazily one page at a time
+def iter_pdf_pages(source, backend="pypdf2", deadline=None):
+    return PDF_BACKENDS[backend](_stream(source), deadline or _deadline())
+
+def _pdf_text(source, backend, deadline):
+    pages = list(iter_pdf_pages(source, backend, deadline))
+    return " ".join(text for text in pages if text), len(pages)
+
+def extract_text_from_pdf(source, backend=None):
+    backend = backend or PDF_BACKEND
+    deadline = _deadline()
+    if backend != "auto":
+        return _pdf_text(source, backend, deadline)[0]
+
+    try:
+        text, pages = _pdf_text(source, "pypdf2", deadline)
+        if len(text.strip()) >= PDF_MIN_CHARS_PER_PAGE * max(pages, 1):
+            return text
+    except ParseError:
+        raise
+    except Exception:
+        text = ""  # PyPDF2 rejected the file; pdfminer is more lenient with malformed PDFs
+
+    # Poor yield: pdfminer decodes more font encodings, keep whichever got more text
+    fallback = _pdf_text(source, "pdfminer", deadline)[0]
+    return fallback if len(fallback.strip()) > len(text.strip()) else text
+
+def extract_text_from_docx(source):
+    deadline = _deadline()
+    stream = _stream(source)
+    # A DOCX is a zip archive; check the unpacked size so a zip bomb is rejected before parsing
+    with zipfile.ZipFile(stream) as archive:
+        unpacked = sum(info.file_size for info in archive.infolist())
+    if unpacked > PARSE_MAX_BYTES:
+        raise ParseError(f"DOCX unpacks to {unpacked} bytes, over the {PARSE_MAX_BYTES} byte limit")
+    stream.seek(0)
+    doc = Document(stream)
+    _check_deadline(deadline)
     return " ".join(p.text for p in doc.paragraphs if p.text)
 
-def parse_resume(file_name, file_bytes):
-    if file_name.endswith(".pdf"):
-        return extract_text_from_pdf(file_bytes)
-    elif file_name.endswith(".docx"):
-        return extract_text_from_docx(file_bytes)
-    raise ValueError("Unsupported file format")
+# File type from the name's extension or, without a name, from the content signature
+def document_type(source, file_name=None):
+    if file_name:
+        for extension in SUPPORTED_EXTENSIONS:
+            if file_name.lower().endswith(extension):
+                return extension
+        raise ParseError("Unsupported file format")
+    head = _stream(source).read(4)
+    if head.startswith(b"%PDF"):
+        return ".pdf"
+    if head.startswith(b"PK"):
+        return ".docx"
+    raise ParseError("Unsupported file format")
 
-# app/parser.py
+# Text of a PDF or DOCX resume or job description; the entry point for every endpoint
+def extract_document_text(source, file_name=None):
+    if document_type(source, file_name) == ".pdf":
+        return extract_text_from_pdf(source)
+    return extract_text_from_docx(source)
 
-from pdfminer.high_level import extract_text
-from io import BytesIO
+def parse_resume(file_name, file_bytes):
+    return extract_document_text(file_bytes, file_name)
 
 def extract_resume_text(file_bytes):
-    stream = BytesIO(file_bytes)
-    return extract_text(stream)
+    return extract_document_text(file_bytes)
 
 def extract_jd_text(file_bytes):
-    stream = BytesIO(file_bytes)
-    return extract_text(stream)
+    return extract_document_text(file_bytes)
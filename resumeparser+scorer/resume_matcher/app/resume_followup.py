@@ -2,33 +2,55 @@ import os
 from dotenv import load_dotenv
 import openai
 
+from app.llm_cache import cache_key, get_cache
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Access the API key
 client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-def generate_follow_up(score, job_skills, resume_skills):
-    try:
-        # Step 1: Generate constructive feedback
-        feedback_response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": "You are a helpful career advisor."},
-                {"role": "user", "content": f"""
+# Part of the LLM cache key; bump when either prompt changes so old responses aren't reused
+FOLLOW_UP_PROMPT_VERSION = "1"
+
+# Parameters of the follow-up question call; its prompt is built from the generated feedback
+FOLLOW_UP_PARAMS = dict(model="gpt-3.5-turbo", temperature=0.6, max_tokens=200)
+
+def _feedback_request(score, job_skills, resume_skills):
+    # Equal inputs in any order give the same prompt, and so the same cache key
+    score = round(float(score), 1)
+    job_skills = sorted(set(job_skills))
+    resume_skills = sorted(set(resume_skills or []))
+    return dict(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": "You are a helpful career advisor."},
+            {"role": "user", "content": f"""
                     Generate constructive feedback for a candidate who scored {score}% match (in 3rd person).
                     Job requires: {', '.join(job_skills)}
                     Candidate has: {', '.join(resume_skills) if resume_skills else 'No listed skills'}
                 """}
-            ],
-            temperature=0.7,
-            max_tokens=200
-        )
+        ],
+        temperature=0.7,
+        max_tokens=200
+    )
+
+def generate_follow_up(score, job_skills, resume_skills):
+    feedback_request = _feedback_request(score, job_skills, resume_skills)
+    # Both calls are cached as one response: the second prompt depends only on the first answer
+    key = cache_key("follow_up", FOLLOW_UP_PROMPT_VERSION, {"feedback": feedback_request, "followUp": FOLLOW_UP_PARAMS})
+    cache = get_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        # Step 1: Generate constructive feedback
+        feedback_response = client.chat.completions.create(**feedback_request)
         feedback_text = feedback_response.choices[0].message.content.strip()
 
         # Step 2: Generate follow-up questions
         follow_up_response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            **FOLLOW_UP_PARAMS,
             messages=[
                 {"role": "system", "content": "You are a technical interviewer generating follow-up interview questions."},
                 {"role": "user", "content": f"""
@@ -38,16 +60,16 @@ def generate_follow_up(score, job_skills, resume_skills):
                     Feedback:
                     \"\"\"{feedback_text}\"\"\"
                 """}
-            ],
-            temperature=0.6,
-            max_tokens=200
+            ]
         )
         follow_up_questions = follow_up_response.choices[0].message.content.strip()
 
-        return {
+        result = {
             "feedback": feedback_text,
             "follow_up_questions": follow_up_questions
         }
+        cache.put(key, result)
+        return result
 
     except Exception as e:
         import traceback
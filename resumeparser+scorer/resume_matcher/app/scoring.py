@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Persisted scoring settings; edited through PUT /api/scoring
+SCORING_CONFIG_PATH = os.getenv("SCORING_CONFIG_PATH", os.path.join(PACKAGE_DIR, "cache", "scoring.json"))
+
+DEFAULT_SKILL_WEIGHT = 0.4
+DEFAULT_SEMANTIC_WEIGHT = 0.6
+
+# Dashboard status ladder: the first label whose minimum the score reaches
+DEFAULT_THRESHOLDS = [
+    {"min": 85, "status": "Excellent Match"},
+    {"min": 70, "status": "Matched"},
+    {"min": 50, "status": "Potential"},
+    {"min": 30, "status": "Needs Review"},
+]
+DEFAULT_BELOW_STATUS = "Not Qualified"
+
+
+class ScoringConfig:
+    """Weights of the skill/semantic blend and the status thresholds applied to its result."""
+
+    def __init__(self, skill_weight=DEFAULT_SKILL_WEIGHT, semantic_weight=DEFAULT_SEMANTIC_WEIGHT,
+                 thresholds=None, below_status=DEFAULT_BELOW_STATUS):
+        if skill_weight < 0 or semantic_weight < 0 or skill_weight + semantic_weight <= 0:
+            raise ValueError("Weights must be non-negative and not both zero.")
+        thresholds = thresholds if thresholds is not None else DEFAULT_THRESHOLDS
+        for threshold in thresholds:
+            if not isinstance(threshold.get("min"), (int, float)) or not threshold.get("status"):
+                raise ValueError("Each threshold needs a numeric 'min' and a 'status'.")
+
+        self.skill_weight = float(skill_weight)
+        self.semantic_weight = float(semantic_weight)
+        self.thresholds = sorted(
+            ({"min": float(t["min"]), "status": t["status"]} for t in thresholds), key=lambda t: t["min"], reverse=True
+        )
+        self.below_status = below_status
+
+    def combine(self, skill_scores, semantic_similarities):
+        """Blend skill-match fractions and semantic similarities into match percentages.
+
+        Weights are normalized by their sum, so scores stay on a 0-100 scale.
+        """
+        total_weight = self.skill_weight + self.semantic_weight
+        total_scores = (
+            np.asarray(skill_scores) * self.skill_weight + np.asarray(semantic_similarities) * self.semantic_weight
+        ) / total_weight
+        return np.round(total_scores * 100, 2)
+
+    def status(self, score):
+        for threshold in self.thresholds:
+            if score >= threshold["min"]:
+                return threshold["status"]
+        return self.below_status
+
+    def replace(self, **overrides):
+        """Return a copy with some settings overridden; None values are ignored."""
+        settings = self.to_dict()
+        settings.update({key: value for key, value in overrides.items() if value is not None})
+        return ScoringConfig.from_dict(settings)
+
+    def to_dict(self):
+        return {
+            "skillWeight": self.skill_weight,
+            "semanticWeight": self.semantic_weight,
+            "thresholds": [dict(threshold) for threshold in self.thresholds],
+            "belowStatus": self.below_status,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            skill_weight=data.get("skillWeight", DEFAULT_SKILL_WEIGHT),
+            semantic_weight=data.get("semanticWeight", DEFAULT_SEMANTIC_WEIGHT),
+            thresholds=data.get("thresholds"),
+            below_status=data.get("belowStatus", DEFAULT_BELOW_STATUS),
+        )
+
+
+_lock = threading.Lock()
+_config = None
+_stamp = None  # (inode, mtime_ns, size) of SCORING_CONFIG_PATH when _config was read; None if it didn't exist
+
+
+def _file_stamp():
+    try:
+        stat = os.stat(SCORING_CONFIG_PATH)
+    except FileNotFoundError:
+        return None
+    # update() replaces the file, so the inode changes even within one mtime tick
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def current():
+    """Return the active scoring config, re-reading SCORING_CONFIG_PATH whenever the file changes.
+
+    Every worker process checks the file, so a PUT /api/scoring handled by one
+    worker reaches the others on their next request.
+    """
+    global _config, _stamp
+    stamp = _file_stamp()
+    if _config is None or stamp != _stamp:
+        with _lock:
+            stamp = _file_stamp()
+            if _config is None or stamp != _stamp:
+                data = {}
+                try:
+                    if stamp is not None:
+                        with open(SCORING_CONFIG_PATH) as f:
+                            data = json.load(f)
+                    config = ScoringConfig.from_dict(data)
+                except (OSError, ValueError) as e:
+                    if _config is None:
+                        raise
+                    # A half-edited or invalid file keeps the config in service
+                    print(f"Ignoring invalid scoring config {SCORING_CONFIG_PATH}: {e}")
+                    config = _config
+                _config, _stamp = config, stamp
+    return _config
+
+
+def update(config):
+    """Make `config` the active scoring config and persist it."""
+    global _config, _stamp
+    with _lock:
+        os.makedirs(os.path.dirname(SCORING_CONFIG_PATH), exist_ok=True)
+        tmp_path = f"{SCORING_CONFIG_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(config.to_dict(), f, indent=2)
+        os.replace(tmp_path, SCORING_CONFIG_PATH)
+        _config, _stamp = config, _file_stamp()
+    return config
@@ -0,0 +1,66 @@
+import json
+import os
+import re
+
+# all-MiniLM-L6-v2 truncates at 256 word pieces; keep chunks comfortably below that
+CHUNK_MAX_WORDS = int(os.getenv("CHUNK_MAX_WORDS", "150"))
+
+# Heading keywords for resumes and job descriptions, mapped to a canonical section
+SECTION_HEADINGS = {
+    "experience": [
+        "experience", "work experience", "professional experience", "employment", "employment history",
+        "work history", "responsibilities", "what you'll do", "what you will do", "role", "about the role",
+    ],
+    "skills": [
+        "skills", "technical skills", "core competencies", "competencies", "technologies", "tech stack",
+        "requirements", "qualifications", "required skills", "preferred qualifications", "what we're looking for",
+    ],
+    "education": ["education", "academic background", "certifications", "certificates", "training"],
+    "projects": ["projects", "personal projects", "selected projects", "key projects", "portfolio"],
+}
+
+DEFAULT_SECTION = "summary"
+
+# Relative weight of each section when chunk vectors are mean-pooled
+SECTION_WEIGHTS = {"experience": 1.0, "skills": 1.0, "projects": 0.8, "education": 0.5, "summary": 0.8}
+SECTION_WEIGHTS.update(json.loads(os.getenv("SECTION_WEIGHTS", "{}")))
+
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_HEADING_CLEANUP = re.compile(r"[^a-z' ]+")
+
+
+def heading_section(line):
+    """Return the canonical section if the line looks like a heading, else None."""
+    words = line.strip().split()
+    if not words or len(words) > 5:
+        return None
+    key = " ".join(_HEADING_CLEANUP.sub(" ", line.lower()).split())
+    return _HEADING_LOOKUP.get(key)
+
+
+def segment(text):
+    """Split a resume or job description into (section, text) blocks in document order."""
+    blocks = []
+    section, lines = DEFAULT_SECTION, []
+    for line in text.splitlines():
+        heading = heading_section(line)
+        if heading:
+            if any(l.strip() for l in lines):
+                blocks.append((section, "\n".join(lines).strip()))
+            section, lines = heading, []
+        else:
+            lines.append(line)
+    if any(l.strip() for l in lines):
+        blocks.append((section, "\n".join(lines).strip()))
+    return blocks
+
+
+def chunk_document(text, max_words=None):
+    """Return (section, chunk_text) pairs covering the whole document in bounded-size chunks."""
+    max_words = max_words or CHUNK_MAX_WORDS
+    chunks = []
+    for section, block in segment(text):
+        words = block.split()
+        for start in range(0, len(words), max_words):
+            chunks.append((section, " ".join(words[start:start + max_words])))
+    return chunks or [(DEFAULT_SECTION, text.strip())]
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import re
+
+import numpy as np
+
+# Tokens keep the punctuation that is part of tech names (C++, C#, Node.js, CI/CD, .NET)
+TOKEN_PATTERN = re.compile(r"(?:(?<![A-Za-z0-9])\.)?[A-Za-z0-9][A-Za-z0-9+#]*(?:[./\-][A-Za-z0-9+#]+)*")
+
+DEFAULT_SKILLS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "skills.json")
+
+# Rows of resume bitsets compared against all jobs at once in skill_overlap; bounds peak memory
+OVERLAP_BLOCK_ROWS = 4096
+
+# Set bits per byte value, for NumPy versions without np.bitwise_count
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """Count set bits of a uint64 array along its last axis."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return _BYTE_POPCOUNT[words.view(np.uint8)].sum(axis=-1, dtype=np.int64)
+
+
+def skill_overlap(left_bits, right_bits):
+    """Return the (len(left), len(right)) matrix of shared skill counts between two bitset batches."""
+    overlap = np.empty((len(left_bits), len(right_bits)), dtype=np.int64)
+    for start in range(0, len(left_bits), OVERLAP_BLOCK_ROWS):
+        block = left_bits[start:start + OVERLAP_BLOCK_ROWS]
+        overlap[start:start + len(block)] = popcount(block[:, None, :] & right_bits[None, :, :])
+    return overlap
+
+
+def tokenize(text):
+    """Split text into (normalized token, start, end) tuples."""
+    return [(m.group(0).lower(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+def normalize_skill(text):
+    """Normalize a skill name or phrase into its lookup key."""
+    return " ".join(token for token, _, _ in tokenize(text))
+
+
+class SkillIndex:
+    """Compiled skill vocabulary: O(1) phrase lookup plus a token trie for single-pass scanning."""
+
+    _END = object()
+
+    def __init__(self, skills, aliases=None):
+        self.skills = []      # canonical names, deduplicated, in file order; position = bit id
+        self.lookup = {}      # normalized key -> canonical name
+        self.trie = {}        # token -> child node, _END marks a complete phrase
+        self.max_phrase_tokens = 0
+
+        for skill in skills:
+            key = normalize_skill(skill)
+            if key and key not in self.lookup:
+                self.skills.append(skill)
+                self._add(key, skill)
+
+        for alias, canonical in (aliases or {}).items():
+            target = self.lookup.get(normalize_skill(canonical))
+            key = normalize_skill(alias)
+            if target and key and key not in self.lookup:
+                self._add(key, target)
+
+        self.skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+        self.bitset_words = max(1, (len(self.skills) + 63) // 64)
+
+        # Content hash of the compiled taxonomy; bit ids depend on skill order, so it is included
+        compiled = json.dumps([self.skills, sorted(self.lookup.items())], separators=(",", ":"))
+        self.version = hashlib.sha256(compiled.encode("utf-8")).hexdigest()[:12]
+
+    def _add(self, key, canonical):
+        self.lookup[key] = canonical
+        tokens = key.split(" ")
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self._END] = canonical
+        self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    def __len__(self):
+        return len(self.skills)
+
+    def match(self, phrase):
+        """Return the canonical skill for an exact phrase, or None."""
+        return self.lookup.get(normalize_skill(phrase))
+
+    def scan(self, text):
+        """Find skills in a single left-to-right pass, preferring the longest phrase at each position.
+
+        Yields (canonical, surface, token_count) tuples.
+        """
+        tokens = tokenize(text)
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            best = None
+            j = i
+            while j < len(tokens) and j - i < self.max_phrase_tokens:
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                j += 1
+                if self._END in node:
+                    best = (node[self._END], j)
+            if best:
+                canonical, end = best
+                yield canonical, text[tokens[i][1]:tokens[end - 1][2]], end - i
+                i = end
+            else:
+                i += 1
+
+    def encode_bits(self, skill_lists):
+        """Encode skill lists as an (n, bitset_words) uint64 matrix; unknown names are ignored."""
+        bits = np.zeros((len(skill_lists), self.bitset_words * 64), dtype=bool)
+        for row, skills in enumerate(skill_lists):
+            bits[row, [self.skill_ids[s] for s in skills if s in self.skill_ids]] = True
+        # Little-endian bit order so bit i of the bitset is skill id i
+        return np.packbits(bits, axis=1, bitorder="little").view(np.uint64)
+
+    def decode_bits(self, bitset):
+        """Return the canonical skill names set in one bitset row, in vocabulary order."""
+        ids = np.flatnonzero(np.unpackbits(bitset.view(np.uint8), bitorder="little")[:len(self.skills)])
+        return [self.skills[i] for i in ids]
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_SKILLS_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["skills"], data.get("aliases"))
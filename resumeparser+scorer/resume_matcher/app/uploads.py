@@ -0,0 +1,47 @@
+import hashlib
+import os
+
+from starlette.formparsers import MultiPartParser
+
+# Uploaded files stay in memory up to this many bytes; larger ones roll over to an
+# anonymous (already unlinked) temporary file, so nothing is left behind on disk
+UPLOAD_SPOOL_MAX_BYTES = int(os.getenv("UPLOAD_SPOOL_MAX_BYTES", str(10 * 1024 * 1024)))
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def configure_spooling(max_bytes=UPLOAD_SPOOL_MAX_BYTES):
+    """Set the in-memory threshold of the SpooledTemporaryFile Starlette parses each file part into."""
+    # Renamed from max_file_size to spool_max_size in newer Starlette releases
+    attribute = "spool_max_size" if hasattr(MultiPartParser, "spool_max_size") else "max_file_size"
+    setattr(MultiPartParser, attribute, max_bytes)
+
+
+class SpooledUpload:
+    """An uploaded file read in place from its spooled buffer instead of a copy on disk.
+
+    `file` is rewound before every use, so the parser helpers in app/parser.py
+    can read it directly.
+    """
+
+    def __init__(self, filename, file, sha256):
+        self.filename = filename
+        self._file = file
+        self.sha256 = sha256
+
+    @property
+    def file(self):
+        self._file.seek(0)
+        return self._file
+
+    def read(self):
+        return self.file.read()
+
+    @classmethod
+    def from_upload(cls, upload_file):
+        """Wrap a FastAPI UploadFile, hashing its bytes in bounded chunks."""
+        digest = hashlib.sha256()
+        upload_file.file.seek(0)
+        for chunk in iter(lambda: upload_file.file.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+        return cls(upload_file.filename, upload_file.file, digest.hexdigest())
@@ -1,5 +1,21 @@
 from datetime import datetime
+import re
 import uuid
 
 def generate_unique_id():
     return f"resume-{int(datetime.now().timestamp())}-{uuid.uuid4().hex[:6]}"
+
+# Function to extract name, email from the resume text
+def extract_name_and_email(text):
+    name_pattern = r"(?:^|\n)\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:\n|$)"
+    email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
+    
+    name_match = re.search(name_pattern, text)
+    email_match = re.search(email_pattern, text)
+
+    full_name = name_match.group(1).strip() if name_match else None
+    first_name, *last_name = full_name.split() if full_name else (None, None)
+    last_name = " ".join(last_name) if last_name else None
+    email = email_match.group(0) if email_match else None
+    
+    return first_name, last_name, email
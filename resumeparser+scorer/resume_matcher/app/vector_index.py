@@ -0,0 +1,161 @@
+import os
+import threading
+
+import numpy as np
+
+
+class IVFIndex:
+    """Inverted-file approximate nearest-neighbour index for normalized embeddings.
+
+    Vectors are bucketed by their nearest k-means centroid; a query scores only
+    the `nprobe` closest buckets instead of every stored vector. Until there are
+    enough vectors to train the centroids the index answers exactly. Inserts are
+    incremental, and the centroids are retrained whenever the index has grown
+    `retrain_factor` times since the last training.
+    """
+
+    def __init__(self, dim, nprobe=8, min_train_size=1024, retrain_factor=4.0, seed=0):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_factor = retrain_factor
+        self.seed = seed
+
+        self.ids = []
+        self._id_rows = {}
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._size = 0
+        self.centroids = None
+        self._assignments = np.empty(0, dtype=np.int32)
+        self._lists = []
+        self._trained_size = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, item_id):
+        return item_id in self._id_rows
+
+    @property
+    def vectors(self):
+        return self._vectors[:self._size]
+
+    def _n_lists(self, size):
+        # Roughly sqrt(N) buckets, as is usual for IVF indexes
+        return max(1, int(np.sqrt(size)))
+
+    def _kmeans(self, data, n_lists, iterations=10):
+        rng = np.random.default_rng(self.seed)
+        # Train on a bounded sample; every vector is bucketed afterwards
+        data = data[rng.choice(len(data), min(len(data), 64 * n_lists), replace=False)]
+        centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = data[assignments == c]
+                if len(members):
+                    centroid = members.mean(axis=0)
+                    centroids[c] = centroid / max(np.linalg.norm(centroid), 1e-12)
+        return centroids
+
+    def _assign(self, vectors):
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _rebuild_lists(self):
+        order = np.argsort(self._assignments, kind="stable")
+        bounds = np.searchsorted(self._assignments[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(len(self.centroids))]
+
+    def train(self):
+        """(Re)compute the centroids from every stored vector and rebuild the buckets."""
+        with self._lock:
+            if self._size < self.min_train_size:
+                return
+            data = self.vectors
+            self.centroids = self._kmeans(data, self._n_lists(self._size))
+            self._assignments = self._assign(data)
+            self._rebuild_lists()
+            self._trained_size = self._size
+
+    def add(self, ids, vectors):
+        """Insert vectors under the given ids; existing ids are overwritten in place."""
+        ids = list(ids)
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self._lock:
+            for item_id, vector in zip(ids, vectors):
+                row = self._id_rows.get(item_id)
+                if row is None:
+                    if self._size == len(self._vectors):
+                        grown = np.empty((max(16, 2 * len(self._vectors)), self.dim), dtype=np.float32)
+                        grown[:self._size] = self._vectors[:self._size]
+                        self._vectors = grown
+                    row = self._size
+                    self._size += 1
+                    self.ids.append(item_id)
+                    self._id_rows[item_id] = row
+                self._vectors[row] = vector
+
+            if self.centroids is None or self._size >= self._trained_size * self.retrain_factor:
+                self.train()
+            elif ids:
+                # Incremental insert: bucket only the new or updated rows
+                self._assignments = np.resize(self._assignments, self._size)
+                rows = np.array([self._id_rows[item_id] for item_id in ids], dtype=np.int64)
+                self._assignments[rows] = self._assign(self._vectors[rows])
+                self._rebuild_lists()
+
+    def search(self, query, k=10, nprobe=None, exact=False):
+        """Return up to k (id, inner product) pairs, best first."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            if not self._size:
+                return []
+            if exact or self.centroids is None:
+                rows = np.arange(self._size)
+                scores = self.vectors @ query
+            else:
+                probes = min(nprobe or self.nprobe, len(self.centroids))
+                nearest = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+                rows = np.concatenate([self._lists[c] for c in nearest])
+                scores = self._vectors[rows] @ query
+            top = min(k, len(rows))
+            best = np.argpartition(-scores, top - 1)[:top]
+            best = best[np.argsort(-scores[best])]
+            return [(self.ids[rows[i]], float(scores[i])) for i in best]
+
+    def score(self, ids, query):
+        """Return the exact inner product of the query with each of the given ids' vectors."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            rows = np.array([self._id_rows[item_id] for item_id in ids], dtype=np.int64)
+            return self._vectors[rows] @ query
+
+    def save(self, path):
+        with self._lock:
+            tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                ids=np.array(self.ids, dtype=str),
+                vectors=self.vectors,
+                centroids=self.centroids if self.centroids is not None else np.empty((0, self.dim), dtype=np.float32),
+                assignments=self._assignments[:self._size],
+                trained_size=self._trained_size,
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        data = np.load(path)
+        vectors = data["vectors"]
+        index = cls(vectors.shape[1], **kwargs)
+        index.ids = [str(item_id) for item_id in data["ids"]]
+        index._id_rows = {item_id: row for row, item_id in enumerate(index.ids)}
+        index._vectors = np.array(vectors, dtype=np.float32)
+        index._size = len(vectors)
+        if len(data["centroids"]):
+            index.centroids = data["centroids"]
+            index._assignments = data["assignments"].astype(np.int32)
+            index._trained_size = int(data["trained_size"])
+            index._rebuild_lists()
+        return index
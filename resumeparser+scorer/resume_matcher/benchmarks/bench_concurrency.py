@@ -0,0 +1,114 @@
+"""Small-request latency while a large match batch runs.
+
+Sends a steady trickle of small requests (health checks, or single-resume parses with
+--small parse) to the app in-process, first alone and then while a large /api/match
+batch is being scored, and reports p50/p95 latency for both phases plus the executor
+queue depths. With blocking work on the executors the two phases stay close; when the
+event loop is blocked the small requests wait for the whole batch.
+
+Run from resume_matcher/:
+    python -m benchmarks.bench_concurrency --resumes 200 --small parse
+"""
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import time
+
+import httpx
+
+from app import executors
+from main import app
+
+
+def load(pattern):
+    blobs = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "rb") as f:
+            blobs.append((os.path.basename(path), f.read()))
+    if not blobs:
+        raise SystemExit(f"No files match {pattern}")
+    return blobs
+
+
+async def small_request(client, kind, resume):
+    start = time.perf_counter()
+    if kind == "health":
+        response = await client.get("/api/health")
+    else:
+        name, blob = resume
+        response = await client.post("/api/parse-resume", files={"resume": (name, blob, "application/pdf")})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def trickle(client, kind, resume, interval, stop):
+    latencies = []
+    while not stop.is_set():
+        latencies.append(await small_request(client, kind, resume))
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def summary(label, latencies):
+    if not latencies:
+        print(f"{label:>12} no requests completed")
+        return
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"{label:>12} {len(ordered):>5} requests  p50 {statistics.median(ordered) * 1000:>8.1f}ms  "
+          f"p95 {p95 * 1000:>8.1f}ms  max {ordered[-1] * 1000:>8.1f}ms")
+
+
+async def run(args):
+    resumes = load(os.path.join(args.resume_dir, "*.pdf"))
+    job_name, job_blob = load(args.job)[0]
+    batch = [(f"{i}-{name}", blob) for i, (name, blob) in enumerate(resumes * (args.resumes // len(resumes) + 1))]
+    batch = batch[:args.resumes]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Warm the models so neither phase pays for loading them
+        await small_request(client, args.small, resumes[0])
+
+        stop = asyncio.Event()
+        baseline = asyncio.ensure_future(trickle(client, args.small, resumes[0], args.interval, stop))
+        await asyncio.sleep(args.baseline_seconds)
+        stop.set()
+        baseline = await baseline
+
+        stop = asyncio.Event()
+        during = asyncio.ensure_future(trickle(client, args.small, resumes[0], args.interval, stop))
+        start = time.perf_counter()
+        response = await client.post("/api/match", files=[
+            ("job_description_pdf", (job_name, job_blob, "application/pdf")),
+            *(("resumes", (name, blob, "application/pdf")) for name, blob in batch),
+        ])
+        batch_seconds = time.perf_counter() - start
+        stop.set()
+        during = await during
+        response.raise_for_status()
+
+    print(f"Large batch: {len(batch)} resumes in {batch_seconds:.1f}s")
+    summary("baseline", baseline)
+    summary("during batch", during)
+    for name, stats in executors.stats().items():
+        print(f"{name:>12} workers {stats['workers']}, max queued {stats['maxQueued']}, "
+              f"avg wait {stats['avgWaitMs']}ms, avg run {stats['avgRunMs']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resume-dir", default=os.path.join("..", "Data", "Resumes"))
+    parser.add_argument("--job", default=os.path.join("..", "Data", "JobDescription", "*.pdf"))
+    parser.add_argument("--resumes", type=int, default=100, help="resumes in the large batch")
+    parser.add_argument("--small", choices=("health", "parse"), default="health")
+    parser.add_argument("--interval", type=float, default=0.05, help="pause between small requests")
+    parser.add_argument("--baseline-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""PDF text extraction throughput, inline vs the parsing process pool at several sizes.
+
+Run from resume_matcher/:  python -m benchmarks.bench_extraction --copies 50 --workers 1 2 4 8
+"""
+import argparse
+import glob
+import os
+import time
+
+from app import extraction
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf-dir", default=os.path.join("..", "Data", "Resumes"))
+    parser.add_argument("--copies", type=int, default=20, help="times each PDF is repeated in the batch")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    blobs = []
+    for path in sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf"))):
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+    blobs *= args.copies
+    print(f"{len(blobs)} PDFs, {sum(map(len, blobs)) / 1e6:.1f} MB, {os.cpu_count()} cores")
+
+    start = time.perf_counter()
+    expected = extraction._inline(blobs)
+    inline_seconds = time.perf_counter() - start
+    print(f"{'inline':>10} {len(blobs) / inline_seconds:>8.1f} files/s")
+
+    extraction.PARSE_POOL_MIN_FILES = 1
+    for workers in args.workers:
+        extraction.shutdown()
+        extraction.PARSE_WORKERS = workers
+        extraction.extract_texts(blobs[:workers])  # start the workers outside the timing
+
+        start = time.perf_counter()
+        texts = extraction.extract_texts(blobs)
+        seconds = time.perf_counter() - start
+        assert texts == expected
+        print(f"{f'{workers} procs':>10} {len(blobs) / seconds:>8.1f} files/s ({inline_seconds / seconds:.1f}x)")
+    extraction.shutdown()
+
+
+if __name__ == "__main__":
+    main()
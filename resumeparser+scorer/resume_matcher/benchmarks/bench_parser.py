@@ -0,0 +1,58 @@
+"""Per-backend parsing throughput: PyPDF2, pdfminer and the auto fallback on the sample PDFs,
+plus DOCX files generated from the same text.
+
+Run from resume_matcher/:  python -m benchmarks.bench_parser --repeats 5
+"""
+import argparse
+import glob
+import os
+import time
+from io import BytesIO
+
+from docx import Document
+
+from app import parser as document_parser
+
+
+def make_docx(text):
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(label, blobs, extract, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        texts = [extract(blob) for blob in blobs]
+    seconds = (time.perf_counter() - start) / repeats
+    chars = sum(len(text.strip()) for text in texts)
+    megabytes = sum(map(len, blobs)) / 1e6
+    print(f"{label:>10} {len(blobs) / seconds:>8.1f} files/s {megabytes / seconds:>7.2f} MB/s {chars:>9} chars")
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf-dir", default=os.path.join("..", "Data", "Resumes"))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    pdfs = []
+    for path in sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf"))):
+        with open(path, "rb") as f:
+            pdfs.append(f.read())
+    pages = sum(len(list(document_parser.iter_pdf_pages(blob))) for blob in pdfs)
+    print(f"{len(pdfs)} PDFs, {pages} pages, {sum(map(len, pdfs)) / 1e6:.2f} MB")
+
+    for backend in (*document_parser.PDF_BACKENDS, "auto"):
+        texts = measure(
+            backend, pdfs, lambda blob: document_parser.extract_text_from_pdf(blob, backend), args.repeats
+        )
+    measure("docx", [make_docx(text) for text in texts], document_parser.extract_text_from_docx, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
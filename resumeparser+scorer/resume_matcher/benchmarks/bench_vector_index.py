@@ -0,0 +1,52 @@
+"""Recall vs latency of the candidate-pool IVF index against brute-force search.
+
+Run from resume_matcher/:  python -m benchmarks.bench_vector_index --size 20000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.vector_index import IVFIndex
+
+
+def clustered_vectors(size, dim, clusters, rng):
+    # Resume embeddings cluster by role; mimic that with noisy cluster centres
+    centres = rng.normal(size=(clusters, dim))
+    vectors = centres[rng.integers(0, clusters, size)] + 0.6 * rng.normal(size=(size, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    data = clustered_vectors(args.size + args.queries, args.dim, max(8, args.size // 500), rng)
+    vectors, queries = data[:args.size], data[args.size:]
+
+    index = IVFIndex(args.dim)
+    start = time.perf_counter()
+    index.add([str(i) for i in range(args.size)], vectors)
+    print(f"built index over {args.size} vectors ({len(index.centroids)} lists) in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    truth = [{item_id for item_id, _ in index.search(q, args.k, exact=True)} for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"{'mode':>12} {'recall@' + str(args.k):>10} {'ms/query':>10} {'speedup':>8}")
+    print(f"{'brute force':>12} {1.0:>10.3f} {exact_ms:>10.3f} {1.0:>8.1f}")
+
+    for nprobe in (1, 2, 4, 8, 16, 32):
+        start = time.perf_counter()
+        found = [{item_id for item_id, _ in index.search(q, args.k, nprobe=nprobe)} for q in queries]
+        ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = np.mean([len(f & t) / len(t) for f, t in zip(found, truth)])
+        print(f"{'nprobe=' + str(nprobe):>12} {recall:>10.3f} {ms:>10.3f} {exact_ms / ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
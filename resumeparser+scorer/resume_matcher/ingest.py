@@ -0,0 +1,296 @@
+"""Bulk ingestion: match every resume under the given directories or globs against a set of
+job descriptions, streaming one JSONL line per resume (job details go to <output>.jobs.json).
+
+Resumes are processed in batches. The next batch is read and parsed by the worker pool
+while the current one is analyzed and scored, so at most two batches are held in
+memory however many files there are. After every batch the output is flushed and a
+checkpoint (<output>.checkpoint.json) records the last finished file; rerunning the
+same command resumes after it. Files are visited in sorted path order, so files added
+later under a name that sorts before the checkpoint are not picked up by a resume.
+
+Run from resume_matcher/:
+    python ingest.py --jobs ../Data/JobDescription --resumes ../Data/Resumes '/data/cvs/**/*.pdf'
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import extraction, model_registry, scoring
+from app.analysis import analysis_current, extract_job_info, resume_analysis
+from app.document_cache import DocumentCache
+from app.feedback_generator import generate_feedback_batch
+from app.llm_cache import get_cache
+from app.matcher import (
+    combined_skill_extractor_batch, extract_additional_skills, matched_skills, score_components, skill_bits
+)
+from app.parser import is_supported
+
+STAGES = ("read", "parse", "analyze", "score", "feedback", "write")
+
+
+def expand(specs):
+    """Sorted, de-duplicated absolute paths of the supported files under directories or globs."""
+    paths = set()
+    for spec in specs:
+        if os.path.isdir(spec):
+            for root, _, names in os.walk(spec):
+                paths.update(os.path.join(root, name) for name in names if is_supported(name))
+        else:
+            paths.update(path for path in glob.glob(spec, recursive=True) if is_supported(path))
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def batches(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def load_batch(paths, document_cache, timings):
+    """Read a batch and parse the files the document cache doesn't already have.
+
+    Returns (path, sha256, text or None, cache entry or None) per file.
+    """
+    start = time.perf_counter()
+    blobs = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                blobs.append(f.read())
+        except OSError:
+            blobs.append(None)
+    hashes = [hashlib.sha256(blob).hexdigest() if blob is not None else None for blob in blobs]
+    entries = [document_cache.get(sha256) if sha256 else None for sha256 in hashes]
+    timings["read"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    missing = [i for i, (blob, entry) in enumerate(zip(blobs, entries)) if blob is not None and entry is None]
+    texts = [entry["text"] if entry else None for entry in entries]
+    for i, text in zip(missing, extraction.extract_texts(blobs[i] for i in missing)):
+        texts[i] = text
+    timings["parse"] += time.perf_counter() - start
+    return list(zip(paths, hashes, texts, entries))
+
+
+def load_jobs(paths, skill_index):
+    blobs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            blobs.append(f.read())
+    jobs = []
+    texts = []
+    for path, blob, text in zip(paths, blobs, extraction.extract_texts(blobs)):
+        if not text:
+            raise SystemExit(f"Could not extract text from job description {path}")
+        sha256 = hashlib.sha256(blob).hexdigest()
+        _, title, company = extract_job_info(text)
+        jobs.append({
+            "id": f"job-{sha256[:12]}",  # stable across reruns, so resumed output stays consistent
+            "fileName": os.path.basename(path),
+            "sha256": sha256,
+            "title": title,
+            "company": company,
+            "skills": extract_additional_skills(text, skill_index),
+        })
+        texts.append(text)
+    match_skill_sets = combined_skill_extractor_batch(texts, skill_index=skill_index)
+    return jobs, texts, match_skill_sets
+
+
+def error_line(path, sha256, error):
+    return {"path": path, "fileName": os.path.basename(path), "sha256": sha256, "processingError": True, "error": error}
+
+
+def process_batch(loaded, jobs, job_texts, job_match_skills, job_bits, skill_index, config, args, document_cache, timings):
+    """Analyze and score one parsed batch; returns one output record per file, in path order."""
+    start = time.perf_counter()
+    to_analyze = [text for _, _, text, entry in loaded if text and not analysis_current(entry, skill_index)]
+    fresh_skill_sets = iter(combined_skill_extractor_batch(to_analyze, skill_index=skill_index))
+
+    records = []
+    analyzed = []  # (record index, analysis)
+    for path, sha256, text, entry in loaded:
+        if sha256 is None:
+            records.append(error_line(path, None, "File could not be read"))
+            continue
+        if not text:
+            records.append(error_line(path, sha256, "No text could be extracted"))
+            continue
+        cache_hit = analysis_current(entry, skill_index)
+        analysis = entry
+        if not cache_hit:
+            match_skills = next(fresh_skill_sets)
+            try:
+                analysis = resume_analysis(text, match_skills, skill_index)
+            except Exception as e:
+                records.append(error_line(path, sha256, f"Analysis failed: {e}"))
+                continue
+            document_cache.put(sha256, analysis)
+        candidate_name = " ".join(part for part in (analysis["firstName"], analysis["lastName"]) if part)
+        records.append({
+            "path": path,
+            "fileName": os.path.basename(path),
+            "sha256": sha256,
+            "candidateName": candidate_name or os.path.basename(path),
+            "email": analysis["email"],
+            "skills": analysis["skills"],
+            "taxonomyVersion": analysis["taxonomyVersion"],
+            "cacheHit": cache_hit,
+        })
+        analyzed.append((len(records) - 1, analysis))
+    timings["analyze"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    feedback = []  # (match, feedback request), answered concurrently below
+    if analyzed:
+        skill_scores, semantic_similarities = score_components(
+            job_texts, [analysis["text"] for _, analysis in analyzed],
+            resume_skills=[analysis["matchSkills"] for _, analysis in analyzed], job_desc_skills=job_match_skills,
+            skill_index=skill_index
+        )
+        score_matrix = config.combine(skill_scores, semantic_similarities)
+        resume_bits = skill_bits((analysis["skills"] for _, analysis in analyzed), skill_index)
+        for row, (i, analysis) in enumerate(analyzed):
+            matches = []
+            for job, bits, score in zip(jobs, job_bits, score_matrix[row]):
+                score = float(score)
+                match = {
+                    "jobId": job["id"],
+                    "jobFileName": job["fileName"],
+                    "matchScore": score,
+                    "status": config.status(score),
+                    "matched_skills": matched_skills(resume_bits[row], bits, skill_index),
+                }
+                if args.feedback:
+                    feedback.append((match, (score, job["skills"], analysis["skills"])))
+                matches.append(match)
+            records[i]["matches"] = matches
+    timings["score"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    texts = generate_feedback_batch(request for _, request in feedback)
+    for (match, _), text in zip(feedback, texts):
+        match["feedback"] = text
+    timings["feedback"] += time.perf_counter() - start
+    return records
+
+
+def read_checkpoint(path, fingerprint):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint["fingerprint"] != fingerprint:
+        raise SystemExit(
+            f"{path} belongs to a run with different job descriptions or inputs; pass --restart to start over"
+        )
+    return checkpoint
+
+
+def write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", nargs="+", required=True, help="job description files, directories or globs")
+    parser.add_argument("--resumes", nargs="+", required=True, help="resume directories or globs")
+    parser.add_argument("--output", default=os.path.join("outputs", "matches.jsonl"))
+    parser.add_argument("--workers", type=int, default=extraction.PARSE_WORKERS, help="parsing processes")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--feedback", action="store_true",
+                        help="generate LLM feedback per resume and job (FEEDBACK_CONCURRENCY calls at a time)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint and overwrite the output")
+    args = parser.parse_args()
+
+    extraction.PARSE_WORKERS = args.workers
+    extraction.PARSE_POOL_MIN_FILES = min(extraction.PARSE_POOL_MIN_FILES, args.batch_size)
+    skill_index = model_registry.get_skill_index()
+    config = scoring.current()
+    document_cache = DocumentCache()
+
+    job_paths = expand(args.jobs)
+    if not job_paths:
+        raise SystemExit("No job description files found")
+    jobs, job_texts, job_match_skills = load_jobs(job_paths, skill_index)
+    job_bits = skill_bits((job["skills"] for job in jobs), skill_index)
+
+    fingerprint = hashlib.sha256(json.dumps({
+        "jobs": [job["sha256"] for job in jobs],
+        "resumes": sorted(os.path.abspath(spec) for spec in args.resumes),
+    }).encode("utf-8")).hexdigest()
+    checkpoint_path = f"{args.output}.checkpoint.json"
+    jobs_path = f"{args.output}.jobs.json"  # job details, referenced by jobId from every line
+    checkpoint = None if args.restart else read_checkpoint(checkpoint_path, fingerprint)
+
+    paths = expand(args.resumes)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    if checkpoint:
+        paths = [path for path in paths if path > checkpoint["lastPath"]]
+        # Drop anything written after the last checkpoint, e.g. a batch cut short by a crash
+        with open(args.output, "r+b") as f:
+            f.truncate(checkpoint["outputBytes"])
+        print(f"Resuming after {checkpoint['files']} files: {len(paths)} left")
+    else:
+        checkpoint = {"fingerprint": fingerprint, "files": 0, "errors": 0, "lastPath": "", "outputBytes": 0}
+        open(args.output, "wb").close()
+        write_json(jobs_path, jobs)
+    print(f"{len(paths)} resumes x {len(jobs)} job descriptions, {args.workers} parsing workers")
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    processed = 0
+    started = time.perf_counter()
+    pending = batches(paths, args.batch_size)
+    try:
+        with open(args.output, "a", encoding="utf-8") as output, ThreadPoolExecutor(max_workers=1) as prefetch:
+            batch = next(pending, None)
+            loading = prefetch.submit(load_batch, batch, document_cache, timings) if batch else None
+            while loading is not None:
+                loaded = loading.result()
+                batch = next(pending, None)
+                loading = prefetch.submit(load_batch, batch, document_cache, timings) if batch else None
+
+                records = process_batch(
+                    loaded, jobs, job_texts, job_match_skills, job_bits, skill_index, config, args,
+                    document_cache, timings
+                )
+
+                start = time.perf_counter()
+                for record in records:
+                    output.write(json.dumps(record) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+                checkpoint.update(
+                    files=checkpoint["files"] + len(records),
+                    errors=checkpoint["errors"] + sum(1 for record in records if record.get("processingError")),
+                    lastPath=loaded[-1][0],
+                    outputBytes=output.tell(),
+                )
+                write_json(checkpoint_path, checkpoint)
+                timings["write"] += time.perf_counter() - start
+
+                processed += len(records)
+                elapsed = time.perf_counter() - started
+                print(f"\r{processed}/{len(paths)} resumes, {processed / elapsed:.1f}/s", end="", flush=True)
+    finally:
+        extraction.shutdown()
+
+    elapsed = time.perf_counter() - started
+    print(f"\nProcessed {processed} resumes in {elapsed:.1f}s ({processed / max(elapsed, 1e-9):.1f}/s), "
+          f"{checkpoint['errors']} processing errors in total; results in {args.output}")
+    if args.feedback:
+        llm_stats = get_cache().stats()
+        print(f"LLM cache: {llm_stats['hits'] + llm_stats['diskHits']} hits, {llm_stats['misses']} misses")
+    for stage in STAGES:
+        # read and parse run in the prefetch thread, overlapping analyze and score
+        print(f"  {stage:>8} {timings[stage]:>8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
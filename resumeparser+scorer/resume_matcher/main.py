@@ -1,23 +1,38 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+from io import BytesIO
+import asyncio
+import json
 import os
-import shutil
-import re
+import threading
 import uuid
-import PyPDF2
-import spacy
 import time  # Added time import
 
-from app.parser import parse_resume
-from app.matcher import extract_additional_skills, calculate_match_score
-from app.feedback_generator import generate_feedback
-from app.utils import generate_unique_id
+import numpy as np
 
-# Load spaCy model for named entity recognition (NER)
-nlp = spacy.load("en_core_web_sm")
+from app.parser import extract_document_text, is_supported
+from app import model_registry, scoring
+from app.matcher import (
+    extract_additional_skills, score_components, combined_skill_extractor_batch, skill_bits, matched_skills
+)
+from app import feedback_generator
+from app.utils import generate_unique_id
+from app.analysis import extract_job_info, display_skills, resume_analysis, analysis_current
+from app.candidate_pool import CandidatePool
+from app.feature_store import FeatureStore
+from app.uploads import SpooledUpload, configure_spooling
+from app.document_cache import DocumentCache
+from app.match_queue import MatchQueue, MATCH_QUEUE_POLL_SECONDS
+from app import executors, extraction, llm_cache
+
+# Load models before the server forks workers so they share the weights copy-on-write.
+# Skipped in the parsing pool's spawned workers, which re-import this module as
+# __mp_main__ when the server is started with `python main.py`
+if model_registry.MODEL_LOAD_MODE == "import" and __name__ != "__mp_main__":
+    model_registry.preload()
 
 app = FastAPI(
     title="Resume Parser and Job Matcher API",
@@ -38,231 +53,881 @@ class MatchResult(BaseModel):
     success: bool
     jobMatches: List[Dict[str, Any]]
 
-TEMP_DIR = "temp_uploads"
-os.makedirs(TEMP_DIR, exist_ok=True)
-
-# Helper function to extract text from PDF
-def extract_text_from_pdf(pdf_path):
-    with open(pdf_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        text = "".join([page.extract_text() for page in reader.pages])
-    return text.strip()
-
-# Function to extract name, email from the resume text
-def extract_name_and_email(text):
-    name_pattern = r"(?:^|\n)\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:\n|$)"
-    email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-    
-    name_match = re.search(name_pattern, text)
-    email_match = re.search(email_pattern, text)
-
-    full_name = name_match.group(1).strip() if name_match else None
-    first_name, *last_name = full_name.split() if full_name else (None, None)
-    last_name = " ".join(last_name) if last_name else None
-    email = email_match.group(0) if email_match else None
-    
-    return first_name, last_name, email
-
-# Function to extract job info from job description using improved method
-def extract_job_info(job_description: str):
-    # Use timestamp-based ID format instead of UUID for consistency with desired output
-    job_id = f"resume-{int(time.time())}-{uuid.uuid4().hex[:6]}"
-
-    # Extract job title and company name with improved regex
-    title_match = re.search(r"(?i)(?:job\s*title|position)\s*[:\-]?\s*(.+)", job_description)
-    job_title = title_match.group(1).strip() if title_match else "Frontend Developer"
-
-    company_match = re.search(r"(?i)(?:company|organization|employer)\s*[:\-]?\s*(.+)", job_description)
-    company_name = company_match.group(1).strip() if company_match else "TechCorp"
-
-    # Use spaCy to improve extraction and handle fallback intelligently
-    if not job_title or len(job_title.split()) > 8 or job_title.lower().startswith("responsibilities"):
-        doc = nlp(job_description)
-        job_title = next((ent.text for ent in doc.ents if ent.label_ == "ORG" or ent.label_ == "JOB"), "Frontend Developer")
-    
-    if not company_name or len(company_name.split()) > 8 or company_name.lower().startswith("responsibilities"):
-        doc = nlp(job_description)
-        company_name = next((ent.text for ent in doc.ents if ent.label_ == "ORG"), "TechCorp")
-
-    return job_id, job_title, company_name
-
-# Process matching between resumes and job descriptions
-def process_match(job_description: str, resume_paths: List[str], resumes: List[UploadFile]):
-    job_id, job_title, company_name = extract_job_info(job_description)
-    job_skills = extract_additional_skills(job_description)
-    
-    results = []
+class ScoringUpdate(BaseModel):
+    skillWeight: Optional[float] = None
+    semanticWeight: Optional[float] = None
+    thresholds: Optional[List[Dict[str, Any]]] = None
+    belowStatus: Optional[str] = None
+
+# Shared stores, opened once per server (or match_worker.py) process. Like the preload, this
+# is skipped in the parsing pool's spawned workers, which only run the parsing functions
+if __name__ != "__mp_main__":
+    # Uploads are parsed straight from Starlette's spooled buffers: in memory up to
+    # UPLOAD_SPOOL_MAX_BYTES, in an anonymous temporary file above that
+    configure_spooling()
+
+    # Historical resume pool (uploads/resumes) for top-candidate retrieval
+    candidate_pool = CandidatePool()
+
+    # Stored document features and per-job score columns, for re-ranking without reprocessing
+    feature_store = FeatureStore()
+
+    # Extracted text, name, email and skills per uploaded file, keyed by the SHA-256 of its bytes
+    document_cache = DocumentCache()
+
+    # Durable queue behind /api/match/jobs
+    match_queue = MatchQueue()
+
+# Resumes per batch of /api/match/stream: small enough that the first results arrive within
+# seconds, large enough to keep the parsing pool busy
+MATCH_STREAM_BATCH = int(os.getenv("MATCH_STREAM_BATCH", str(max(4, extraction.PARSE_WORKERS))))
+
+# Threads in this process consuming the match queue; 0 leaves the work to separate
+# `python match_worker.py` processes sharing the database
+MATCH_QUEUE_WORKERS = int(os.getenv("MATCH_QUEUE_WORKERS", "1"))
+
+def warm_up():
+    if model_registry.MODEL_LOAD_MODE != "lazy":
+        model_registry.preload()
+    model_registry.start_taxonomy_watcher()
+    candidate_pool.sync()
+
+@app.on_event("startup")
+def start_warm_up():
+    # Load models and index new resumes in the background; /api/ready reports when done
+    threading.Thread(target=warm_up, daemon=True).start()
+    match_queue.start_workers(run_match_batch, MATCH_QUEUE_WORKERS)
+
+@app.on_event("shutdown")
+def stop_extraction_pool():
+    match_queue.stop_workers(wait=False)
+    extraction.shutdown()
+    executors.shutdown()
+
+# Result returned for a resume that could not be parsed or scored
+def processing_error_result(resume_id: str, file_name: str):
+    return {
+        "id": resume_id,
+        "fileName": file_name,
+        "candidateName": os.path.basename(file_name),
+        "status": "Processing Error",
+        "matchScore": 0,
+        "skills": [],
+        "processingError": True,
+        "feedback": "We couldn't analyze this file. Please check the format or try a different one."
+    }
+
+# Map a match percentage to the dashboard status label of the active scoring config
+def match_status(score: float, config: Optional[scoring.ScoringConfig] = None) -> str:
+    return (config or scoring.current()).status(score)
+
+# Name, email and display skills of a parsed resume, as kept in the feature store
+def resume_features(file_name: str, analysis: Dict[str, Any]):
+    candidate_name = f"{analysis['firstName']} {analysis['lastName']}".strip()
+
+    return {
+        "kind": "resume",
+        "fileName": file_name,
+        "candidateName": candidate_name or os.path.basename(file_name),
+        "email": analysis["email"],
+        "skills": analysis["skills"],
+        "matchSkills": analysis["matchSkills"],
+        "text": analysis["text"],
+        "taxonomyVersion": analysis["taxonomyVersion"],
+    }
+
+# Re-extract stored documents' skills under a new taxonomy (see FeatureStore.refresh_taxonomy)
+def reextract_skills(documents: List[Dict[str, Any]], skill_index):
+    match_skill_sets = combined_skill_extractor_batch([doc["text"] for doc in documents], skill_index=skill_index)
+    return [
+        {
+            **doc,
+            "skills": (
+                extract_additional_skills(doc["text"], skill_index) if doc.get("kind") == "job"
+                else sorted(display_skills(doc["text"], skill_index))
+            ),
+            "matchSkills": match_skills,
+        }
+        for doc, match_skills in zip(documents, match_skill_sets)
+    ]
+
+# Result entry for one scored resume
+def match_result(resume_id: str, features: Dict[str, Any], score: float, shared_skills: List[str],
+                 config: Optional[scoring.ScoringConfig] = None):
+    return {
+        "id": resume_id,
+        "fileName": features["fileName"],
+        "candidateName": features["candidateName"],
+        "email": features["email"],
+        "skills": features["skills"],
+        "status": match_status(score, config),
+        "matchScore": score,
+        "matched_skills": shared_skills,
+        "taxonomyVersion": features.get("taxonomyVersion"),
+    }
+
+# Text of an uploaded PDF or DOCX, read from its spooled buffer
+def upload_text(upload: SpooledUpload) -> str:
+    return extract_document_text(upload.file).strip()
+
+# Texts of many uploaded PDFs or DOCX files, extracted in parallel by the parsing pool; None for files that fail
+async def upload_texts(uploads: List[SpooledUpload]) -> List[Optional[str]]:
+    return await extraction.extract_texts_async(upload.read() for upload in uploads)
+
+# Document cache entries and texts of many uploads; only cache misses are parsed, and
+# their text is cached straight away
+async def cached_upload_texts(uploads: List[SpooledUpload]):
+    entries = await executors.run_io(document_cache.get_many, [upload.sha256 for upload in uploads])
+    texts = [entry["text"] if entry else None for entry in entries]
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    for i, text in zip(missing, await upload_texts([uploads[i] for i in missing])):
+        texts[i] = text
+        if text is not None:
+            await executors.run_io(document_cache.put, uploads[i].sha256, {"text": text})
+    return entries, texts
+
+# Blocking counterpart of cached_upload_texts, for callers off the event loop
+def cached_texts(uploads: List[SpooledUpload]):
+    entries = document_cache.get_many(upload.sha256 for upload in uploads)
+    texts = [entry["text"] if entry else None for entry in entries]
+    missing = [i for i, entry in enumerate(entries) if entry is None]
+    for i, text in zip(missing, extraction.extract_texts(uploads[i].read() for i in missing)):
+        texts[i] = text
+        if text is not None:
+            document_cache.put(uploads[i].sha256, {"text": text})
+    return entries, texts
+
+# Drop repeated file names, keeping the first upload of each
+def unique_uploads(uploads: List[SpooledUpload]) -> List[SpooledUpload]:
+    first = {}
+    for upload in uploads:
+        first.setdefault(upload.filename, upload)
+    return list(first.values())
+
+# Analyze each job description once: details, display skills and spaCy match skills
+def analyze_jobs(job_descriptions: List[str], skill_index):
+    jobs = []
+    for job_description in job_descriptions:
+        job_id, job_title, company_name = extract_job_info(job_description)
+        jobs.append({
+            "id": job_id,
+            "title": job_title,
+            "company": company_name,
+            "skills": extract_additional_skills(job_description, skill_index),
+            "text": job_description,
+            # Stored with queued jobs, whose results are read back after later taxonomy reloads
+            "taxonomyVersion": skill_index.version,
+        })
+    match_skill_sets = combined_skill_extractor_batch(job_descriptions, skill_index=skill_index)
+    for job, match_skills in zip(jobs, match_skill_sets):
+        job["matchSkills"] = match_skills
+    return jobs
+
+# Job header returned with each job's results
+def job_details(job: Dict[str, Any]):
+    return {"id": job["id"], "title": job["title"], "company": job["company"], "taxonomyVersion": job.get("taxonomyVersion")}
+
+# Give every resume an id, skipping repeated file names.
+# Returns (resume, resume_id, resume_text or None, cache entry or None), in upload order
+def assign_resume_ids(resumes: List[SpooledUpload], resume_texts: List[Optional[str]],
+                      cached: List[Optional[Dict[str, Any]]]):
     processed_files = set()  # To avoid duplicate processing
+    parsed = []
 
-    for resume, resume_path in zip(resumes, resume_paths):
+    for resume, resume_text, entry in zip(resumes, resume_texts, cached):
         # Skip if this file was already processed (avoid duplicates)
         if resume.filename in processed_files:
             continue
         
         processed_files.add(resume.filename)
         resume_id = f"resume-{int(time.time())}-{uuid.uuid4().hex[:6]}"  # Match the desired ID format
-
+        parsed.append((resume, resume_id, resume_text, entry))
+    return parsed
+
+# Analyze a batch of parsed resumes and score it against every job. Resumes analyzed before
+# under this taxonomy skip straight to scoring; the rest go through spaCy in one batched pass.
+# Returns per resume {"resume", "id", "features" (None if it couldn't be analyzed), "skill",
+# "semantic", "results"}, with one result per job and no feedback yet
+def score_resumes(parsed, jobs: List[Dict[str, Any]], skill_index, config: scoring.ScoringConfig):
+    to_analyze = [
+        resume_text for _, _, resume_text, entry in parsed
+        if resume_text is not None and not analysis_current(entry, skill_index)
+    ]
+    fresh_skill_sets = iter(combined_skill_extractor_batch(to_analyze, skill_index=skill_index))
+
+    analyzed = []  # (resume, resume_id, features or None, cache hit), in upload order
+    for resume, resume_id, resume_text, entry in parsed:
+        features = None
+        cache_hit = resume_text is not None and analysis_current(entry, skill_index)
         try:
-            resume_text = extract_text_from_pdf(resume_path)
-            first_name, last_name, email = extract_name_and_email(resume_text)
-            candidate_name = f"{first_name} {last_name}".strip()
-
-            resume_skills = extract_additional_skills(resume_text)
-            if isinstance(resume_skills, str):
-                resume_skills = [s.strip() for s in resume_skills.split(',') if s.strip()]
-            resume_skills = [s for s in resume_skills if s.lower() != "skills"]
-
-            score = float(calculate_match_score(resume_text, job_description))
-
-            # For consistent response format with provided example, don't round the score
-            
-            # Sort matched skills alphabetically for consistency
-            matched_skills = sorted(list(set(resume_skills) & set(job_skills)))
-
+            if cache_hit:
+                features = resume_features(resume.filename, entry)
+            elif resume_text is not None:
+                analysis = resume_analysis(resume_text, next(fresh_skill_sets), skill_index)
+                document_cache.put(resume.sha256, analysis)
+                features = resume_features(resume.filename, analysis)
+        except Exception:
+            features = None
+        analyzed.append((resume, resume_id, features, cache_hit))
+
+    # Embed each document once and score all resumes against all jobs in one matrix op
+    documents = [features for _, _, features, _ in analyzed if features is not None]
+    skill_scores, semantic_similarities = score_components(
+        [job["text"] for job in jobs], [features["text"] for features in documents],
+        resume_skills=[features["matchSkills"] for features in documents],
+        job_desc_skills=[job["matchSkills"] for job in jobs], skill_index=skill_index
+    )
+    score_matrix = config.combine(skill_scores, semantic_similarities)
+
+    # Display skills as vocabulary bitsets; matched_skills is a bitwise AND against each job
+    job_skill_bits = skill_bits((job["skills"] for job in jobs), skill_index)
+
+    scored = []
+    row = -1
+    for resume, resume_id, features, cache_hit in analyzed:
+        entry = {"resume": resume, "id": resume_id, "features": features}
+        if features is not None:
+            row += 1
             try:
-                feedback = generate_feedback(score, job_skills, resume_skills)
-            except:
-                feedback = f"The candidate has a strong foundation..."
-
-            results.append({
-                "id": resume_id,
-                "fileName": resume.filename,
-                "candidateName": candidate_name or os.path.basename(resume.filename),
-                "email": email,
-                "skills": sorted(resume_skills),  # Sort for consistency
-                "status": (
-                    "Excellent Match" if score >= 85 else
-                    "Matched" if score >=70 and score <=84 else
-                    "Potential" if score >= 50 and score <=69 else
-                    "Needs Review" if score >=30 and score <= 49 else
-                    "Not Qualified"
-                ),
-                "matchScore": score,
-                "matched_skills": matched_skills,
-                "feedback": feedback
+                resume_skill_bits = skill_bits([features["skills"]], skill_index)[0]
+                results = []
+                for job_bits, score in zip(job_skill_bits, score_matrix[row]):
+                    # For consistent response format with provided example, don't round the score
+                    result = match_result(
+                        resume_id, features, float(score), matched_skills(resume_skill_bits, job_bits, skill_index),
+                        config
+                    )
+                    result["cacheHit"] = cache_hit
+                    results.append(result)
+                entry.update(skill=skill_scores[row], semantic=semantic_similarities[row], results=results)
+            except Exception:
+                entry["features"] = None
+        if entry["features"] is None:
+            entry["results"] = [processing_error_result(resume_id, resume.filename) for _ in jobs]
+        scored.append(entry)
+    return scored
+
+# (scored entry, job, result) of every result that gets LLM feedback, with its feedback request
+def feedback_targets(jobs: List[Dict[str, Any]], scored: List[Dict[str, Any]]):
+    targets = [
+        (entry, job, result)
+        for entry in scored if entry["features"] is not None
+        for job, result in zip(jobs, entry["results"])
+    ]
+    requests = [(result["matchScore"], job["skills"], entry["features"]["skills"]) for entry, job, result in targets]
+    return targets, requests
+
+# Fill in LLM feedback for every scored result; the calls run concurrently, see feedback_generator
+def add_feedback(jobs: List[Dict[str, Any]], scored: List[Dict[str, Any]]):
+    targets, requests = feedback_targets(jobs, scored)
+    for (_, _, result), feedback in zip(targets, feedback_generator.generate_feedback_batch(requests)):
+        result["feedback"] = feedback
+
+# Persist features and score components so results can be re-ranked without reprocessing, and
+# keep the historical candidate pool and job registry up to date for top-candidates queries
+def store_matches(jobs: List[Dict[str, Any]], scored: List[Dict[str, Any]], skill_index):
+    stored = [entry for entry in scored if entry["features"] is not None]
+    try:
+        for entry in stored:
+            feature_store.put(entry["id"], {
+                **entry["features"], "sha256": entry["resume"].sha256, "jobs": [job["id"] for job in jobs]
             })
-
-        except Exception as e:
-            results.append({
-                "id": resume_id,
-                "fileName": resume.filename,
-                "candidateName": os.path.basename(resume.filename),
-                "status": "Processing Error",
-                "matchScore": 0,
-                "skills": [],
-                "processingError": True,
-                "feedback": "We couldn't analyze this file. Please check the format or try a different one."
+        for col, job in enumerate(jobs):
+            feature_store.put(job["id"], {
+                "kind": "job", "title": job["title"], "company": job["company"], "skills": job["skills"],
+                "matchSkills": job["matchSkills"], "text": job["text"], "taxonomyVersion": skill_index.version,
             })
+            feature_store.set_scores(
+                job["id"], [entry["id"] for entry in stored],
+                np.array([entry["skill"][col] for entry in stored], dtype=np.float32),
+                np.array([entry["semantic"][col] for entry in stored], dtype=np.float32), skill_index.version
+            )
+    except Exception as e:
+        print(f"Failed to update feature store: {e}")
 
-    # Removed the line that was duplicating entries
+    try:
+        for job in jobs:
+            candidate_pool.register_job(
+                job["id"], job["title"], job["company"], job["text"], job["skills"], job["matchSkills"]
+            )
+        candidate_pool.add_documents([
+            {
+                "fileName": entry["resume"].filename,
+                "sha256": entry["resume"].sha256,
+                "text": entry["features"]["text"],
+                "skills": entry["features"]["skills"],
+                "matchSkills": entry["features"]["matchSkills"],
+                "taxonomyVersion": skill_index.version,
+            }
+            for entry in stored
+        ])
+    except Exception as e:
+        print(f"Failed to update candidate pool: {e}")
 
-    return {
-        "success": True,
-        "jobDetails": {
-            "id": job_id,
-            "title": job_title,
-            "company": company_name
-        },
-        "results": results
-    }
+# Validate a match request's files and wrap them as spooled uploads.
+# Returns (job description uploads, resume uploads without repeated file names)
+def match_uploads(job_description_pdf: Optional[UploadFile], job_description_pdfs: Optional[List[UploadFile]],
+                  resumes: List[UploadFile]):
+    if not resumes or len(resumes) == 0:
+        raise HTTPException(status_code=400, detail="At least one resume is required.")
 
-# Function to save the uploaded file temporarily
-async def save_upload_file_temp(upload_file: UploadFile) -> str:
-    temp_file = os.path.join(TEMP_DIR, f"{uuid.uuid4()}_{upload_file.filename}")
-    with open(temp_file, "wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
-    return temp_file
+    job_description_files = ([job_description_pdf] if job_description_pdf else []) + (job_description_pdfs or [])
+    if not job_description_files:
+        raise HTTPException(status_code=400, detail="At least one job description is required.")
 
-# Cleanup temp files
-def cleanup_temp_files(paths: List[str]):
-    for path in paths:
-        try:
-            if os.path.exists(path):
-                os.remove(path)
-        except Exception as e:
-            print(f"Failed to delete temp file {path}: {e}")
+    resume_uploads = unique_uploads([
+        SpooledUpload.from_upload(resume) for resume in resumes if is_supported(resume.filename)
+    ])
+    if not resume_uploads:
+        raise HTTPException(status_code=400, detail="No valid PDF or DOCX resume files provided.")
+    return [SpooledUpload.from_upload(file) for file in job_description_files], resume_uploads
 
-# API endpoint to match resumes to a job
+# API endpoint to match resumes to one job, or to several jobs via job_description_pdfs
 @app.post("/api/match", response_model=MatchResult)
 async def match_resumes_to_job(
-    background_tasks: BackgroundTasks,
-    job_description_pdf: UploadFile = File(...),
+    job_description_pdf: Optional[UploadFile] = File(None),
+    job_description_pdfs: Optional[List[UploadFile]] = File(None),
     resumes: List[UploadFile] = File(...)
 ):
-    if not resumes or len(resumes) == 0:
-        raise HTTPException(status_code=400, detail="At least one resume is required.")
-    
-    temp_files = []
     try:
-        # Save job description PDF temporarily
-        job_description_path = await save_upload_file_temp(job_description_pdf)
-        temp_files.append(job_description_path)
-        
-        resume_paths = []
-        for resume in resumes:
-            if not resume.filename.lower().endswith('.pdf'):
-                continue
-            resume_path = await save_upload_file_temp(resume)
-            resume_paths.append(resume_path)
-            temp_files.append(resume_path)
-        
-        if not resume_paths:
-            raise HTTPException(status_code=400, detail="No valid PDF resume files provided.")
-        
-        # Extract job description text
-        job_description_text = extract_text_from_pdf(job_description_path)
-
-        # Process job matching - Fixed to pass both resume_paths and resumes
-        match_result = process_match(job_description_text, resume_paths, resumes)
-
-        background_tasks.add_task(cleanup_temp_files, temp_files)
+        job_description_uploads, resume_uploads = match_uploads(job_description_pdf, job_description_pdfs, resumes)
+        _, job_description_texts = await cached_upload_texts(job_description_uploads)
+        for upload, text in zip(job_description_uploads, job_description_texts):
+            if text is None:
+                raise HTTPException(status_code=500, detail=f"Could not extract text from {upload.filename}.")
+
+        # Same batched pipeline as /api/match/stream: every blocking stage runs on the executors,
+        # in batches, so other requests are served between them
+        job_matches = {}
+        async for event in match_events(job_description_texts, resume_uploads):
+            if event["event"] == "jobDetails":
+                job_matches[event["jobDetails"]["id"]] = {
+                    "success": True, "jobDetails": event["jobDetails"], "results": []
+                }
+            elif event["event"] == "result":
+                # Feedback is filled into the same result dict by a later event
+                job_matches[event["jobId"]]["results"].append(event["result"])
+            elif event["event"] == "error":
+                raise HTTPException(status_code=500, detail=event["detail"])
 
         return {
             "success": True,
-            "jobMatches": [match_result]
+            "jobMatches": list(job_matches.values())
         }
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Events of a streamed match, in order: a "jobDetails" event per job, a "result" event per
+# resume and job as soon as its batch is scored, then a "feedback" event per scored result,
+# and "done" (or "error" if the match fails midway)
+async def match_events(job_description_texts: List[str], resume_uploads: List[SpooledUpload]):
+    # Feedback for a batch is requested as soon as it is scored and overlaps scoring the next
+    # ones; one client and concurrency limit are shared by all batches of the request
+    feedback_client = None
+    feedback_tasks = []  # (targets, task) per scored batch
+    parsing = None
+    try:
+        skill_index = model_registry.get_skill_index()
+        config = scoring.current()
+        jobs = await executors.run_cpu(analyze_jobs, job_description_texts, skill_index)
+        for job in jobs:
+            yield {"event": "jobDetails", "jobDetails": job_details(job)}
+
+        # Parse the next batch in the extraction pool while the current one is scored
+        batches = [
+            resume_uploads[start:start + MATCH_STREAM_BATCH]
+            for start in range(0, len(resume_uploads), MATCH_STREAM_BATCH)
+        ]
+        scored = []
+        feedback_client = feedback_generator.new_async_client()
+        feedback_limit = asyncio.Semaphore(feedback_generator.FEEDBACK_CONCURRENCY)
+        parsing = asyncio.ensure_future(cached_upload_texts(batches[0]))
+        for i, batch in enumerate(batches):
+            cached, texts = await parsing
+            if i + 1 < len(batches):
+                parsing = asyncio.ensure_future(cached_upload_texts(batches[i + 1]))
+            batch_scored = await executors.run_cpu(
+                score_resumes, assign_resume_ids(batch, texts, cached), jobs, skill_index, config
+            )
+            for entry in batch_scored:
+                for job, result in zip(jobs, entry["results"]):
+                    yield {"event": "result", "jobId": job["id"], "result": result}
+            scored.extend(batch_scored)
+            targets, requests = feedback_targets(jobs, batch_scored)
+            feedback_tasks.append((targets, asyncio.ensure_future(
+                feedback_generator.generate_feedback_batch_async(requests, feedback_client, feedback_limit)
+            )))
+
+        for targets, task in feedback_tasks:
+            for (entry, job, result), feedback in zip(targets, await task):
+                result["feedback"] = feedback
+                yield {"event": "feedback", "jobId": job["id"], "resumeId": entry["id"], "feedback": feedback}
+
+        await executors.run_cpu(store_matches, jobs, scored, skill_index)
+        yield {"event": "done", "success": True, "resumes": len(scored)}
+    except Exception as e:
+        yield {"event": "error", "success": False, "detail": str(e)}
+    finally:
+        if parsing is not None:
+            parsing.cancel()
+        for _, task in feedback_tasks:
+            task.cancel()
+        if feedback_client is not None:
+            await feedback_client.close()
+
+# Serialize stream events as NDJSON lines or as server-sent events
+async def encode_events(events, sse: bool):
+    async for event in events:
+        if sse:
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        else:
+            yield json.dumps(event) + "\n"
+
+# Streaming variant of /api/match: NDJSON by default, server-sent events with ?format=sse or
+# an Accept: text/event-stream header. Results arrive batch by batch instead of all at the end
+@app.post("/api/match/stream")
+async def stream_match(
+    request: Request,
+    format: Optional[str] = None,
+    job_description_pdf: Optional[UploadFile] = File(None),
+    job_description_pdfs: Optional[List[UploadFile]] = File(None),
+    resumes: List[UploadFile] = File(...)
+):
+    try:
+        job_description_uploads, resume_uploads = match_uploads(job_description_pdf, job_description_pdfs, resumes)
+        _, job_description_texts = await cached_upload_texts(job_description_uploads)
+        for upload, text in zip(job_description_uploads, job_description_texts):
+            if text is None:
+                raise HTTPException(status_code=500, detail=f"Could not extract text from {upload.filename}.")
+    except HTTPException:
+        raise
     except Exception as e:
-        cleanup_temp_files(temp_files)
         raise HTTPException(status_code=500, detail=str(e))
 
+    sse = format == "sse" or "text/event-stream" in request.headers.get("accept", "")
+    return StreamingResponse(
+        encode_events(match_events(job_description_texts, resume_uploads), sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Score one batch claimed from the match queue; returns each item's per-job results, feedback included
+def run_match_batch(job: Dict[str, Any], items: List[Dict[str, Any]]):
+    skill_index = model_registry.get_skill_index()
+    # Job descriptions are analyzed by the first batch and reused by the rest
+    jobs = job["jobs"] or match_queue.set_jobs(job["id"], analyze_jobs(job["jobDescriptions"], skill_index))
+
+    uploads = [SpooledUpload(item["fileName"], BytesIO(item["blob"]), item["sha256"]) for item in items]
+    cached, texts = cached_texts(uploads)
+    parsed = [
+        (upload, item["resumeId"], text, entry) for upload, item, text, entry in zip(uploads, items, texts, cached)
+    ]
+    scored = score_resumes(parsed, jobs, skill_index, scoring.current())
+    add_feedback(jobs, scored)
+    store_matches(jobs, scored, skill_index)
+    return [entry["results"] for entry in scored]
+
+# Per-job results of a finished queue item; resumes the queue gave up on count as processing errors
+def queued_item_results(item: Dict[str, Any], jobs: List[Dict[str, Any]]):
+    return item["results"] or [processing_error_result(item["resumeId"], item["fileName"]) for _ in jobs]
+
+# Why a finished queue job has no analyzed job descriptions: analyzing them failed on every
+# attempt, so its items were given up without any resume being scored
+def job_analysis_error(items: List[Dict[str, Any]]):
+    errors = [item["error"] for item in items if item["error"]]
+    return "The job descriptions could not be analyzed" + (f": {errors[-1]}" if errors else ".")
+
+# Progress of a queued match job, without its internal state
+def match_job_status(job: Dict[str, Any]):
+    return {
+        "jobId": job["id"],
+        "status": job["status"],
+        "total": job["total"],
+        "completed": job["completed"],
+        "failed": job["failed"],
+        "pending": job["pending"],
+        "jobDetails": [job_details(entry) for entry in job["jobs"] or []],
+        "createdAt": job["createdAt"],
+        "updatedAt": job["updatedAt"],
+    }
+
+async def get_match_job(job_id: str):
+    job = await executors.run_io(match_queue.job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown match job {job_id}.")
+    return job
+
+# API endpoint to enqueue a match; the work survives client disconnects and server restarts
+@app.post("/api/match/jobs", status_code=202)
+async def submit_match_job(
+    job_description_pdf: Optional[UploadFile] = File(None),
+    job_description_pdfs: Optional[List[UploadFile]] = File(None),
+    resumes: List[UploadFile] = File(...)
+):
+    try:
+        job_description_uploads, resume_uploads = match_uploads(job_description_pdf, job_description_pdfs, resumes)
+        _, job_description_texts = await cached_upload_texts(job_description_uploads)
+        for upload, text in zip(job_description_uploads, job_description_texts):
+            if text is None:
+                raise HTTPException(status_code=500, detail=f"Could not extract text from {upload.filename}.")
+
+        job_id = await executors.run_io(match_queue.submit, job_description_texts, [
+            (generate_unique_id(), upload.filename, upload.sha256, upload.read()) for upload in resume_uploads
+        ])
+        return {"success": True, **match_job_status(await executors.run_io(match_queue.job, job_id))}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Progress of a queued match
+@app.get("/api/match/jobs/{job_id}")
+async def match_job_progress(job_id: str):
+    return match_job_status(await get_match_job(job_id))
+
+# Final MatchResult of a queued match; 202 with its progress while it is still running
+@app.get("/api/match/jobs/{job_id}/result")
+async def match_job_result(job_id: str):
+    job = await get_match_job(job_id)
+    if job["status"] != "done":
+        return JSONResponse(status_code=202, content=match_job_status(job))
+
+    items = await executors.run_io(match_queue.finished_items, job_id)
+    if not job["jobs"]:
+        return {
+            "success": False,
+            "detail": job_analysis_error(items),
+            "jobMatches": [],
+            "processingErrors": [processing_error_result(item["resumeId"], item["fileName"]) for item in items]
+        }
+    return {
+        "success": True,
+        "jobMatches": [
+            {
+                "success": True,
+                "jobDetails": job_details(job_entry),
+                "results": [queued_item_results(item, job["jobs"])[col] for item in items]
+            }
+            for col, job_entry in enumerate(job["jobs"])
+        ]
+    }
+
+# Events of a queued match as its items finish: "jobDetails" per job, then "result" per resume
+# and job (feedback included), then "done", or "error" if the job descriptions could not be
+# analyzed. Finished items are replayed, so clients can reconnect
+async def match_job_events(job_id: str):
+    jobs = None
+    last_seq = -1
+    while True:
+        job = await executors.run_io(match_queue.job, job_id)
+        if jobs is None and job["jobs"]:
+            jobs = job["jobs"]
+            for job_entry in jobs:
+                yield {"event": "jobDetails", "jobDetails": job_details(job_entry)}
+        if jobs is not None:
+            for item in await executors.run_io(match_queue.finished_items, job_id, last_seq):
+                for job_entry, result in zip(jobs, queued_item_results(item, jobs)):
+                    yield {"event": "result", "jobId": job_entry["id"], "result": result}
+                last_seq = item["seq"]
+        if job["status"] == "done":
+            if jobs is None:
+                items = await executors.run_io(match_queue.finished_items, job_id)
+                yield {"event": "error", "success": False, "detail": job_analysis_error(items)}
+                return
+            yield {"event": "done", "success": True, "resumes": job["total"], "failed": job["failed"]}
+            return
+        await asyncio.sleep(MATCH_QUEUE_POLL_SECONDS)
+
+# Stream a queued match's results as NDJSON, or server-sent events with ?format=sse
+@app.get("/api/match/jobs/{job_id}/stream")
+async def stream_match_job(job_id: str, request: Request, format: Optional[str] = None):
+    await get_match_job(job_id)
+    sse = format == "sse" or "text/event-stream" in request.headers.get("accept", "")
+    return StreamingResponse(
+        encode_events(match_job_events(job_id), sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Display analysis of one upload from the document cache, computed and cached on a miss.
+# Returns (analysis, cache hit)
+def cached_analysis(upload: SpooledUpload, skill_index):
+    entry = document_cache.get(upload.sha256)
+    cache_hit = analysis_current(entry, skill_index, need_match_skills=False)
+    if not cache_hit:
+        resume_text = entry["text"] if entry else upload_text(upload)
+        # Keep match skills from an earlier analysis of the same text; they are re-extracted if stale
+        match_skills = entry.get("matchSkills") if entry and entry.get("taxonomyVersion") == skill_index.version else None
+        entry = resume_analysis(resume_text, match_skills, skill_index)
+        document_cache.put(upload.sha256, entry)
+    return entry, cache_hit
+
 # API endpoint to parse a single resume
 @app.post("/api/parse-resume")
 async def parse_single_resume(
-    background_tasks: BackgroundTasks,
     resume: UploadFile = File(...)
 ):
-    if not resume.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Resume must be a PDF.")
+    if not is_supported(resume.filename):
+        raise HTTPException(status_code=400, detail="Resume must be a PDF or DOCX file.")
 
-    temp_file = None
     try:
-        temp_file = await save_upload_file_temp(resume)
-        resume_text = extract_text_from_pdf(temp_file)
-        first_name, last_name, email = extract_name_and_email(resume_text)
-        skills = extract_additional_skills(resume_text)
-
-        if isinstance(skills, str):
-            skills = [s.strip() for s in skills.split(',') if s.strip()]
-        skills = [s for s in skills if s.lower() != "skills"]
+        upload = SpooledUpload.from_upload(resume)
+        skill_index = model_registry.get_skill_index()
+        entry, cache_hit = await executors.run_cpu(cached_analysis, upload, skill_index)
 
-        result = {
+        return {
             "success": True,
             "fileName": resume.filename,
-            "firstName": first_name,
-            "lastName": last_name,
-            "email": email,
-            "skills": skills
+            "firstName": entry["firstName"],
+            "lastName": entry["lastName"],
+            "email": entry["email"],
+            "skills": entry["skills"],
+            "taxonomyVersion": skill_index.version,
+            "cacheHit": cache_hit
         }
 
-        background_tasks.add_task(cleanup_temp_files, [temp_file])
-        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# API endpoint to retrieve the best candidates for a processed job from the whole resume pool
+@app.get("/api/jobs/{job_id}/top-candidates")
+async def top_candidates(job_id: str, k: int = 10):
+    if await executors.run_io(candidate_pool.job, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k must be at least 1.")
+    return await executors.run_cpu(top_candidate_results, job_id, k)
+
+# Best pool candidates for a registered job; syncs the pool directory first
+def top_candidate_results(job_id: str, k: int):
+    candidate_pool.sync()
+    job = candidate_pool.job(job_id)
+    skill_index = model_registry.get_skill_index()
+    job_bits = skill_bits([job["skills"]], skill_index)[0]
+    ranked = candidate_pool.top_candidates(job_id, k)
+    candidate_bits = skill_bits((candidate["skills"] for _, candidate, _ in ranked), skill_index)
+
+    return {
+        "success": True,
+        "jobDetails": {
+            "id": job_id,
+            "title": job["title"],
+            "company": job["company"],
+            "taxonomyVersion": skill_index.version
+        },
+        "results": [
+            {
+                "id": resume_id,
+                "fileName": candidate["fileName"],
+                "candidateName": candidate["candidateName"] or os.path.basename(candidate["fileName"]),
+                "email": candidate["email"],
+                "skills": candidate["skills"],
+                "status": match_status(score),
+                "matchScore": score,
+                "matched_skills": matched_skills(bits, job_bits, skill_index),
+                "taxonomyVersion": candidate.get("taxonomyVersion")
+            }
+            for (resume_id, candidate, score), bits in zip(ranked, candidate_bits)
+        ]
+    }
+
+# Stored results of a job re-ranked from its materialized score column
+# Documents extracted under an older taxonomy version are refreshed first
+def ranked_job_results(job_id: str, config: scoring.ScoringConfig):
+    skill_index = model_registry.get_skill_index()
+    feature_store.refresh_taxonomy(job_id, lambda documents: reextract_skills(documents, skill_index), skill_index)
+
+    job = feature_store.summary(job_id)
+    ranked = feature_store.ranking(job_id, config)
+    job_bits = skill_bits([job["skills"]], skill_index)[0]
+    resume_bits = skill_bits((features["skills"] for _, features, _ in ranked), skill_index)
+    return {
+        "success": True,
+        "jobDetails": {
+            "id": job_id,
+            "title": job["title"],
+            "company": job["company"],
+            "taxonomyVersion": skill_index.version
+        },
+        "scoring": config.to_dict(),
+        "results": [
+            match_result(resume_id, features, score, matched_skills(bits, job_bits, skill_index), config)
+            for (resume_id, features, score), bits in zip(ranked, resume_bits)
+        ]
+    }
+
+async def get_stored_job(job_id: str):
+    job = await executors.run_io(feature_store.summary, job_id)
+    if job is None or job.get("kind") != "job":
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+# File name -> resume id of the resumes already stored for a job
+def stored_resume_files(job_id: str):
+    column = feature_store.column(job_id)
+    existing = {}
+    for resume_id in (column["ids"] if column else []):
+        features = feature_store.summary(resume_id)
+        if features is None:
+            raise HTTPException(status_code=404, detail=f"Resume {resume_id} of job {job_id} not found.")
+        existing[features["fileName"]] = resume_id
+    return existing
+
+# API endpoints to read and change the score weights and status thresholds
+@app.get("/api/scoring")
+async def get_scoring():
+    return scoring.current().to_dict()
+
+@app.put("/api/scoring")
+async def update_scoring(update: ScoringUpdate):
+    try:
+        config = scoring.current().replace(**update.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return scoring.update(config).to_dict()
+
+# API endpoint to re-rank a job's stored results; weights can be overridden per request
+@app.get("/api/jobs/{job_id}/results")
+async def job_results(job_id: str, skill_weight: Optional[float] = None, semantic_weight: Optional[float] = None):
+    await get_stored_job(job_id)
+    try:
+        config = scoring.current().replace(skillWeight=skill_weight, semanticWeight=semantic_weight)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await executors.run_cpu(ranked_job_results, job_id, config)
+
+# API endpoint to replace a job's description; only that job's score column is recomputed
+@app.put("/api/jobs/{job_id}/description")
+async def update_job_description(
+    job_id: str,
+    job_description_pdf: UploadFile = File(...)
+):
+    job = await get_stored_job(job_id)
+    try:
+        upload = SpooledUpload.from_upload(job_description_pdf)
+        return await executors.run_cpu(replace_job_description, job_id, job, upload)
 
     except Exception as e:
-        if temp_file and os.path.exists(temp_file):
-            os.remove(temp_file)
         raise HTTPException(status_code=500, detail=str(e))
 
+def replace_job_description(job_id: str, job: Dict[str, Any], upload: SpooledUpload):
+    job_description = upload_text(upload)
+    _, job_title, company_name = extract_job_info(job_description)
+    skill_index = model_registry.get_skill_index()
+    job_skills = extract_additional_skills(job_description, skill_index)
+    job_match_skills = combined_skill_extractor_batch([job_description], skill_index=skill_index)[0]
+
+    feature_store.update_job(job_id, {
+        **job, "title": job_title, "company": company_name, "skills": job_skills,
+        "matchSkills": job_match_skills, "text": job_description,
+    }, skill_index)
+    candidate_pool.register_job(job_id, job_title, company_name, job_description, job_skills, job_match_skills)
+    return ranked_job_results(job_id, scoring.current())
+
+# API endpoint to add resumes to a job, or replace ones with the same file name; only their rows are scored
+@app.post("/api/jobs/{job_id}/resumes")
+async def add_job_resumes(
+    job_id: str,
+    resumes: List[UploadFile] = File(...)
+):
+    await get_stored_job(job_id)
+    resumes = [resume for resume in resumes if is_supported(resume.filename)]
+    if not resumes:
+        raise HTTPException(status_code=400, detail="No valid PDF or DOCX resume files provided.")
+
+    existing = await executors.run_io(stored_resume_files, job_id)
+
+    try:
+        uploads = unique_uploads([SpooledUpload.from_upload(resume) for resume in resumes])
+        parsed = []  # (upload, text, cache entry) of the resumes that could be parsed
+        processing_errors = []
+        cached, texts = await cached_upload_texts(uploads)
+        for upload, resume_text, entry in zip(uploads, texts, cached):
+            if resume_text is None:
+                resume_id = existing.get(upload.filename) or generate_unique_id()
+                processing_errors.append(processing_error_result(resume_id, upload.filename))
+            else:
+                parsed.append((upload, resume_text, entry))
+
+        results = await executors.run_cpu(store_job_resumes, job_id, parsed, existing)
+        return {**results, "processingErrors": processing_errors}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Analyze parsed (upload, text, cache entry) resumes, score them against one job and return its ranking
+def store_job_resumes(job_id: str, parsed, existing: Dict[str, str]):
+    skill_index = model_registry.get_skill_index()
+    to_analyze = [
+        resume_text for _, resume_text, entry in parsed if not analysis_current(entry, skill_index)
+    ]
+    fresh_skill_sets = iter(combined_skill_extractor_batch(to_analyze, skill_index=skill_index))
+    for upload, resume_text, entry in parsed:
+        if not analysis_current(entry, skill_index):
+            entry = resume_analysis(resume_text, next(fresh_skill_sets), skill_index)
+            document_cache.put(upload.sha256, entry)
+        resume_id = existing.get(upload.filename) or generate_unique_id()
+        features = {**resume_features(upload.filename, entry), "sha256": upload.sha256}
+        feature_store.update_resume(resume_id, features, job_ids=[job_id], skill_index=skill_index)
+    return ranked_job_results(job_id, scoring.current())
+
+# Active skill taxonomy; results carry its version as taxonomyVersion
+@app.get("/api/taxonomy")
+async def taxonomy():
+    skill_index = model_registry.get_skill_index()
+    return {
+        "version": skill_index.version,
+        "skills": len(skill_index),
+        "aliases": len(skill_index.lookup) - len(skill_index),
+        "path": model_registry.SKILLS_PATH,
+    }
+
+# Recompile skills.json now instead of waiting for the watcher
+@app.post("/api/taxonomy/reload")
+async def reload_taxonomy():
+    try:
+        skill_index = model_registry.reload_skill_index(force=True)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid skill taxonomy: {e}")
+    return {"success": True, "version": skill_index.version}
+
+# Embedding cache hit/miss counters
+@app.get("/api/embeddings/stats")
+async def embedding_stats():
+    return model_registry.get_embedding_store().stats()
+
+# Parsed-document cache size and hit/miss counters
+@app.get("/api/documents/stats")
+async def document_cache_stats():
+    return document_cache.stats()
+
+# LLM response cache size and hit/miss counters
+@app.get("/api/llm-cache/stats")
+async def llm_cache_stats():
+    return llm_cache.get_cache().stats()
+
+# Queue depth and wait times of the CPU and I/O executors and the parsing pool
+@app.get("/api/executors/stats")
+async def executor_stats():
+    return {**executors.stats(), "parse": extraction.stats()}
+
+# Liveness: the process is up and serving requests
+@app.get("/api/health")
+async def health():
+    return {"status": "ok"}
+
+# Readiness: 503 until every model is loaded, so load balancers skip cold workers
+@app.get("/api/ready")
+async def ready():
+    status = model_registry.status()
+    if status["ready"] or model_registry.MODEL_LOAD_MODE == "lazy":
+        return status
+    return JSONResponse(status_code=503, content=status)
+
 # Main entry point to run the application
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,35 @@
+"""Standalone consumer of the /api/match/jobs queue, for scaling matching apart from the API.
+
+Shares the SQLite queue (MATCH_QUEUE_DB), document cache and feature store with the API
+servers; run the API with MATCH_QUEUE_WORKERS=0 to leave all matching to these processes.
+
+Run from resume_matcher/:  python match_worker.py --threads 1
+"""
+import argparse
+import signal
+import threading
+
+import main
+from app import extraction, model_registry
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=1, help="worker threads in this process")
+    args = parser.parse_args()
+
+    model_registry.preload()
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    main.match_queue.start_workers(main.run_match_batch, args.threads)
+    print(f"Consuming {main.match_queue.path} with {args.threads} threads")
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    main.match_queue.stop_workers()
+    extraction.shutdown()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,26 @@
+import os
+
+from app.candidate_pool import CandidatePool
+
+
+def test_sync_lists_the_resume_directory_only_when_it_changes(tmp_path, monkeypatch):
+    resume_dir = tmp_path / "resumes"
+    resume_dir.mkdir()
+    pool = CandidatePool(str(tmp_path / "pool"), str(resume_dir))
+
+    listed = []
+    listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listed.append(path) or listdir(path))
+
+    assert pool.sync() == 0
+    assert pool.sync() == 0
+    assert listed == [str(resume_dir)]
+
+    (resume_dir / "notes.txt").write_text("not a resume")
+    os.utime(resume_dir, ns=(0, os.stat(resume_dir).st_mtime_ns + 1))
+    assert pool.sync() == 0
+    assert len(listed) == 2
+
+    # Another pool (e.g. in another worker) lists the directory once itself
+    CandidatePool(str(tmp_path / "pool"), str(resume_dir)).sync()
+    assert len(listed) == 3
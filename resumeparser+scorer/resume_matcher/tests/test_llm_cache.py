@@ -0,0 +1,100 @@
+import types
+
+import pytest
+
+from app import llm_cache
+from app.llm_cache import LLMCache, cache_key
+
+DAY = 86400
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = types.SimpleNamespace(value=1_000_000.0)
+    monkeypatch.setattr(llm_cache, "time", types.SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "llm_cache.sqlite3")
+
+
+def test_cache_key_ignores_dict_order_but_not_content():
+    request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Hi"}], "temperature": 0}
+    reordered = dict(reversed(list(request.items())))
+    assert cache_key("feedback", 1, request) == cache_key("feedback", 1, reordered)
+    assert cache_key("feedback", 1, request) != cache_key("feedback", 2, request)
+    assert cache_key("feedback", 1, request) != cache_key("followup", 1, request)
+
+
+def test_put_then_get_from_memory_and_disk(path, clock):
+    cache = LLMCache(path)
+    cache.put_many([("a", {"text": "one"}), ("b", ["two"])])
+    assert cache.get_many(["a", "b", "c"]) == [{"text": "one"}, ["two"], None]
+    assert (cache.hits, cache.disk_hits, cache.misses) == (2, 0, 1)
+
+    # A second process shares the SQLite tier
+    other = LLMCache(path)
+    assert other.get("a") == {"text": "one"}
+    assert other.disk_hits == 1
+
+
+def test_entries_expire_after_ttl(path, clock):
+    cache = LLMCache(path, ttl_days=1)
+    cache.put("a", "one")
+    clock.value += DAY - 1
+    assert cache.get("a") == "one"
+    assert LLMCache(path, ttl_days=1).get("a") == "one"
+
+    clock.value += 2
+    assert cache.get("a") is None
+    assert LLMCache(path, ttl_days=1).get("a") is None
+
+
+def test_using_an_entry_does_not_extend_its_ttl(path, clock):
+    cache = LLMCache(path, ttl_days=1)
+    cache.put("a", "one")
+    for _ in range(3):
+        clock.value += DAY / 2
+        cache.get("a")
+    assert cache.get("a") is None
+
+
+def test_evict_drops_expired_then_least_recently_used(path, clock):
+    cache = LLMCache(path, ttl_days=10, max_entries=10, memory_entries=100)
+    cache.put("old", "expired soon")
+    clock.value += 9 * DAY
+    for i in range(9):
+        clock.value += 1
+        cache.put(f"k{i}", i)
+    clock.value += 1
+    LLMCache(path, ttl_days=10).get_many(["k0", "k1"])  # recently used on disk, so kept
+
+    clock.value += DAY  # "old" is now past its TTL
+    cache.put("k9", 9)
+
+    # Over the limit of 10: "old" expires, then the least recently used go until 90% full
+    assert cache.stats()["entries"] == 9
+    assert cache.evictions == 2
+    fresh = LLMCache(path, ttl_days=10, max_entries=10)
+    assert fresh.get_many(["old", "k2", "k3", "k0", "k1", "k9"]) == [None, None, 3, 0, 1, 9]
+    assert cache.get("k2") is None  # dropped from memory too
+
+
+def test_memory_tier_is_bounded(path, clock):
+    cache = LLMCache(path, memory_entries=2)
+    cache.put_many([("a", 1), ("b", 2), ("c", 3)])
+    assert list(cache._memory) == ["b", "c"]
+    assert cache.get("a") == 1
+    assert cache.disk_hits == 1
+    assert list(cache._memory) == ["c", "a"]
+
+
+def test_bypass_never_reads_or_writes(path, clock):
+    LLMCache(path).put("a", 1)
+    cache = LLMCache(path, bypass=True)
+    cache.put("b", 2)
+    assert cache.get_many(["a", "b"]) == [None, None]
+    assert cache.bypassed == 2
+    assert LLMCache(path).get("b") is None
@@ -0,0 +1,83 @@
+import pytest
+
+from app import match_queue
+from app.match_queue import MatchQueue
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(match_queue, "MATCH_QUEUE_MAX_ATTEMPTS", 2)
+    return MatchQueue(str(tmp_path / "queue.sqlite3"))
+
+
+def submit(queue, count):
+    resumes = [(f"resume-{i}", f"r{i}.pdf", f"sha{i}", b"%PDF") for i in range(count)]
+    return queue.submit(["Python developer"], resumes)
+
+
+def expire_leases(queue, monkeypatch):
+    monkeypatch.setattr(match_queue, "MATCH_QUEUE_LEASE_SECONDS", -1)
+
+
+def test_claim_leases_pending_items_in_order(queue):
+    job_id = submit(queue, 5)
+
+    job, items = queue.claim(limit=3)
+    assert job["id"] == job_id
+    assert [item["seq"] for item in items] == [0, 1, 2]
+    assert items[0]["blob"] == b"%PDF"
+
+    _, items = queue.claim(limit=3)
+    assert [item["seq"] for item in items] == [3, 4]
+    assert queue.claim() is None
+
+
+def test_complete_stores_results_and_finishes_job(queue):
+    job_id = submit(queue, 2)
+    _, items = queue.claim()
+    queue.complete(job_id, items, [[{"score": 1}], [{"score": 2}]])
+
+    assert queue.job(job_id)["status"] == "done"
+    finished = queue.finished_items(job_id)
+    assert [item["results"] for item in finished] == [[{"score": 1}], [{"score": 2}]]
+    assert queue.finished_items(job_id, after_seq=0)[0]["seq"] == 1
+
+
+def test_expired_lease_is_claimed_again(queue, monkeypatch):
+    submit(queue, 1)
+    expire_leases(queue, monkeypatch)
+    _, first = queue.claim()
+    _, second = queue.claim()
+    assert [item["seq"] for item in second] == [item["seq"] for item in first]
+
+
+def test_unexpired_lease_is_not_claimed_again(queue):
+    submit(queue, 1)
+    queue.claim()
+    assert queue.claim() is None
+
+
+def test_lease_expiring_past_max_attempts_fails_item(queue, monkeypatch):
+    job_id = submit(queue, 1)
+    expire_leases(queue, monkeypatch)
+    queue.claim()
+    queue.claim()  # second and last attempt, also never released
+
+    assert queue.claim() is None
+    job = queue.job(job_id)
+    assert job["status"] == "done"
+    assert job["failed"] == 1
+    assert "lease expired" in queue.finished_items(job_id)[0]["error"]
+
+
+def test_release_retries_until_max_attempts(queue):
+    job_id = submit(queue, 1)
+    _, items = queue.claim()
+    queue.release(job_id, items, "boom")
+    assert queue.job(job_id)["pending"] == 1
+
+    _, items = queue.claim()
+    queue.release(job_id, items, "boom")
+    assert queue.claim() is None
+    assert queue.finished_items(job_id)[0]["status"] == "failed"
+    assert queue.finished_items(job_id)[0]["error"] == "boom"
@@ -0,0 +1,73 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app import scoring
+from app.scoring import ScoringConfig
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "scoring.json")
+    monkeypatch.setattr(scoring, "SCORING_CONFIG_PATH", path)
+    monkeypatch.setattr(scoring, "_config", None)
+    monkeypatch.setattr(scoring, "_stamp", None)
+    return path
+
+
+def write(path, data):
+    # As another worker's update() does: write aside, then replace
+    tmp_path = f"{path}.other.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def test_defaults_without_a_file(config_path):
+    config = scoring.current()
+    assert (config.skill_weight, config.semantic_weight) == (0.4, 0.6)
+    assert config.status(72) == "Matched"
+    assert config.status(10) == "Not Qualified"
+
+
+def test_combine_normalizes_weights():
+    config = ScoringConfig(skill_weight=1, semantic_weight=3)
+    assert config.combine(np.array([1.0, 0.0]), np.array([0.5, 1.0])).tolist() == [62.5, 75.0]
+
+
+def test_update_persists_and_applies(config_path):
+    scoring.update(scoring.current().replace(skillWeight=0.7, semanticWeight=0.3))
+    with open(config_path) as f:
+        assert json.load(f)["skillWeight"] == 0.7
+    assert scoring.current().skill_weight == 0.7
+
+
+def test_current_picks_up_a_file_written_by_another_worker(config_path):
+    assert scoring.current().skill_weight == 0.4
+
+    write(config_path, {"skillWeight": 0.9, "semanticWeight": 0.1,
+                        "thresholds": [{"min": 60, "status": "Good"}], "belowStatus": "Weak"})
+    config = scoring.current()
+    assert (config.skill_weight, config.semantic_weight) == (0.9, 0.1)
+    assert config.status(65) == "Good"
+    assert config.status(59) == "Weak"
+
+    write(config_path, {"skillWeight": 0.2, "semanticWeight": 0.8})
+    assert scoring.current().skill_weight == 0.2
+
+    os.remove(config_path)
+    assert scoring.current().skill_weight == 0.4
+
+
+def test_current_is_reused_while_the_file_is_unchanged(config_path):
+    write(config_path, {"skillWeight": 0.5, "semanticWeight": 0.5})
+    assert scoring.current() is scoring.current()
+
+
+def test_invalid_file_keeps_the_active_config(config_path):
+    write(config_path, {"skillWeight": 0.5, "semanticWeight": 0.5})
+    assert scoring.current().skill_weight == 0.5
+    write(config_path, {"skillWeight": -1})
+    assert scoring.current().skill_weight == 0.5
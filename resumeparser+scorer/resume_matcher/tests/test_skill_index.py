@@ -0,0 +1,100 @@
+import random
+
+import numpy as np
+import pytest
+
+from app import skill_index
+from app.skill_index import SkillIndex, normalize_skill, popcount, skill_overlap
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SkillIndex.from_file()
+
+
+def scan(index, text):
+    return [canonical for canonical, _, _ in index.scan(text)]
+
+
+def test_normalize_skill_keeps_tech_punctuation():
+    assert normalize_skill("  C++, Node.js and CI/CD ") == "c++ node.js and ci/cd"
+    assert normalize_skill(".NET") == ".net"
+
+
+def test_scan_reports_canonical_names_and_surface_text(index):
+    assert list(index.scan("Built APIs in python and node.js")) == [
+        ("Python", "python", 1),
+        ("Node.js", "node.js", 1),
+    ]
+
+
+def test_scan_prefers_the_longest_phrase(index):
+    assert scan(index, "5 years of Ruby on Rails") == ["Ruby on Rails"]
+    assert scan(index, "Google Cloud Platform and Google Cloud") == ["Google Cloud", "Google Cloud"]
+
+
+def test_aliases_resolve_to_canonical_names(index):
+    assert scan(index, "JS, TS, Golang, K8s, Postgres") == ["JavaScript", "TypeScript", "Go", "Kubernetes", "PostgreSQL"]
+
+
+def test_existing_display_names_stay_canonical(index):
+    assert scan(index, "HTML, CSS, Kafka") == ["HTML", "CSS", "Kafka"]
+    assert scan(index, "HTML5, CSS3, Apache Kafka") == ["HTML", "CSS", "Kafka"]
+
+
+def test_scan_matches_whole_tokens_only(index):
+    assert scan(index, "Gopher, Javanese, Scalable") == []
+
+
+def test_unknown_alias_target_is_ignored():
+    index = SkillIndex(["Python"], {"Py": "Python", "Golang": "Go"})
+    assert index.match("py") == "Python"
+    assert index.match("golang") is None
+
+
+def test_duplicate_skills_keep_their_first_spelling():
+    index = SkillIndex(["Jira", "JIRA", "Python"])
+    assert index.skills == ["Jira", "Python"]
+    assert index.match("JIRA") == "Jira"
+
+
+def test_version_changes_with_the_vocabulary():
+    assert SkillIndex(["Python", "Go"]).version == SkillIndex(["Python", "Go"]).version
+    assert SkillIndex(["Python", "Go"]).version != SkillIndex(["Go", "Python"]).version
+    assert SkillIndex(["Python"]).version != SkillIndex(["Python"], {"Py": "Python"}).version
+
+
+def random_skill_lists(index, count, seed=0):
+    rng = random.Random(seed)
+    return [rng.sample(index.skills, rng.randint(0, 20)) for _ in range(count)]
+
+
+def test_encode_bits_round_trips(index):
+    assert len(index) > 64  # the bitsets span several words
+    skill_lists = random_skill_lists(index, 50)
+    bits = index.encode_bits(skill_lists)
+    assert bits.shape == (50, index.bitset_words)
+    assert bits.dtype == np.uint64
+    for row, skills in zip(bits, skill_lists):
+        assert index.decode_bits(row) == sorted(skills, key=index.skill_ids.get)
+
+
+def test_encode_bits_ignores_unknown_names(index):
+    bits = index.encode_bits([["Python", "Not A Skill"], []])
+    assert index.decode_bits(bits[0]) == ["Python"]
+    assert not bits[1].any()
+
+
+def test_skill_overlap_matches_set_intersection(index, monkeypatch):
+    resumes = random_skill_lists(index, 30, seed=1)
+    jobs = random_skill_lists(index, 7, seed=2)
+    expected = [[len(set(resume) & set(job)) for job in jobs] for resume in resumes]
+    resume_bits, job_bits = index.encode_bits(resumes), index.encode_bits(jobs)
+
+    assert skill_overlap(resume_bits, job_bits).tolist() == expected
+    assert popcount(job_bits).tolist() == [len(job) for job in jobs]
+
+    # Blocked rows and the lookup-table popcount give the same counts
+    monkeypatch.setattr(skill_index, "OVERLAP_BLOCK_ROWS", 4)
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert skill_overlap(resume_bits, job_bits).tolist() == expected
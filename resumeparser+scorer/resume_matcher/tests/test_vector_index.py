@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from app.vector_index import IVFIndex
+
+DIM = 64
+
+
+def normalized(vectors):
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def clustered(count, clusters=40, seed=0):
+    # Embeddings of similar documents bunch together; uniform noise would make IVF look worse than it is
+    rng = np.random.default_rng(seed)
+    centers = normalized(rng.normal(size=(clusters, DIM)))
+    return normalized(centers[rng.integers(clusters, size=count)] + 0.35 * rng.normal(size=(count, DIM)) / np.sqrt(DIM))
+
+
+def brute_force(vectors, query, k):
+    return set(np.argsort(-(vectors @ query))[:k])
+
+
+@pytest.fixture(scope="module")
+def data():
+    return clustered(4000), clustered(100, seed=1)
+
+
+def recall(index, vectors, queries, k=10, **search):
+    found = 0
+    for query in queries:
+        ids = {int(item_id) for item_id, _ in index.search(query, k=k, **search)}
+        found += len(ids & brute_force(vectors, query, k))
+    return found / (k * len(queries))
+
+
+def build(vectors, **kwargs):
+    index = IVFIndex(DIM, **kwargs)
+    index.add([str(i) for i in range(len(vectors))], vectors)
+    return index
+
+
+def test_recall_against_brute_force(data):
+    vectors, queries = data
+    index = build(vectors)
+    assert index.centroids is not None
+    assert recall(index, vectors, queries) >= 0.9
+    assert recall(index, vectors, queries, nprobe=len(index.centroids)) == 1.0
+
+
+def test_recall_holds_after_incremental_inserts(data):
+    vectors, queries = data
+    index = build(vectors[:2000], retrain_factor=100)
+    trained = index.centroids.copy()
+    for start in range(2000, len(vectors), 250):
+        index.add([str(i) for i in range(start, start + 250)], vectors[start:start + 250])
+    assert np.array_equal(index.centroids, trained)  # bucketed incrementally, not retrained
+    assert len(index) == len(vectors)
+    assert recall(index, vectors, queries) >= 0.9
+
+
+def test_small_index_answers_exactly(data):
+    vectors, queries = data
+    index = build(vectors[:500])
+    assert index.centroids is None
+    assert recall(index, vectors[:500], queries) == 1.0
+
+
+def test_search_returns_scores_best_first(data):
+    vectors, queries = data
+    results = build(vectors).search(queries[0], k=5)
+    scores = [score for _, score in results]
+    assert scores == sorted(scores, reverse=True)
+    assert np.isclose(scores[0], float(vectors[int(results[0][0])] @ queries[0]), atol=1e-5)
+
+
+def test_add_overwrites_existing_ids(data):
+    vectors, _ = data
+    index = build(vectors)
+    index.add(["7"], -vectors[7:8])
+    assert len(index) == len(vectors)
+    assert index.search(-vectors[7], k=1)[0][0] == "7"
+    assert np.isclose(index.score(["7"], vectors[7])[0], -1.0, atol=1e-5)
+
+
+def test_save_and_load_round_trip(data, tmp_path):
+    vectors, queries = data
+    index = build(vectors)
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    loaded = IVFIndex.load(path)
+    assert loaded.ids == index.ids
+    for query in queries[:10]:
+        assert loaded.search(query, k=10) == index.search(query, k=10)